@@ -1,15 +1,37 @@
 import os
+import sys
+import re
+import json
+import zlib
+import uuid
+import sqlite3
 import time
+import random
+import asyncio
 import threading
 import queue
 import logging
+import itertools
+import math
+import hashlib
+import argparse
+import subprocess
+import xml.etree.ElementTree as ElementTree
+from multiprocessing.connection import Listener, Client
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from openstack import connection
-from openstack.exceptions import ResourceTimeout, BadRequestException, ConflictException, ResourceNotFound
-import dash
-from dash import dcc, html, Input, Output
-import plotly.graph_objs as go
-from collections import defaultdict
+from openstack.utils import supports_microversion
+from keystoneauth1 import access
+from keystoneauth1.session import TCPKeepAliveAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from openstack.exceptions import ResourceTimeout, BadRequestException, ConflictException, ResourceNotFound, ResourceFailure
+from collections import defaultdict, deque
+from contextlib import closing
+
+# Dash and Plotly are imported by load_dashboard_modules() only when the dashboard is served
+dash = dcc = html = Input = Output = State = no_update = PreventUpdate = go = None
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +43,194 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Test configuration
+TEST_DURATION = int(os.getenv("TEST_DURATION", "600"))  # seconds, split evenly across concurrency levels
+# Comma separated list of worker pool sizes to step through, e.g. "1,2,4,8"
+CONCURRENCY_LEVELS = [int(n) for n in os.getenv("TEST_CONCURRENCY", "1").split(",") if n.strip()]
+LIFECYCLE_PAUSE = float(os.getenv("TEST_LIFECYCLE_PAUSE", "5"))  # seconds between lifecycles per worker
+IMAGE_NAME = os.getenv("TEST_IMAGE_NAME", "cirros")
+FLAVOR_NAME = os.getenv("TEST_FLAVOR_NAME", "m1.tiny")
+RESOLUTION_CACHE_TTL = float(os.getenv("RESOLUTION_CACHE_TTL", "300"))  # seconds
+# Open-loop mode: target arrival rate in ops/sec, either fixed ("5") or a linear ramp ("1:20")
+OPEN_LOOP_RATE = os.getenv("TEST_OPEN_LOOP_RATE")
+# Weighted operation mix for open-loop mode, e.g. "list_servers:3,vm_lifecycle:1"
+OPEN_LOOP_MIX = os.getenv("TEST_OPEN_LOOP_MIX", "list_servers:1")
+OPEN_LOOP_MAX_IN_FLIGHT = int(os.getenv("TEST_OPEN_LOOP_MAX_IN_FLIGHT", "256"))
+# Shared server status tracker replacing per-VM wait_for_server polling
+BATCHED_POLLING = os.getenv("TEST_BATCHED_POLLING", "1") == "1"
+STATUS_POLL_INTERVAL = float(os.getenv("STATUS_POLL_INTERVAL", "2"))  # seconds between list calls
+SDK_POLL_INTERVAL = 2  # wait_for_server's own default interval, used to estimate saved requests
+# Per-VM creation phases from Nova instance actions, polled task_state and Neutron port status
+VM_TIMELINE = os.getenv("TEST_VM_TIMELINE", "1") == "1"
+VM_TIMELINE_VMS = int(os.getenv("TEST_VM_TIMELINE_VMS", "20"))  # most recent VMs shown in the phase Gantt
+# Keep-alive connections per host shared by every worker thread; when blocking, threads wait for a
+# pooled connection (reported as pool wait) instead of opening sockets that are thrown away after one call
+HTTP_POOL_SIZE = int(os.getenv("TEST_HTTP_POOL_SIZE", "32"))
+HTTP_POOL_BLOCK = os.getenv("TEST_HTTP_POOL_BLOCK", "1") == "1"
+# Keystone tokens shared with worker processes and new.py through this file; empty keeps them in memory
+TOKEN_CACHE_FILE = os.getenv("OS_TOKEN_CACHE", ".os_token_cache.json")
+TOKEN_REFRESH_MARGIN = float(os.getenv("OS_TOKEN_REFRESH_MARGIN", "300"))  # seconds before expiry to re-authenticate
+# Pre-warmed Neutron ports VMs boot onto, taking port allocation out of create_server; 0 disables the pool
+PORT_POOL_SIZE = int(os.getenv("TEST_PORT_POOL", "0"))  # idle ports the pool refills to
+PORT_POOL_NETWORKS = int(os.getenv("TEST_PORT_POOL_NETWORKS", "1"))  # networks pool ports are spread over
+PORT_POOL_REFILL_INTERVAL = float(os.getenv("TEST_PORT_POOL_REFILL_INTERVAL", "1"))  # seconds
+# Every resource the harness creates carries HARNESS_TAG and a per-run tag, so cleanup can find it with tag queries
+HARNESS_TAG = os.getenv("TEST_RESOURCE_TAG", "openstack-perf")
+RUN_ID = os.getenv("TEST_RUN_ID") or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+CLEANUP_WORKERS = int(os.getenv("TEST_CLEANUP_WORKERS", "8"))  # parallel deletes within a dependency level
+# Pre-run cleanup leaves tagged resources younger than this alone, e.g. those of a concurrent run;
+# 0 removes everything carrying HARNESS_TAG
+LEFTOVER_AGE = float(os.getenv("TEST_LEFTOVER_AGE", "3600"))  # seconds
+# SQLite file every run is recorded to for later replay; empty disables recording
+RUNS_DB = os.getenv("TEST_RUNS_DB", "perf_runs.sqlite")
+RECORD_BATCH_SIZE = int(os.getenv("TEST_RECORD_BATCH_SIZE", "2000"))  # events per stored segment
+RECORD_FLUSH_INTERVAL = float(os.getenv("TEST_RECORD_FLUSH_INTERVAL", "5"))  # seconds
+# JSON load profile of ordered stages; without one the stages come from TEST_CONCURRENCY / TEST_OPEN_LOOP_RATE
+LOAD_PROFILE = os.getenv("TEST_PROFILE")
+# Share of 429/503 responses a capacity search stage tolerates unless its SLOs say otherwise
+SEARCH_THROTTLE_RATE = float(os.getenv("TEST_SEARCH_THROTTLE_RATE", "0.01"))
+# Distributed mode: "standalone" runs everything here, a "coordinator" drives
+# "worker" processes (local or on other hosts) that each generate part of the load
+ROLE = os.getenv("TEST_ROLE", "standalone")
+COORDINATOR_ADDRESS = os.getenv("TEST_COORDINATOR", "127.0.0.1:8765")  # host:port workers connect to
+CLUSTER_KEY = os.getenv("TEST_CLUSTER_KEY", "openstack-perf").encode()  # shared secret for worker connections
+LOCAL_WORKERS = int(os.getenv("TEST_LOCAL_WORKERS", "2"))  # worker processes the coordinator spawns itself
+REMOTE_WORKERS = int(os.getenv("TEST_REMOTE_WORKERS", "0"))  # workers started on other hosts
+WORKER_WAIT = float(os.getenv("TEST_WORKER_WAIT", "60"))  # seconds to wait for workers to connect
+SUMMARY_INTERVAL = float(os.getenv("TEST_SUMMARY_INTERVAL", "1"))  # seconds between worker summaries
+# Headless runs skip the dashboard and exit with the SLO verdict: 0 pass, 1 SLO breached, 2 run failed
+HEADLESS = os.getenv("TEST_HEADLESS", "0") == "1"
+SUMMARY_FILE = os.getenv("TEST_SUMMARY_FILE")  # JSON summary written when the run ends
+JUNIT_FILE = os.getenv("TEST_JUNIT_FILE")  # JUnit XML SLO report written when the run ends
+
+def token_cache_key():
+    """Identity a cached token belongs to; the same key is computed by new.py"""
+    parts = [os.getenv(name) or "" for name in
+             ("OS_AUTH_URL", "OS_USERNAME", "OS_USER_DOMAIN_NAME", "OS_PROJECT_NAME", "OS_PROJECT_DOMAIN_NAME")]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def write_private_json(path, data):
+    """Write-then-rename, readable by the owner only; the temporary name is unique per process and thread"""
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+class TokenCache:
+    """Keystone token shared by every thread and, through TOKEN_CACHE_FILE, by other processes
+
+    keystoneauth already lets only one thread re-authenticate at a time and
+    renews a token shortly before it expires; attach() widens that margin to
+    TOKEN_REFRESH_MARGIN and, before going to Keystone, reuses a token that
+    another process (or the coordinator) stored and that is still far enough
+    from expiry. A token the cloud rejected with a 401 is never reused.
+    """
+
+    def __init__(self, path=TOKEN_CACHE_FILE, margin=TOKEN_REFRESH_MARGIN):
+        self.path = path
+        self.margin = margin
+        self.key = token_cache_key()
+        self.entry = None  # Latest {"auth_token", "body"}, the shape of get_auth_state()
+        self._rejected = set()
+
+    def attach(self, plugin):
+        """Route an auth plugin's token fetches through the cache"""
+        fetch = plugin.get_auth_ref
+        invalidate = plugin.invalidate
+
+        def get_auth_ref(session, **kwargs):
+            auth_ref = self._cached()
+            if auth_ref is not None:
+                metrics_queue.put({"kind": "auth", "source": "cache"})
+                return auth_ref
+            started = time.time()
+            auth_ref = fetch(session, **kwargs)
+            metrics_queue.put({"kind": "auth", "source": "keystone", "latency": (time.time() - started) * 1000})
+            self._store({"auth_token": auth_ref.auth_token, "body": auth_ref._data})
+            return auth_ref
+
+        def invalidate_token():
+            if plugin.auth_ref is not None:
+                self._rejected.add(plugin.auth_ref.auth_token)
+            return invalidate()
+
+        plugin.MIN_TOKEN_LIFE_SECONDS = self.margin
+        plugin.get_auth_ref = get_auth_ref
+        plugin.invalidate = invalidate_token
+
+    def seed(self, entry):
+        """Adopt a token handed over by the coordinator, if it is for the same identity"""
+        if entry and entry.get("key") == self.key:
+            self.entry = {"auth_token": entry["auth_token"], "body": entry["body"]}
+
+    def export(self):
+        return dict(self.entry, key=self.key) if self.entry else None
+
+    def _cached(self):
+        for entry in (self._read().get(self.key), self.entry):
+            if not entry or entry["auth_token"] in self._rejected:
+                continue
+            auth_ref = access.create(body=entry["body"], auth_token=entry["auth_token"])
+            if not auth_ref.will_expire_soon(self.margin):
+                self.entry = entry
+                return auth_ref
+        return None
+
+    def _read(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, entry):
+        self.entry = entry
+        if not self.path:
+            return
+        try:
+            entries = self._read()
+            entries[self.key] = entry
+            # Readers in other processes never see a partial file, and concurrent writers never share a temp file
+            write_private_json(self.path, entries)
+        except OSError as e:
+            logger.error(f"Could not write token cache {self.path}: {str(e)}")
+
+
+token_cache = TokenCache()
+
+# Milliseconds the current thread has waited for a pooled HTTP connection, read by the wire hook
+pool_wait = threading.local()
+
+class PoolWaitMixin:
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return super()._get_conn(timeout=timeout)
+        finally:
+            pool_wait.ms = getattr(pool_wait, "ms", 0) + (time.perf_counter() - started) * 1000
+
+class TimedHTTPConnectionPool(PoolWaitMixin, HTTPConnectionPool):
+    pass
+
+class TimedHTTPSConnectionPool(PoolWaitMixin, HTTPSConnectionPool):
+    pass
+
+class PooledAdapter(TCPKeepAliveAdapter):
+    """keystoneauth's keep-alive adapter with per-host pools that time connection checkout"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+def configure_http_pool(conn):
+    """Size the per-host connection pools for the threads sharing this connection"""
+    adapter = PooledAdapter(pool_maxsize=HTTP_POOL_SIZE, pool_block=HTTP_POOL_BLOCK)
+    for scheme in ("https://", "http://"):
+        conn.session.session.mount(scheme, adapter)
+
 def get_openstack_connection():
     """Establish OpenStack connection with service discovery"""
     try:
@@ -36,31 +246,318 @@ def get_openstack_connection():
             interface=os.getenv("OS_INTERFACE", "public"),
             identity_api_version=os.getenv("OS_IDENTITY_API_VERSION", "3")
         )
+        token_cache.attach(conn.session.auth)
+        configure_http_pool(conn)
+        instrument_connection(conn)
         return conn
     except Exception as e:
         logger.error(f"Connection failed: {str(e)}")
         raise
 
+# Width of a metrics aggregation window in seconds
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "60"))
+# Seconds a window stays open after it ends, for samples still queued for the collector
+WINDOW_GRACE = float(os.getenv("METRICS_WINDOW_GRACE", "5"))
+# Points per dashboard trace after downsampling; longer series are decimated with LTTB
+MAX_CHART_POINTS = int(os.getenv("DASHBOARD_MAX_POINTS", "500"))
+# Number of operations shown in the slowest-operations view
+TOP_N_OPERATIONS = int(os.getenv("TOP_N_OPERATIONS", "5"))
+
+
+class LatencyHistogram:
+    """Bounded-memory, mergeable latency histogram (HDR style log buckets)
+
+    Values are counted in logarithmic buckets so every percentile is
+    reported within `precision` relative error, whatever the sample count.
+    """
+
+    MIN_VALUE = 0.01  # Smallest distinguishable value (ms)
+
+    def __init__(self, precision=0.01):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets = {}  # {bucket_index: count}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        return int(math.log(max(value, self.MIN_VALUE) / self.MIN_VALUE) / self._log_base)
+
+    def _bucket_value(self, index):
+        # Geometric midpoint of the bucket
+        return self.MIN_VALUE * math.exp((index + 0.5) * self._log_base)
+
+    def record(self, value):
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Fold another histogram with the same precision into this one"""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self):
+        """JSON-safe form, for shipping between processes and recording"""
+        return {
+            "precision": self.precision,
+            "buckets": self.buckets,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["precision"])
+        # JSON turns the bucket indexes into strings
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+    def percentile(self, q):
+        """Return the value at quantile q (0-100)"""
+        if not self.count:
+            return 0
+        if q >= 100:
+            return self.max
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max or 0
+        }
+
+
+def window_start(timestamp):
+    """Epoch start of the metrics window containing `timestamp`"""
+    return int(timestamp // METRICS_WINDOW) * METRICS_WINDOW
+
+
+def new_window_stats():
+    return {
+        "latency": LatencyHistogram(),
+        "response_time": LatencyHistogram(),
+        "requests": 0,
+        "corrected_latency": LatencyHistogram(),  # Open-loop latency measured from the intended start
+        "operations": {},  # {operation: LatencyHistogram}
+        "wire_bytes": {}  # {service: bytes sent + received on the wire}
+    }
+
+
+def new_wire_stats():
+    return {
+        "requests": 0,
+        "request_bytes": 0,
+        "response_bytes": 0,
+        "ttfb": LatencyHistogram(),
+        "new_connections": 0,
+        "reused_connections": 0,
+        "pool_wait": LatencyHistogram(),  # ms waited for a free pooled connection
+        "status_codes": defaultdict(int)
+    }
+
+
+def new_metrics_state():
+    """Empty metrics storage; the live run and every replayed run get their own"""
+    return {
+        "api": {
+            "windows": {},  # {window start (epoch seconds): window stats}
+            "overall_latency": LatencyHistogram(),
+            "overall_corrected_latency": LatencyHistogram(),
+            "open_loop": {"in_flight": 0, "max_in_flight": 0},
+            "operations": {},  # {operation: {"latency": LatencyHistogram, "failures": int}}
+            "wire": {},  # {service: wire stats} from the instrumented HTTP session
+            "success_count": 0,
+            "failure_count": 0,
+            "first_window": None,
+            "last_closed": None,  # Start of the newest window already summarized
+            "late_samples": 0  # Samples that arrived after their window closed
+        },
+        "vm": {
+            "creation_times": [],  # Append-only, readers slice up to the snapshot's vm_count
+            "timestamps": [],
+            "concurrency": [],  # Worker pool size each VM was created under
+            "creation_total": 0.0,
+            "levels": {},  # {concurrency: {"started", "elapsed", "completed", "failed", "created", "creation_total"}}
+            "current_concurrency": 0,
+            "phases": {},  # {phase: LatencyHistogram of durations in seconds}
+            # Open-loop vm_lifecycle arrivals, end to end; kept out of the per-call API histograms
+            "lifecycle_latency": LatencyHistogram(),
+            "lifecycle_corrected_latency": LatencyHistogram(),
+            "lifecycle_failures": 0,
+            "recent_timelines": deque(maxlen=VM_TIMELINE_VMS)
+        },
+        # Append-only summaries of closed windows; their histograms are dropped once summarized
+        "closed_windows": [],
+        "stages": [],  # Load profile stages in run order
+        "cleanups": [],  # {"phase", "duration", "deleted", "failed"} per cleanup pass
+        "searches": [],  # Capacity search results: knee point and the probes behind it
+        "auth": {"reauths": 0, "cache_hits": 0, "latency": LatencyHistogram()},  # Keystone token fetches
+        "current_stage": None  # Stage API samples and VM creations are attributed to
+    }
+
+
 # Performance metrics storage
-api_metrics = {
-    "latencies": defaultdict(list),  # {minute: [latencies]}
-    "response_times": defaultdict(list),
-    "throughput": defaultdict(list),
-    "bandwidth": defaultdict(list),
-    "success_count": 0,
-    "failure_count": 0,
-    "timestamps": []  # List of minute timestamps (e.g., "15:02")
-}
-vm_metrics = {
-    "creation_times": [],
-    "timestamps": []
-}
-vm_count = 0
+live_metrics = new_metrics_state()
+api_metrics = live_metrics["api"]
+vm_metrics = live_metrics["vm"]
+# Worker pool size producers tag new VMs with
+current_concurrency = 0
+# Every sample and VM event goes through this queue; collect_metrics is the
+# only writer of api_metrics/vm_metrics, so producers never wait on a lock
 metrics_queue = queue.Queue()
-resource_lock = threading.Lock()
+# Read-only view republished by the collector; the dashboard reads it without locking
+metrics_snapshot = {}
+SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "1"))  # seconds
+# Set once the run is over; the collector then publishes a final snapshot and exits
+collector_stop = threading.Event()
+# Serializes network/security group provisioning only
+provision_lock = threading.Lock()
+
+
+class VMNameCounter:
+    """Thread-safe counter handing out unique VM names to lifecycle workers"""
+
+    def __init__(self, prefix="test_vm"):
+        self.prefix = prefix
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_name(self):
+        with self._lock:
+            index = next(self._counter)
+        return f"{self.prefix}_{index}"
+
+
+vm_names = VMNameCounter()
+
+# Service types whose HTTP traffic is accounted separately
+WIRE_SERVICES = ("compute", "network", "image", "block-storage", "identity")
+
+def header_bytes(headers):
+    """Approximate size of an HTTP header block on the wire"""
+    return sum(len(str(name)) + len(str(value)) + 4 for name, value in headers.items())
+
+def request_body_bytes(request):
+    """Bytes of a prepared request's body; a str body is encoded first, as len() counts characters"""
+    content_length = request.headers.get("Content-Length")
+    if content_length is not None:
+        return int(content_length)
+    body = request.body
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    # Streamed uploads without a length are not counted
+    return 0
+
+def instrument_connection(conn):
+    """Account bytes, time-to-first-byte and connection reuse for every HTTP call
+
+    A response hook on the requests session underneath the keystoneauth
+    session sees every call made through the openstacksdk connection.
+    """
+    prefixes = []
+    for service_type in WIRE_SERVICES:
+        try:
+            endpoint = conn.endpoint_for(service_type)
+        except Exception:
+            endpoint = None
+        if endpoint:
+            prefixes.append((endpoint.rstrip("/"), service_type))
+    auth_url = os.getenv("OS_AUTH_URL")
+    if auth_url:
+        prefixes.append((auth_url.rstrip("/"), "identity"))
+    # Longest prefix wins when services share a host
+    prefixes.sort(key=lambda prefix: len(prefix[0]), reverse=True)
+
+    def classify(url):
+        for prefix, service_type in prefixes:
+            if url.startswith(prefix):
+                return service_type
+        return "other"
+
+    def record_response(response, *args, **kwargs):
+        request = response.request
+        request_bytes = (len(request.method) + len(request.url) + header_bytes(request.headers)
+                         + request_body_bytes(request))
+        # Mark the underlying urllib3 connection to tell new sockets from keep-alive reuse; this
+        # comes before any body read, which hands the connection back to the pool
+        socket_conn = getattr(response.raw, "_connection", None)
+        reused = None
+        if socket_conn is not None:
+            reused = getattr(socket_conn, "_wire_requests", 0) > 0
+            socket_conn._wire_requests = getattr(socket_conn, "_wire_requests", 0) + 1
+        content_length = response.headers.get("Content-Length")
+        if content_length is not None:
+            body_bytes = int(content_length)
+        elif not kwargs.get("stream"):
+            # Reading here is free: requests loads non-streamed bodies right after the hooks run
+            body_bytes = len(response.content)
+        else:
+            body_bytes = 0
+        waited = getattr(pool_wait, "ms", 0)
+        pool_wait.ms = 0
+        metrics_queue.put({
+            "kind": "wire",
+            "window": window_start(time.time()),
+            "service": classify(request.url),
+            "status": response.status_code,
+            "request_bytes": request_bytes,
+            "response_bytes": header_bytes(response.headers) + body_bytes,
+            "ttfb": response.elapsed.total_seconds() * 1000,
+            "pool_wait": waited,
+            "reused": reused
+        })
+        return response
+
+    conn.session.session.hooks.setdefault("response", []).append(record_response)
+    logger.info(f"Wire accounting enabled for {sorted({service for _, service in prefixes})}")
 
-def measure_api_performance(func, *args, **kwargs):
-    """Wrapper to measure API call performance"""
+def operation_name(func):
+    """Derive an operation label from the wrapped callable"""
+    return getattr(func, "__name__", None) or repr(func)
+
+def measure_api_performance(func, *args, operation=None, intended_start=None, **kwargs):
+    """Wrapper to measure API call performance
+
+    Every sample is tagged with `operation`, defaulting to the wrapped
+    callable's name, so latencies can be broken down per OpenStack call.
+    Open-loop callers pass `intended_start` (the scheduled send time) so the
+    sample also carries a latency corrected for coordinated omission.
+    """
+    operation = operation or operation_name(func)
     start_time = time.time()
     try:
         result = func(*args, **kwargs)
@@ -68,67 +565,623 @@ def measure_api_performance(func, *args, **kwargs):
         
         latency = (end_time - start_time) * 1000  # ms
         response_time = latency
-        duration = end_time - start_time
-        throughput = 1 / duration if duration > 0 else 0
-        bandwidth = throughput * 1024  # Simulated bandwidth (bytes/sec)
-        
-        # Get minute timestamp (HH:MM)
-        minute_timestamp = time.strftime("%H:%M", time.localtime(start_time))
         
-        metrics_queue.put({
-            "minute": minute_timestamp,
+        metric = {
+            "window": window_start(end_time),
+            "operation": operation,
             "latency": latency,
             "response_time": response_time,
-            "throughput": throughput,
-            "bandwidth": bandwidth,
             "success": True
-        })
+        }
+        if intended_start is not None:
+            metric["corrected_latency"] = (end_time - intended_start) * 1000
+        metrics_queue.put(metric)
         return result
     except Exception as e:
         end_time = time.time()
-        minute_timestamp = time.strftime("%H:%M", time.localtime(start_time))
-        metrics_queue.put({
-            "minute": minute_timestamp,
+        metric = {
+            "window": window_start(end_time),
+            "operation": operation,
             "latency": (end_time - start_time) * 1000,
             "success": False
-        })
-        logger.error(f"API call failed: {str(e)}")
+        }
+        if intended_start is not None:
+            metric["corrected_latency"] = (end_time - intended_start) * 1000
+        metrics_queue.put(metric)
+        logger.error(f"API call {operation} failed: {str(e)}")
         raise
 
+def get_window(api, start):
+    """Open window stats for `start`, or None when that window was already closed"""
+    window = api["windows"].get(start)
+    if window is None:
+        if api["last_closed"] is not None and start <= api["last_closed"]:
+            api["late_samples"] += 1
+            return None
+        window = api["windows"][start] = new_window_stats()
+        if api["first_window"] is None:
+            api["first_window"] = start
+    return window
+
+def record_api_metric(state, metric):
+    """Fold one measured API call into the window and per-operation stats"""
+    api = state["api"]
+    window = get_window(api, metric["window"])
+    operation = api["operations"].get(metric["operation"])
+    if operation is None:
+        operation = api["operations"][metric["operation"]] = {
+            "latency": LatencyHistogram(),
+            "failures": 0
+        }
+    if "corrected_latency" in metric:
+        if window is not None:
+            window["corrected_latency"].record(metric["corrected_latency"])
+        api["overall_corrected_latency"].record(metric["corrected_latency"])
+    if metric["success"]:
+        if window is not None:
+            window_operation = window["operations"].get(metric["operation"])
+            if window_operation is None:
+                window_operation = window["operations"][metric["operation"]] = LatencyHistogram()
+            window_operation.record(metric["latency"])
+            window["latency"].record(metric["latency"])
+            window["response_time"].record(metric["response_time"])
+            window["requests"] += 1
+        operation["latency"].record(metric["latency"])
+        api["overall_latency"].record(metric["latency"])
+        api["success_count"] += 1
+    else:
+        operation["failures"] += 1
+        api["failure_count"] += 1
+    stage = state["current_stage"]
+    if stage is not None:
+        if metric["success"]:
+            stage["latency"].record(metric["latency"])
+            stage["successes"] += 1
+        else:
+            stage["failures"] += 1
+
+# Responses that mean the cloud is shedding load rather than failing the request
+THROTTLE_STATUSES = (429, 503)
+
+def record_wire_metric(state, metric):
+    """Fold one HTTP exchange into the per-service wire stats"""
+    api = state["api"]
+    window = get_window(api, metric["window"])
+    service = metric["service"]
+    stats = api["wire"].get(service)
+    if stats is None:
+        stats = api["wire"][service] = new_wire_stats()
+    stats["requests"] += 1
+    stats["request_bytes"] += metric["request_bytes"]
+    stats["response_bytes"] += metric["response_bytes"]
+    stats["ttfb"].record(metric["ttfb"])
+    stats["pool_wait"].record(metric.get("pool_wait", 0))
+    stats["status_codes"][metric["status"]] += 1
+    if metric["reused"] is True:
+        stats["reused_connections"] += 1
+    elif metric["reused"] is False:
+        stats["new_connections"] += 1
+    stage = state["current_stage"]
+    if stage is not None:
+        stage["http_requests"] += 1
+        if metric["status"] in THROTTLE_STATUSES:
+            stage["throttled"] += 1
+    if window is not None:
+        window["wire_bytes"][service] = (
+            window["wire_bytes"].get(service, 0) + metric["request_bytes"] + metric["response_bytes"]
+        )
+
+def record_vm_created(state, metric):
+    vm = state["vm"]
+    vm["creation_times"].append(metric["creation_time"])
+    vm["timestamps"].append(metric["timestamp"])
+    vm["concurrency"].append(metric["concurrency"])
+    vm["creation_total"] += metric["creation_time"]
+    level = vm["levels"].get(metric["concurrency"])
+    if level is not None:
+        level["created"] += 1
+        level["creation_total"] += metric["creation_time"]
+    if state["current_stage"] is not None:
+        state["current_stage"]["creation_time"].record(metric["creation_time"])
+
+def record_level_started(state, metric):
+    vm = state["vm"]
+    vm["current_concurrency"] = metric["concurrency"]
+    # Several profile stages may run at the same pool size; their time adds up
+    level = vm["levels"].setdefault(metric["concurrency"], {
+        "started": metric["started"],
+        "elapsed": 0,
+        "running": False,
+        "completed": 0,
+        "failed": 0,
+        "created": 0,
+        "creation_total": 0.0
+    })
+    level["started"] = metric["started"]
+    level["running"] = True
+
+def record_level_finished(state, metric):
+    vm = state["vm"]
+    level = vm["levels"][metric["concurrency"]]
+    level["elapsed"] += metric["elapsed"]
+    level["running"] = False
+
+def record_lifecycle(state, metric):
+    vm = state["vm"]
+    vm["levels"][metric["concurrency"]][metric["outcome"]] += 1
+    stage = state["current_stage"]
+    if stage is not None and metric["outcome"] == "completed":
+        stage["completed"] += 1
+
+def record_auth(state, metric):
+    auth = state["auth"]
+    if metric["source"] == "cache":
+        auth["cache_hits"] += 1
+    else:
+        auth["reauths"] += 1
+        auth["latency"].record(metric["latency"])
+
+def record_search(state, metric):
+    state["searches"].append({key: value for key, value in metric.items() if key != "kind"})
+
+def record_cleanup(state, metric):
+    state["cleanups"].append({key: metric[key] for key in ("phase", "duration", "deleted", "failed")})
+
+def record_vm_phases(state, metric):
+    vm = state["vm"]
+    for phase in metric["phases"]:
+        histogram = vm["phases"].get(phase["phase"])
+        if histogram is None:
+            histogram = vm["phases"][phase["phase"]] = LatencyHistogram()
+        histogram.record(phase["end"] - phase["start"])
+    vm["recent_timelines"].append(metric)
+
+def record_lifecycle_timing(state, metric):
+    vm = state["vm"]
+    vm["lifecycle_corrected_latency"].record(metric["corrected_latency"])
+    if metric["success"]:
+        vm["lifecycle_latency"].record(metric["latency"])
+    else:
+        vm["lifecycle_failures"] += 1
+
+def record_open_loop(state, metric):
+    api = state["api"]
+    stats = api["open_loop"]
+    stats["in_flight"] += metric["delta"]
+    stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+def export_summary(state):
+    """Mergeable, JSON-safe form of the API and wire stats a worker collected"""
+    api = state["api"]
+    return {
+        "windows": {
+            start: {
+                "latency": stats["latency"].to_dict(),
+                "response_time": stats["response_time"].to_dict(),
+                "corrected_latency": stats["corrected_latency"].to_dict(),
+                "requests": stats["requests"],
+                "operations": {operation: histogram.to_dict() for operation, histogram in stats["operations"].items()},
+                "wire_bytes": stats["wire_bytes"]
+            } for start, stats in api["windows"].items()
+        },
+        "operations": {
+            operation: {"latency": stats["latency"].to_dict(), "failures": stats["failures"]}
+            for operation, stats in api["operations"].items()
+        },
+        "wire": {
+            service: dict(stats, ttfb=stats["ttfb"].to_dict(), pool_wait=stats["pool_wait"].to_dict(),
+                          status_codes=dict(stats["status_codes"]))
+            for service, stats in api["wire"].items()
+        },
+        "overall_latency": api["overall_latency"].to_dict(),
+        "overall_corrected_latency": api["overall_corrected_latency"].to_dict(),
+        "success_count": api["success_count"],
+        "failure_count": api["failure_count"],
+        # Net change in in-flight open-loop operations, and the peak relative to the previous summary
+        "open_loop": dict(api["open_loop"])
+    }
+
+def record_summary(state, metric):
+    """Merge a distributed worker's pre-aggregated API and wire stats"""
+    api = state["api"]
+    summary = metric["summary"]
+    for start, data in summary["windows"].items():
+        window = get_window(api, int(start))
+        if window is None:
+            continue
+        for key in ("latency", "response_time", "corrected_latency"):
+            window[key].merge(LatencyHistogram.from_dict(data[key]))
+        window["requests"] += data["requests"]
+        for operation, histogram in data["operations"].items():
+            window["operations"].setdefault(operation, LatencyHistogram()).merge(LatencyHistogram.from_dict(histogram))
+        for service, total in data["wire_bytes"].items():
+            window["wire_bytes"][service] = window["wire_bytes"].get(service, 0) + total
+    for operation, data in summary["operations"].items():
+        stats = api["operations"].setdefault(operation, {"latency": LatencyHistogram(), "failures": 0})
+        stats["latency"].merge(LatencyHistogram.from_dict(data["latency"]))
+        stats["failures"] += data["failures"]
+    for service, data in summary["wire"].items():
+        stats = api["wire"].get(service)
+        if stats is None:
+            stats = api["wire"][service] = new_wire_stats()
+        for key in ("requests", "request_bytes", "response_bytes", "new_connections", "reused_connections"):
+            stats[key] += data[key]
+        stats["ttfb"].merge(LatencyHistogram.from_dict(data["ttfb"]))
+        if "pool_wait" in data:  # Absent from summaries recorded before pool wait was tracked
+            stats["pool_wait"].merge(LatencyHistogram.from_dict(data["pool_wait"]))
+        for status, count in data["status_codes"].items():
+            stats["status_codes"][int(status)] += count
+        if state["current_stage"] is not None:
+            state["current_stage"]["http_requests"] += data["requests"]
+            state["current_stage"]["throttled"] += sum(
+                count for status, count in data["status_codes"].items() if int(status) in THROTTLE_STATUSES
+            )
+    overall_latency = LatencyHistogram.from_dict(summary["overall_latency"])
+    api["overall_latency"].merge(overall_latency)
+    api["overall_corrected_latency"].merge(LatencyHistogram.from_dict(summary["overall_corrected_latency"]))
+    api["success_count"] += summary["success_count"]
+    api["failure_count"] += summary["failure_count"]
+    open_loop = summary.get("open_loop")  # Absent from summaries recorded before it was folded in
+    if open_loop:
+        stats = api["open_loop"]
+        # Other workers are taken as steady while this one peaked
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"] + open_loop["max_in_flight"])
+        stats["in_flight"] += open_loop["in_flight"]
+    stage = state["current_stage"]
+    if stage is not None:
+        stage["latency"].merge(overall_latency)
+        stage["successes"] += summary["success_count"]
+        stage["failures"] += summary["failure_count"]
+
+def record_stage_started(state, metric):
+    stage = {
+        "name": metric["name"],
+        "type": metric["type"],
+        "load": metric["load"],
+        "slo": metric["slo"],
+        "started": metric["started"],
+        "elapsed": None,
+        "latency": LatencyHistogram(),
+        "creation_time": LatencyHistogram(),
+        "successes": 0,
+        "failures": 0,
+        "completed": 0,  # VM lifecycles finished
+        "http_requests": 0,
+        "throttled": 0  # 429/503 responses
+    }
+    state["stages"].append(stage)
+    state["current_stage"] = stage
+
+def record_stage_finished(state, metric):
+    state["current_stage"]["elapsed"] = metric["elapsed"]
+    state["current_stage"] = None
+
+METRIC_HANDLERS = {
+    "api": record_api_metric,
+    "wire": record_wire_metric,
+    "vm_created": record_vm_created,
+    "vm_phases": record_vm_phases,
+    "level_started": record_level_started,
+    "level_finished": record_level_finished,
+    "lifecycle": record_lifecycle,
+    "lifecycle_timing": record_lifecycle_timing,
+    "open_loop": record_open_loop,
+    "stage_started": record_stage_started,
+    "stage_finished": record_stage_finished,
+    "summary": record_summary,
+    "cleanup": record_cleanup,
+    "auth": record_auth,
+    "search": record_search
+}
+
+def open_runs_db(path):
+    db = sqlite3.connect(path, timeout=30)
+    # WAL lets the dashboard read past runs while the recorder appends
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            started REAL NOT NULL,
+            finished REAL,
+            status TEXT NOT NULL,
+            metadata TEXT NOT NULL
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS segments (
+            run_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            first_ts REAL NOT NULL,
+            last_ts REAL NOT NULL,
+            events INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            PRIMARY KEY (run_id, seq)
+        )""")
+    return db
+
+
+class RunRecorder:
+    """Streams every collected metric event to SQLite for later replay
+
+    The collector appends events to an in-memory batch; full or stale batches
+    are handed to a writer thread that stores each one as a single
+    zlib-compressed segment of JSON lines, so the hot path never touches
+    disk and a multi-hour soak run stays in the low megabytes.
+    """
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.run_id = RUN_ID
+        self.events = 0
+        self._buffer = []
+        self._buffer_started = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._segments = queue.Queue()
+        with closing(open_runs_db(path)) as db:
+            db.execute(
+                "INSERT INTO runs (run_id, started, status, metadata) VALUES (?, ?, 'running', ?)",
+                (self.run_id, time.time(), json.dumps(metadata))
+            )
+            db.commit()
+        self._thread = threading.Thread(target=self._write_segments, name="run-recorder", daemon=True)
+        self._thread.start()
+        logger.info(f"Recording run {self.run_id} to {path}")
+
+    def record(self, metric):
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started = time.time()
+            self._buffer.append(metric)
+            self.events += 1
+            if len(self._buffer) >= RECORD_BATCH_SIZE:
+                self._flush()
+
+    def tick(self):
+        """Flush a partial batch once it is older than RECORD_FLUSH_INTERVAL"""
+        with self._lock:
+            if self._buffer and time.time() - self._buffer_started >= RECORD_FLUSH_INTERVAL:
+                self._flush()
+
+    def _flush(self):
+        self._segments.put((next(self._seq), self._buffer_started, time.time(), self._buffer))
+        self._buffer = []
+
+    def close(self, status):
+        with self._lock:
+            if self._buffer:
+                self._flush()
+        self._segments.put(None)
+        self._thread.join()
+        with closing(open_runs_db(self.path)) as db:
+            db.execute("UPDATE runs SET finished = ?, status = ? WHERE run_id = ?", (time.time(), status, self.run_id))
+            db.commit()
+        logger.info(f"Run {self.run_id} recorded ({self.events} events, status {status})")
+
+    def _write_segments(self):
+        db = open_runs_db(self.path)
+        try:
+            while True:
+                segment = self._segments.get()
+                if segment is None:
+                    break
+                seq, first_ts, last_ts, events = segment
+                payload = zlib.compress(
+                    "\n".join(json.dumps(event, separators=(",", ":")) for event in events).encode()
+                )
+                db.execute(
+                    "INSERT INTO segments (run_id, seq, first_ts, last_ts, events, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.run_id, seq, first_ts, last_ts, len(events), payload)
+                )
+                db.commit()
+        except Exception as e:
+            logger.error(f"Run recording failed: {str(e)}")
+        finally:
+            db.close()
+
+
+run_recorder = None
+
+def list_recorded_runs(path=RUNS_DB):
+    """Recorded runs, newest first"""
+    if not path or not os.path.exists(path):
+        return []
+    with closing(open_runs_db(path)) as db:
+        rows = db.execute("SELECT run_id, started, finished, status, metadata FROM runs ORDER BY started DESC").fetchall()
+    return [
+        {"run_id": run_id, "started": started, "finished": finished, "status": status, "metadata": json.loads(metadata)}
+        for run_id, started, finished, status, metadata in rows
+    ]
+
+# Finished runs never change, so their replayed snapshots are kept
+replay_cache = {}
+
+def replay_run(run_id, path=RUNS_DB):
+    """Rebuild a metrics snapshot for a recorded run by re-ingesting its events"""
+    if run_id in replay_cache:
+        return replay_cache[run_id]
+    state = new_metrics_state()
+    with closing(open_runs_db(path)) as db:
+        row = db.execute("SELECT finished, status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            logger.error(f"No recorded run {run_id} in {path}")
+            raise ValueError(f"No such run: {run_id}")
+        finished, status = row
+        last_ts = 0
+        for payload, segment_end in db.execute(
+                "SELECT payload, last_ts FROM segments WHERE run_id = ? ORDER BY seq", (run_id,)):
+            for line in zlib.decompress(payload).decode().splitlines():
+                metric = json.loads(line)
+                METRIC_HANDLERS[metric.get("kind", "api")](state, metric)
+            last_ts = segment_end
+    # Every window of a recorded run is final
+    end = finished or last_ts
+    close_windows(state, end + METRICS_WINDOW + WINDOW_GRACE)
+    snapshot = build_metrics_snapshot(state, end)
+    if status != "running":
+        replay_cache[run_id] = snapshot
+    return snapshot
+
 def collect_metrics():
-    """Background thread to collect performance metrics"""
-    while True:
+    """Background thread to collect performance metrics
+
+    The only writer of api_metrics/vm_metrics. Every SNAPSHOT_INTERVAL it
+    publishes a fresh metrics_snapshot; swapping the reference is atomic, so
+    the dashboard never waits on ingestion and ingestion never waits on it.
+    Once collector_stop is set and the queue is drained it publishes a
+    final snapshot, which the end-of-run reports are built from.
+    """
+    global metrics_snapshot
+    last_published = 0
+    while not (collector_stop.is_set() and metrics_queue.empty()):
         try:
-            metric = metrics_queue.get(timeout=1)
-            with resource_lock:
-                minute = metric["minute"]
-                if minute not in api_metrics["timestamps"]:
-                    api_metrics["timestamps"].append(minute)
-                if metric["success"]:
-                    api_metrics["latencies"][minute].append(metric["latency"])
-                    api_metrics["response_times"][minute].append(metric["response_time"])
-                    api_metrics["throughput"][minute].append(metric["throughput"])
-                    api_metrics["bandwidth"][minute].append(metric["bandwidth"])
-                    api_metrics["success_count"] += 1
-                else:
-                    api_metrics["failure_count"] += 1
+            metric = metrics_queue.get(timeout=SNAPSHOT_INTERVAL)
+            METRIC_HANDLERS[metric.get("kind", "api")](live_metrics, metric)
+            if run_recorder is not None:
+                run_recorder.record(metric)
             metrics_queue.task_done()
         except queue.Empty:
-            continue
+            pass
+        except Exception as e:
+            logger.error(f"Dropping malformed metric: {str(e)}")
+            metrics_queue.task_done()
+        now = time.time()
+        if now - last_published >= SNAPSHOT_INTERVAL:
+            close_windows(live_metrics, now)
+            metrics_snapshot = build_metrics_snapshot(live_metrics, now)
+            last_published = now
+            if run_recorder is not None:
+                run_recorder.tick()
+    # Nothing more can arrive, so every window of the run is final
+    now = time.time()
+    close_windows(live_metrics, now + METRICS_WINDOW + WINDOW_GRACE)
+    metrics_snapshot = build_metrics_snapshot(live_metrics, now)
+
+# Deletion order; a level starts once everything it depends on is gone
+CLEANUP_LEVELS = ("servers", "routers", "ports", "subnets", "networks", "security_groups")
+
+# Names resources had before the harness tagged them; pre-run cleanup still finds untagged
+# leftovers of those runs by name, as their subnets would collide with the ones created here
+LEGACY_NAMES = {
+    "servers": ["^test_vm_"],  # Nova matches names as a regular expression
+    "ports": ["test_pool_port"],
+    "subnets": ["test_subnet", "test_pool_subnet"],
+    "networks": ["test_network", "test_pool_network"],
+    "security_groups": ["test_sec_group"]
+}
+
+# Whether Nova takes tags in the boot request (microversion 2.52); probed on the first boot
+boot_tags_supported = None
+
+def run_tags():
+    return [HARNESS_TAG, f"{HARNESS_TAG}-run-{RUN_ID}"]
+
+def supports_boot_tags(conn):
+    global boot_tags_supported
+    if boot_tags_supported is None:
+        boot_tags_supported = supports_microversion(conn.compute, "2.52")
+        if not boot_tags_supported:
+            logger.info("Compute API is older than microversion 2.52, servers are tagged after boot")
+    return boot_tags_supported
+
+def tag_resource(conn, resource):
+    """Tag a Neutron resource with the harness and run tags"""
+    measure_api_performance(conn.network.set_tags, resource, run_tags())
+    return resource
+
+def resource_age(resource, now):
+    created = getattr(resource, "created_at", None)
+    return now - parse_nova_time(created) if created else float("inf")
+
+def find_tagged(conn, kind, tag):
+    """Resources carrying `tag`
+
+    Nova before 2.26 and Neutron without standard-attr-tag ignore the tags
+    filter and list everything, so the tags are checked here too; whatever
+    this returns gets deleted.
+    """
+    if kind == "servers":
+        resources = measure_api_performance(lambda: list(conn.compute.servers(tags=tag)),
+                                            operation="list_tagged_servers")
+    else:
+        resources = measure_api_performance(lambda: list(getattr(conn.network, kind)(tags=tag)),
+                                            operation=f"list_tagged_{kind}")
+    return [resource for resource in resources if tag in (resource.tags or [])]
+
+def find_untagged_legacy(conn, kind):
+    """Resources named as in LEGACY_NAMES that do not carry HARNESS_TAG"""
+    found = []
+    for name in LEGACY_NAMES.get(kind, []):
+        if kind == "servers":
+            resources = measure_api_performance(lambda: list(conn.compute.servers(name=name)),
+                                                operation="list_legacy_servers")
+            matches = lambda resource: re.search(name, resource.name or "")
+        else:
+            resources = measure_api_performance(lambda: list(getattr(conn.network, kind)(name=name)),
+                                                operation=f"list_legacy_{kind}")
+            matches = lambda resource: resource.name == name
+        # As with tags, the name filter is checked again before anything is deleted
+        found += [resource for resource in resources
+                  if matches(resource) and HARNESS_TAG not in (resource.tags or [])]
+    return found
+
+def detach_router(conn, router):
+    """Remove a router's subnet interfaces; Neutron refuses to delete a router that still has any"""
+    ports = measure_api_performance(lambda: list(conn.network.ports(device_id=router.id)),
+                                    operation="list_router_ports")
+    for port in ports:
+        if port.device_id == router.id and port.device_owner == "network:router_interface":
+            for fixed_ip in port.fixed_ips or []:
+                measure_api_performance(conn.network.remove_interface_from_router, router,
+                                        subnet_id=fixed_ip["subnet_id"])
+
+def delete_tagged(conn, kind, resource):
+    """Delete one resource; servers are waited for, as their ports go with them"""
+    try:
+        if kind == "servers":
+            measure_api_performance(conn.compute.delete_server, resource, ignore_missing=True)
+            # The status tracker is stopped by the time cleanup runs, so poll directly
+            measure_api_performance(conn.compute.wait_for_delete, resource, wait=300, operation="wait_for_delete")
+        elif kind == "routers":
+            detach_router(conn, resource)
+            measure_api_performance(conn.network.delete_router, resource, ignore_missing=True)
+        else:
+            measure_api_performance(getattr(conn.network, f"delete_{kind[:-1]}"), resource, ignore_missing=True)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to delete {kind[:-1]} {resource.id}: {str(e)}")
+        return False
+
+def cleanup_tagged(conn, tag, phase, min_age=0, legacy=False):
+    """Delete every resource tagged `tag`, level by level, in parallel within each level
+
+    With `legacy`, untagged resources named as in LEGACY_NAMES go too.
+    A `min_age` of 0 skips the age check, so clock skew cannot spare anything.
+    """
+    started = time.time()
+    deleted = {}
+    failed = 0
+    with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS, thread_name_prefix=f"cleanup-{phase}") as pool:
+        for kind in CLEANUP_LEVELS:
+            candidates = {resource.id: resource for resource in find_tagged(conn, kind, tag)}
+            if legacy:
+                candidates.update((resource.id, resource) for resource in find_untagged_legacy(conn, kind))
+            resources = [resource for resource in candidates.values()
+                         if min_age <= 0 or resource_age(resource, started) >= min_age]
+            if not resources:
+                continue
+            results = list(pool.map(lambda resource: delete_tagged(conn, kind, resource), resources))
+            deleted[kind] = results.count(True)
+            failed += results.count(False)
+    duration = time.time() - started
+    metrics_queue.put({"kind": "cleanup", "phase": phase, "duration": duration, "deleted": deleted, "failed": failed})
+    removed = ", ".join(f"{count} {kind}" for kind, count in deleted.items()) or "nothing"
+    logger.info(f"{phase.capitalize()}-run cleanup removed {removed} in {duration:.2f}s ({failed} failed)")
 
 def pre_cleanup(conn):
-    """Clean up any existing test resources"""
+    """Clean up test resources left behind by earlier runs"""
     try:
         logger.info("Checking for existing test resources")
-        for network in conn.network.networks(name="test_network"):
-            logger.info(f"Deleting network {network.name}")
-            for subnet in conn.network.subnets(network_id=network.id):
-                logger.info(f"Deleting subnet {subnet.name}")
-                measure_api_performance(conn.network.delete_subnet, subnet)
-            measure_api_performance(conn.network.delete_network, network)
-        for sec_group in conn.network.security_groups(name="test_sec_group"):
-            logger.info(f"Deleting security group {sec_group.name}")
-            measure_api_performance(conn.network.delete_security_group, sec_group)
+        cleanup_tagged(conn, HARNESS_TAG, "pre", min_age=LEFTOVER_AGE, legacy=True)
     except Exception as e:
         logger.error(f"Cleanup error: {str(e)}")
         raise
@@ -136,13 +1189,14 @@ def pre_cleanup(conn):
 def create_network_resources(conn):
     """Create test network and subnet"""
     try:
-        with resource_lock:
+        with provision_lock:
             logger.info("Creating test network")
             network = measure_api_performance(
                 conn.network.create_network,
                 name="test_network",
                 admin_state_up=True
             )
+            tag_resource(conn, network)
             logger.info("Creating test subnet")
             subnet = measure_api_performance(
                 conn.network.create_subnet,
@@ -153,21 +1207,52 @@ def create_network_resources(conn):
                 gateway_ip="192.168.1.1",
                 enable_dhcp=True
             )
+            tag_resource(conn, subnet)
             return network, subnet
     except Exception as e:
         logger.error(f"Network creation failed: {str(e)}")
         raise
 
+def create_pool_networks(conn, count):
+    """Extra networks the port pool spreads its ports over, as (network, subnet) pairs"""
+    try:
+        pairs = []
+        with provision_lock:
+            for index in range(count):
+                logger.info(f"Creating port pool network {index + 1}/{count}")
+                network = measure_api_performance(
+                    conn.network.create_network,
+                    name="test_pool_network",
+                    admin_state_up=True
+                )
+                subnet = measure_api_performance(
+                    conn.network.create_subnet,
+                    name="test_pool_subnet",
+                    network_id=network.id,
+                    ip_version=4,
+                    cidr=f"192.168.{10 + index}.0/24",
+                    gateway_ip=f"192.168.{10 + index}.1",
+                    enable_dhcp=True
+                )
+                tag_resource(conn, network)
+                tag_resource(conn, subnet)
+                pairs.append((network, subnet))
+        return pairs
+    except Exception as e:
+        logger.error(f"Port pool network creation failed: {str(e)}")
+        raise
+
 def create_security_group(conn):
     """Create test security group with rules"""
     try:
-        with resource_lock:
+        with provision_lock:
             logger.info("Creating security group")
             sec_group = measure_api_performance(
                 conn.network.create_security_group,
                 name="test_sec_group",
                 description="Test security group"
             )
+            tag_resource(conn, sec_group)
             measure_api_performance(
                 conn.network.create_security_group_rule,
                 security_group_id=sec_group.id,
@@ -189,19 +1274,101 @@ def create_security_group(conn):
         logger.error(f"Security group creation failed: {str(e)}")
         raise
 
+class ResolutionCache:
+    """Thread-safe TTL cache for image/flavor lookups shared by all workers
+
+    Only one worker reloads an expired entry; the others wait for it
+    instead of issuing the same listing in parallel.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # {key: (value, expires_at)}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[1] > time.monotonic():
+            self.hits += 1
+            return True, entry[0]
+        return False, None
+
+    def get(self, key, loader):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                self.misses += 1
+            value = loader()
+            with self._lock:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+            return value
+
+    def invalidate(self, key=None):
+        """Drop one entry, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+resolution_cache = ResolutionCache(RESOLUTION_CACHE_TTL)
+
+def lookup_image(conn):
+    """Resolve the test image, filtering by name on the server side first"""
+    images = list(conn.image.images(name=IMAGE_NAME, status="active"))
+    if images:
+        logger.info(f"Found image by name: {images[0].name}")
+        return images[0]
+    # Fall back to a full listing for partial name matches
+    images = list(conn.image.images())
+    if not images:
+        raise Exception("No images available in the cloud")
+    for img in images:
+        if IMAGE_NAME.lower() in (img.name or "").lower():
+            logger.info(f"Found {IMAGE_NAME} image: {img.name}")
+            return img
+    logger.info(f"Using first available image: {images[0].name}")
+    return images[0]
+
+def list_flavors(conn):
+    """Every flavor, smallest by RAM first; listed at most once per TTL for name lookups"""
+    return resolution_cache.get("flavors", lambda: list(conn.compute.flavors(sort_key="memory_mb", sort_dir="asc")))
+
+def lookup_flavor(conn):
+    """Resolve the test flavor by id, then by name, falling back to the smallest by RAM"""
+    try:
+        flavor = conn.compute.get_flavor(FLAVOR_NAME)
+        logger.info(f"Found flavor {flavor.name} by id {FLAVOR_NAME}")
+        return flavor
+    except ResourceNotFound:
+        pass
+    # Unlike find_flavor, a name miss reuses the cached listing instead of listing every flavor again
+    flavors = list_flavors(conn)
+    for flavor in flavors:
+        if flavor.name == FLAVOR_NAME:
+            logger.info(f"Found {FLAVOR_NAME} flavor")
+            return flavor
+    if not flavors:
+        raise Exception("No flavors available in the cloud")
+    smallest = flavors[0]
+    logger.info(f"Using smallest available flavor: {smallest.name} (RAM: {smallest.ram}MB)")
+    return smallest
+
 def find_image(conn):
     """Find suitable image for testing"""
     try:
-        logger.info("Searching for available images")
-        images = list(conn.image.images())
-        if not images:
-            raise Exception("No images available in the cloud")
-        for img in images:
-            if "cirros" in img.name.lower():
-                logger.info(f"Found CirrOS image: {img.name}")
-                return img
-        logger.info(f"Using first available image: {images[0].name}")
-        return images[0]
+        return resolution_cache.get("image", lambda: lookup_image(conn))
     except Exception as e:
         logger.error(f"Image search failed: {str(e)}")
         raise
@@ -209,288 +1376,1961 @@ def find_image(conn):
 def find_flavor(conn):
     """Find suitable flavor for testing"""
     try:
-        logger.info("Searching for available flavors")
-        flavors = list(conn.compute.flavors())
-        if not flavors:
-            raise Exception("No flavors available in the cloud")
-        for flv in flavors:
-            if flv.name == "m1.tiny":
-                logger.info("Found m1.tiny flavor")
-                return flv
-        smallest = min(flavors, key=lambda x: x.ram)
-        logger.info(f"Using smallest available flavor: {smallest.name} (RAM: {smallest.ram}MB)")
-        return smallest
+        return resolution_cache.get("flavor", lambda: lookup_flavor(conn))
     except Exception as e:
         logger.error(f"Flavor search failed: {str(e)}")
         raise
 
-def manage_vm_lifecycle(conn, network, sec_group):
+class ServerStatusTracker:
+    """Shared poller that refreshes every in-flight server with one list call per tick
+
+    Workers block in wait_for_status/wait_for_delete and are woken when the
+    tracker sees their target state, instead of each polling its own server.
+    After the first full listing, ticks ask only for servers changed since
+    the previous tick (Nova's changes-since, which also reports deletions);
+    a periodic full resync covers anything changes-since missed.
+    """
+
+    CLOCK_SKEW = timedelta(seconds=5)  # Overlap between changes-since windows
+    FULL_RESYNC_TICKS = 30
+
+    def __init__(self, conn, name_filter=None, interval=STATUS_POLL_INTERVAL):
+        self.conn = conn
+        self.name_filter = name_filter
+        self.interval = interval
+        self.list_requests = 0
+        self.estimated_individual_polls = 0
+        self.supports_changes_since = True
+        self._servers = {}  # {server_id: last seen server}
+        self._waiters = {}  # {server_id: [waiter]}
+        # Build progress seen while polling, {server_id: {"task_states": [(seen_at, state)], "port": {...}}};
+        # observation times, so resolution is the poll interval
+        self._timelines = {}
+        self.port_network_id = None
+        self._changes_since = None
+        self._ticks = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="status-tracker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def saved_requests(self):
+        return max(self.estimated_individual_polls - self.list_requests, 0)
+
+    def _wait(self, server, target, wait):
+        waiter = {"target": target, "event": threading.Event(), "server": None, "error": None}
+        started = time.time()
+        with self._lock:
+            known = self._servers.get(server.id)
+            if known is not None and known["status"] == target:
+                return known["server"]
+            self._waiters.setdefault(server.id, []).append(waiter)
+        self._wakeup.set()
+        try:
+            if not waiter["event"].wait(wait):
+                raise ResourceTimeout(f"Timeout waiting for server {server.id} to reach {target}")
+        finally:
+            with self._lock:
+                if waiter in self._waiters.get(server.id, []):
+                    self._waiters[server.id].remove(waiter)
+                    if not self._waiters[server.id]:
+                        del self._waiters[server.id]
+                # What wait_for_server would have spent on GET /servers/{id}
+                self.estimated_individual_polls += int((time.time() - started) // SDK_POLL_INTERVAL) + 1
+        if waiter["error"]:
+            raise waiter["error"]
+        return waiter["server"]
+
+    def wait_for_status(self, server, status, wait=300):
+        return self._wait(server, status, wait)
+
+    def wait_for_delete(self, server, wait=300):
+        return self._wait(server, "DELETED", wait)
+
+    def watch_ports(self, network_id):
+        """Also follow Neutron port status of building servers attached to `network_id`"""
+        self.port_network_id = network_id
+
+    def pop_timeline(self, server_id):
+        """Task state and port observations for a server, once it has left BUILD"""
+        with self._lock:
+            return self._timelines.pop(server_id, None)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if not self._waiters:
+                # Idle until a worker registers a waiter
+                self._wakeup.wait(self.interval)
+                self._wakeup.clear()
+                continue
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Server status refresh failed: {str(e)}")
+            self._stopped.wait(self.interval)
+
+    def _refresh(self):
+        self._ticks += 1
+        full_resync = (
+            self._changes_since is None
+            or not self.supports_changes_since
+            or self._ticks % self.FULL_RESYNC_TICKS == 0
+        )
+        tick_started = datetime.now(timezone.utc)
+        query = {"details": True}
+        if self.name_filter:
+            query["name"] = self.name_filter
+        if not full_resync:
+            query["changes_since"] = self._changes_since
+        try:
+            servers = measure_api_performance(
+                lambda: list(self.conn.compute.servers(**query)),
+                operation="status_tracker_list"
+            )
+        except BadRequestException:
+            if full_resync:
+                raise
+            logger.warning("changes-since not supported, falling back to full listings")
+            self.supports_changes_since = False
+            return
+        self.list_requests += 1
+        self._changes_since = (tick_started - self.CLOCK_SKEW).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        seen = {server.id: server for server in servers}
+        now = time.time()
+        building = self._observe_build(seen, now)
+        if building and self.port_network_id:
+            self._observe_ports(building, now)
+        with self._lock:
+            for server_id, server in seen.items():
+                self._servers[server_id] = {
+                    "status": "DELETED" if server.status in ("DELETED", "SOFT_DELETED") else server.status,
+                    "server": server
+                }
+            if full_resync:
+                # Anything missing from a full listing has been deleted
+                for server_id in set(self._waiters) - set(seen):
+                    self._servers[server_id] = {"status": "DELETED", "server": None}
+            for server_id, waiters in self._waiters.items():
+                state = self._servers.get(server_id)
+                if state is None:
+                    continue
+                for waiter in waiters:
+                    if state["status"] == waiter["target"]:
+                        waiter["server"] = state["server"]
+                        waiter["event"].set()
+                    elif state["status"] == "ERROR":
+                        waiter["error"] = ResourceFailure(f"Server {server_id} went to ERROR waiting for {waiter['target']}")
+                        waiter["event"].set()
+            # Forget servers nobody waits for once they are gone
+            for server_id in [sid for sid, state in self._servers.items()
+                              if state["status"] == "DELETED" and sid not in self._waiters]:
+                del self._servers[server_id]
+                self._timelines.pop(server_id, None)
+
+    def _observe_build(self, seen, now):
+        """Record task_state transitions; returns the ids of servers still building"""
+        building = set()
+        with self._lock:
+            for server_id, server in seen.items():
+                timeline = self._timelines.get(server_id)
+                if server.status == "BUILD":
+                    if timeline is None:
+                        timeline = self._timelines[server_id] = {"task_states": [], "port": {}, "done": False}
+                    building.add(server_id)
+                elif timeline is None or timeline["done"]:
+                    continue
+                state = getattr(server, "task_state", None) or server.status.lower()
+                if not timeline["task_states"] or timeline["task_states"][-1][1] != state:
+                    timeline["task_states"].append((now, state))
+                timeline["done"] = server.status != "BUILD"
+        return building
+
+    def _observe_ports(self, building, now):
+        """Note when each building server's port first appears and first goes ACTIVE"""
+        ports = measure_api_performance(
+            lambda: list(self.conn.network.ports(network_id=self.port_network_id)),
+            operation="status_tracker_ports"
+        )
+        with self._lock:
+            for port in ports:
+                if port.device_id not in building:
+                    continue
+                seen = self._timelines[port.device_id]["port"]
+                seen.setdefault("created", now)
+                if port.status == "ACTIVE":
+                    seen.setdefault("active", now)
+
+
+status_tracker = None
+
+
+class PortPool:
+    """Neutron ports created ahead of VM boots and reused after each delete
+
+    A VM booted onto an existing port skips port allocation inside
+    create_server, so its creation time is Nova scheduling and boot alone;
+    port creation is measured separately (create_port) by the refill
+    thread, which tops the idle ports back up to the watermark. When the
+    pool runs dry the VM boots onto the network as before and a miss is
+    counted. Ports of failed lifecycles may still be bound, so they are
+    deleted rather than reused.
+    """
+
+    def __init__(self, conn, networks, sec_group, watermark=PORT_POOL_SIZE, interval=PORT_POOL_REFILL_INTERVAL):
+        self.conn = conn
+        self.sec_group = sec_group
+        self.watermark = watermark
+        self.interval = interval
+        self.created = 0
+        self.handed_out = 0
+        self.recycled = 0
+        self.misses = 0
+        self._networks = itertools.cycle(networks)
+        self._idle = deque()
+        self._discarded = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="port-pool", daemon=True)
+
+    def start(self):
+        """Pre-warm to the watermark, then keep refilling in the background"""
+        started = time.time()
+        self._refill()
+        logger.info(f"Pre-warmed {len(self._idle)} ports in {time.time() - started:.2f}s")
+        self._thread.start()
+        return self
+
+    def acquire(self):
+        """An idle port, or None when the pool is empty and Nova should allocate one"""
+        with self._lock:
+            port = self._idle.popleft() if self._idle else None
+            if port is None:
+                self.misses += 1
+            else:
+                self.handed_out += 1
+        self._wakeup.set()
+        return port
+
+    def release(self, port, reusable=True):
+        """Return a port after its server is deleted; unusable ports are deleted in the background"""
+        with self._lock:
+            if reusable:
+                self._idle.append(port)
+                self.recycled += 1
+            else:
+                self._discarded.append(port)
+        self._wakeup.set()
+
+    def stop(self):
+        """Stop refilling; the ports themselves go with the run's tagged cleanup"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        logger.info(f"Port pool created {self.created} ports, handed out {self.handed_out} "
+                    f"({self.recycled} recycled), {self.misses} misses")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                while self._discarded and not self._stopped.is_set():
+                    self._delete(self._discarded.popleft())
+                self._refill()
+            except Exception as e:
+                logger.error(f"Port pool refill failed: {str(e)}")
+
+    def _refill(self):
+        while len(self._idle) < self.watermark and not self._stopped.is_set():
+            port = measure_api_performance(
+                self.conn.network.create_port,
+                name="test_pool_port",
+                network_id=next(self._networks).id,
+                security_group_ids=[self.sec_group.id]
+            )
+            tag_resource(self.conn, port)
+            with self._lock:
+                self._idle.append(port)
+                self.created += 1
+
+    def _delete(self, port):
+        measure_api_performance(self.conn.network.delete_port, port, ignore_missing=True)
+
+
+port_pool = None
+
+def wait_for_server_status(conn, server, status, wait=300):
+    """Wait for a server state through the shared tracker when it is running"""
+    if status_tracker is not None:
+        return status_tracker.wait_for_status(server, status, wait)
+    return conn.compute.wait_for_server(server, status=status, wait=wait)
+
+def wait_for_server_delete(conn, server, wait=300):
+    """Wait for a server to disappear through the shared tracker when it is running"""
+    if status_tracker is not None:
+        return status_tracker.wait_for_delete(server, wait)
+    return conn.compute.wait_for_delete(server, wait=wait)
+
+# Cleared the first time the instance actions API is refused, e.g. by policy
+nova_events_supported = True
+
+def parse_nova_time(value):
+    """Epoch seconds of a Nova timestamp (UTC, usually without an offset)"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def nova_build_events(conn, server, start_time):
+    """Phases from the events of the server's "create" instance action"""
+    global nova_events_supported
+    if not nova_events_supported:
+        return []
+    try:
+        actions = measure_api_performance(lambda: list(conn.compute.server_actions(server)), operation="server_actions")
+        create = next((action for action in actions if action.action == "create"), None)
+        if create is None:
+            return []
+        action = measure_api_performance(conn.compute.get_server_action, create.request_id, server)
+    except Exception as e:
+        logger.warning(f"Instance actions unavailable, VM timelines will use polling only: {str(e)}")
+        nova_events_supported = False
+        return []
+    phases = []
+    for event in action.events or []:
+        if not event.get("start_time") or not event.get("finish_time"):
+            continue
+        # Server clock; skew against this host shifts these bars
+        phases.append({
+            "phase": event["event"],
+            "source": "nova",
+            "start": parse_nova_time(event["start_time"]) - start_time,
+            "end": parse_nova_time(event["finish_time"]) - start_time
+        })
+    return phases
+
+def vm_phase_timeline(conn, server, start_time, request_end, active_time):
+    """Creation phases of one VM in seconds since its create request was sent"""
+    phases = [{"phase": "api_request", "source": "client", "start": 0, "end": request_end - start_time}]
+    observed = status_tracker.pop_timeline(server.id) if status_tracker is not None else None
+    if observed:
+        transitions = observed["task_states"] + [(active_time, None)]
+        for (seen_at, state), (next_seen, _) in zip(transitions, transitions[1:]):
+            if state is not None and state != "active":
+                phases.append({"phase": state, "source": "task_state",
+                               "start": seen_at - start_time, "end": max(next_seen, seen_at) - start_time})
+        port = observed["port"]
+        if "created" in port:
+            phases.append({"phase": "port_binding", "source": "neutron",
+                           "start": port["created"] - start_time,
+                           "end": port.get("active", active_time) - start_time})
+    phases.extend(nova_build_events(conn, server, start_time))
+    return phases
+
+def manage_vm_lifecycle(conn, network, sec_group, vm_name):
     """Complete VM lifecycle management"""
-    global vm_count, vm_metrics
-    
-    vm_name = f"test_vm_{vm_count}"
-    
+    port = None
     try:
         image = find_image(conn)
         flavor = find_flavor(conn)
         
+        if port_pool is not None:
+            port = port_pool.acquire()
         logger.info(f"Starting VM {vm_name} lifecycle")
         start_time = time.time()
         
+        if port is not None:
+            # The pool port already carries the security group
+            nics = {"networks": [{"port": port.id}]}
+        else:
+            nics = {"networks": [{"uuid": network.id}], "security_groups": [{"name": sec_group.name}]}
+        tags = {"tags": run_tags()} if supports_boot_tags(conn) else {}
         server = measure_api_performance(
             conn.compute.create_server,
             name=vm_name,
             image_id=image.id,
             flavor_id=flavor.id,
-            networks=[{"uuid": network.id}],
-            security_groups=[{"name": sec_group.name}],
+            **nics,
+            **tags
         )
+        request_end = time.time()
+        if not tags:
+            # Until this lands only the name prefix marks the server, which the legacy cleanup covers
+            measure_api_performance(server.set_tags, conn.compute, run_tags(), operation="tag_server")
         
         measure_api_performance(
-            conn.compute.wait_for_server,
+            wait_for_server_status,
+            conn,
             server,
-            status="ACTIVE",
-            wait=300
+            "ACTIVE",
+            wait=300,
+            operation="wait_for_server_active"
         )
         
-        creation_time = time.time() - start_time
-        with resource_lock:
-            vm_metrics["creation_times"].append(creation_time)
-            vm_metrics["timestamps"].append(time.strftime("%H:%M:%S", time.localtime()))
-            vm_count += 1
+        active_time = time.time()
+        creation_time = active_time - start_time
+        timestamp = time.strftime("%H:%M:%S", time.localtime())
+        metrics_queue.put({
+            "kind": "vm_created",
+            "creation_time": creation_time,
+            "timestamp": timestamp,
+            "concurrency": current_concurrency
+        })
+        if VM_TIMELINE:
+            metrics_queue.put({
+                "kind": "vm_phases",
+                "vm": vm_name,
+                "timestamp": timestamp,
+                "creation_time": creation_time,
+                "phases": vm_phase_timeline(conn, server, start_time, request_end, active_time)
+            })
         
         logger.info(f"VM {vm_name} created in {creation_time:.2f}s")
         
         measure_api_performance(conn.compute.stop_server, server)
         measure_api_performance(
-            conn.compute.wait_for_server,
+            wait_for_server_status,
+            conn,
             server,
-            status="SHUTOFF",
-            wait=300
+            "SHUTOFF",
+            wait=300,
+            operation="wait_for_server_shutoff"
         )
         
         measure_api_performance(conn.compute.start_server, server)
         measure_api_performance(
-            conn.compute.wait_for_server,
+            wait_for_server_status,
+            conn,
             server,
-            status="ACTIVE",
-            wait=300
+            "ACTIVE",
+            wait=300,
+            operation="wait_for_server_restart"
         )
         
         measure_api_performance(conn.compute.delete_server, server)
         measure_api_performance(
-            conn.compute.wait_for_delete,
+            wait_for_server_delete,
+            conn,
             server,
-            wait=300
+            wait=300,
+            operation="wait_for_delete"
         )
+        if port is not None:
+            port_pool.release(port)
+            port = None
         
         logger.info(f"Completed VM {vm_name} lifecycle")
+        return creation_time
         
+    except (BadRequestException, ResourceNotFound) as e:
+        # The cached image or flavor may have been deleted or made private; other 400s
+        # are about the request body and say nothing about the cached lookups
+        message = str(e).lower()
+        for key in ("image", "flavor"):
+            if key in message:
+                resolution_cache.invalidate(key)
+        if "flavor" in message:
+            # The listing behind name lookups may still hold the deleted flavor
+            resolution_cache.invalidate("flavors")
+        logger.error(f"VM {vm_name} lifecycle failed: {str(e)}")
+        raise
     except Exception as e:
         logger.error(f"VM {vm_name} lifecycle failed: {str(e)}")
         raise
+    finally:
+        if port is not None:
+            port_pool.release(port, reusable=False)
+
+def lifecycle_worker(conn, network, sec_group, concurrency, deadline):
+    """Run VM lifecycles back to back until the deadline passes"""
+    while time.time() < deadline:
+        vm_name = vm_names.next_name()
+        try:
+            manage_vm_lifecycle(conn, network, sec_group, vm_name)
+            outcome = "completed"
+        except Exception:
+            # Failures under load are results, keep the worker busy
+            outcome = "failed"
+        metrics_queue.put({"kind": "lifecycle", "concurrency": concurrency, "outcome": outcome})
+        time.sleep(LIFECYCLE_PAUSE)
+
+def run_worker_pool(conn, network, sec_group, concurrency, duration, level=None):
+    """Keep `concurrency` VM lifecycles in flight for `duration` seconds
 
-def cleanup_resources(conn, network, subnet, sec_group):
-    """Clean up all test resources"""
+    Results are reported under pool size `level`, which a distributed
+    worker running its share of a larger pool sets to the cluster-wide size.
+    """
+    level = level or concurrency
+    logger.info(f"Running {concurrency} concurrent VM lifecycle workers for {duration}s")
+    start_time = time.time()
+    global current_concurrency
+    current_concurrency = level
+    metrics_queue.put({"kind": "level_started", "concurrency": level, "started": start_time})
+    deadline = start_time + duration
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"vm-worker-{concurrency}") as pool:
+        for _ in range(concurrency):
+            pool.submit(lifecycle_worker, conn, network, sec_group, level, deadline)
+    # Workers finish their in-flight lifecycle, so elapsed may exceed duration
+    metrics_queue.put({"kind": "level_finished", "concurrency": level, "elapsed": time.time() - start_time})
+
+def cleanup_resources(conn):
+    """Clean up all test resources of this run"""
     try:
-        with resource_lock:
+        with provision_lock:
             logger.info("Cleaning up test resources")
-            if subnet:
-                measure_api_performance(conn.network.delete_subnet, subnet)
-            if network:
-                measure_api_performance(conn.network.delete_network, network)
-            if sec_group:
-                measure_api_performance(conn.network.delete_security_group, sec_group)
+            cleanup_tagged(conn, run_tags()[1], "post")
     except Exception as e:
         logger.error(f"Cleanup failed: {str(e)}")
         raise
 
-# Dash application setup
-app = dash.Dash(__name__)
+def summarize_window(start, stats, now):
+    """Percentile summary of one metrics window"""
+    closed = now >= start + METRICS_WINDOW
+    elapsed = METRICS_WINDOW if closed else max(now - start, 1)
+    requests = stats["requests"]
+    return {
+        "start": start,
+        "label": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start)),
+        "latency": stats["latency"].summary(),
+        "response_time": stats["response_time"].summary(),
+        "corrected_latency": stats["corrected_latency"].summary(),
+        "throughput": requests / elapsed,
+        "bandwidth": {service: total / elapsed for service, total in stats["wire_bytes"].items()},
+        "operations": {operation: histogram.summary() for operation, histogram in stats["operations"].items()}
+    }
 
-app.layout = html.Div([
-    html.H1("OpenStack Performance Test Dashboard", style={'textAlign': 'center'}),
-    dcc.Interval(id="update-interval", interval=5000, n_intervals=0),
-    
-    html.Div([
-        html.H3("Test Summary", style={'textAlign': 'center'}),
-        html.Div(id="test-summary", style={'padding': '10px'}),
-        html.Div(id="vm-summary", style={'padding': '10px'}),
-        html.Div(id="error-summary", style={'padding': '10px'})
-    ], style={'margin': '20px'}),
-    
-    html.Div([
-        dcc.Graph(id="latency-graph"),
-        dcc.Graph(id="response-time-graph"),
-        dcc.Graph(id="throughput-graph"),
-        dcc.Graph(id="bandwidth-graph"),
-        dcc.Graph(id="api-success-failure-pie"),
-        dcc.Graph(id="vm-creation-bar")
-    ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'space-around'})
-])
-
-@app.callback(
-    [
-        Output("test-summary", "children"),
-        Output("vm-summary", "children"),
-        Output("error-summary", "children"),
-        Output("latency-graph", "figure"),
-        Output("response-time-graph", "figure"),
-        Output("throughput-graph", "figure"),
-        Output("bandwidth-graph", "figure"),
-        Output("api-success-failure-pie", "figure"),
-        Output("vm-creation-bar", "figure")
-    ],
-    [Input("update-interval", "n_intervals")]
-)
-def update_dashboard(n):
-    with resource_lock:
-        # Aggregate metrics per minute
-        avg_latencies = [sum(api_metrics["latencies"][minute]) / len(api_metrics["latencies"][minute]) if api_metrics["latencies"][minute] else 0 for minute in api_metrics["timestamps"]]
-        avg_response_times = [sum(api_metrics["response_times"][minute]) / len(api_metrics["response_times"][minute]) if api_metrics["response_times"][minute] else 0 for minute in api_metrics["timestamps"]]
-        avg_throughput = [sum(api_metrics["throughput"][minute]) / len(api_metrics["throughput"][minute]) if api_metrics["throughput"][minute] else 0 for minute in api_metrics["timestamps"]]
-        avg_bandwidth = [sum(api_metrics["bandwidth"][minute]) / len(api_metrics["bandwidth"][minute]) if api_metrics["bandwidth"][minute] else 0 for minute in api_metrics["timestamps"]]
-        
-        # Summary metrics
-        overall_avg_latency = sum(avg_latencies) / len(avg_latencies) if avg_latencies else 0
-        overall_avg_throughput = sum(avg_throughput) / len(avg_throughput) if avg_throughput else 0
-        total_calls = api_metrics["success_count"] + api_metrics["failure_count"]
-        success_rate = (api_metrics["success_count"] / total_calls * 100) if total_calls > 0 else 0
-        failure_rate = (api_metrics["failure_count"] / total_calls * 100) if total_calls > 0 else 0
-        
-        test_summary = html.Div([
-            html.P(f"Test Duration: {time.strftime('%H:%M:%S', time.gmtime(n*5))}"),
-            html.P(f"Average API Latency: {overall_avg_latency:.2f} ms"),
-            html.P(f"Average Throughput: {overall_avg_throughput:.2f} req/sec")
-        ])
-        
-        vm_summary = html.Div([
-            html.P(f"VMs Created: {vm_count}"),
-            html.P(f"Average Creation Time: {sum(vm_metrics['creation_times'])/len(vm_metrics['creation_times']):.2f}s" if vm_metrics["creation_times"] else "N/A")
-        ])
-        
-        error_summary = html.Div([
-            html.P(f"API Errors: {api_metrics['failure_count']}",
-                   style={'color': 'red' if api_metrics['failure_count'] else 'green'})
+def close_windows(state, now):
+    """Summarize windows that can no longer receive samples and drop their histograms"""
+    api = state["api"]
+    for start in sorted(api["windows"]):
+        if now < start + METRICS_WINDOW + WINDOW_GRACE:
+            break
+        state["closed_windows"].append(summarize_window(start, api["windows"].pop(start), now))
+        api["last_closed"] = start
+
+def operation_summaries(api):
+    """Overall percentile summary per operation, slowest (by p99) first"""
+    rows = []
+    for operation, stats in api["operations"].items():
+        summary = stats["latency"].summary()
+        summary["operation"] = operation
+        summary["failures"] = stats["failures"]
+        rows.append(summary)
+    rows.sort(key=lambda row: row["p99"], reverse=True)
+    return rows
+
+def operation_table(rows):
+    """Render per-operation percentiles as an HTML table"""
+    columns = ["Operation", "Calls", "Errors", "Mean (ms)", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)"]
+    return html.Table([
+        html.Thead(html.Tr([html.Th(column) for column in columns])),
+        html.Tbody([
+            html.Tr([
+                html.Td(row["operation"]),
+                html.Td(row["count"]),
+                html.Td(row["failures"]),
+                *[html.Td(f"{row[key]:.2f}") for key in ("mean", "p50", "p90", "p99", "max")]
+            ]) for row in rows
         ])
-        
-        # Latency Graph (per minute)
-        latency_fig = {
-            'data': [go.Scatter(x=api_metrics["timestamps"], y=avg_latencies, mode='lines+markers', name='Avg Latency')],
-            'layout': go.Layout(
-                title='Average API Latency Per Minute',
-                xaxis={'title': 'Time (HH:MM)', 'tickangle': -45},
-                yaxis={'title': 'Latency (ms)'},
-                hovermode='closest'
-            )
-        }
-        
-        # Response Time Graph (per minute)
-        response_fig = {
-            'data': [go.Scatter(x=api_metrics["timestamps"], y=avg_response_times, mode='lines+markers', name='Avg Response Time')],
-            'layout': go.Layout(
-                title='Average API Response Time Per Minute',
-                xaxis={'title': 'Time (HH:MM)', 'tickangle': -45},
-                yaxis={'title': 'Response Time (ms)'},
-                hovermode='closest'
-            )
-        }
-        
-        # Throughput Graph (per minute)
-        throughput_fig = {
-            'data': [go.Scatter(x=api_metrics["timestamps"], y=avg_throughput, mode='lines+markers', name='Avg Throughput')],
-            'layout': go.Layout(
-                title='Average API Throughput Per Minute',
-                xaxis={'title': 'Time (HH:MM)', 'tickangle': -45},
-                yaxis={'title': 'Throughput (requests/sec)'},
-                hovermode='closest'
-            )
-        }
-        
-        # Bandwidth Graph (per minute)
-        bandwidth_fig = {
-            'data': [go.Scatter(x=api_metrics["timestamps"], y=avg_bandwidth, mode='lines+markers', name='Avg Bandwidth')],
-            'layout': go.Layout(
-                title='Average Simulated Bandwidth Per Minute',
-                xaxis={'title': 'Time (HH:MM)', 'tickangle': -45},
-                yaxis={'title': 'Bandwidth (bytes/sec)'},
-                hovermode='closest'
-            )
+    ], style={'width': '100%', 'textAlign': 'right'})
+
+def wire_summaries(api):
+    """Per-service wire accounting rows, sorted by service"""
+    rows = []
+    for service, stats in sorted(api["wire"].items()):
+        rows.append({
+            "service": service,
+            "requests": stats["requests"],
+            "request_bytes": stats["request_bytes"],
+            "response_bytes": stats["response_bytes"],
+            "ttfb_p50": stats["ttfb"].percentile(50),
+            "ttfb_p99": stats["ttfb"].percentile(99),
+            "new_connections": stats["new_connections"],
+            "reused_connections": stats["reused_connections"],
+            "pool_wait_p99": stats["pool_wait"].percentile(99),
+            "pool_wait_total": stats["pool_wait"].total,
+            "status_codes": dict(stats["status_codes"])
+        })
+    return rows
+
+def wire_table(rows):
+    """Render per-service wire accounting as an HTML table"""
+    columns = ["Service", "Requests", "Sent (KB)", "Received (KB)", "Avg Response (B)",
+               "TTFB p50 (ms)", "TTFB p99 (ms)", "New Conns", "Reused Conns", "Reuse %", "Pool Wait p99 (ms)"]
+    body = []
+    for row in rows:
+        connections = row["new_connections"] + row["reused_connections"]
+        body.append(html.Tr([
+            html.Td(row["service"]),
+            html.Td(row["requests"]),
+            html.Td(f"{row['request_bytes'] / 1024:.1f}"),
+            html.Td(f"{row['response_bytes'] / 1024:.1f}"),
+            html.Td(f"{row['response_bytes'] / row['requests']:.0f}" if row["requests"] else "0"),
+            html.Td(f"{row['ttfb_p50']:.2f}"),
+            html.Td(f"{row['ttfb_p99']:.2f}"),
+            html.Td(row["new_connections"]),
+            html.Td(row["reused_connections"]),
+            html.Td(f"{row['reused_connections'] / connections * 100:.1f}" if connections else "N/A"),
+            html.Td(f"{row['pool_wait_p99']:.2f}")
+        ]))
+    return html.Table([
+        html.Thead(html.Tr([html.Th(column) for column in columns])),
+        html.Tbody(body)
+    ], style={'width': '100%', 'textAlign': 'right'})
+
+def level_summaries(vm, now):
+    """Lifecycle throughput and creation time per worker pool size"""
+    rows = []
+    for level, stats in sorted(vm["levels"].items()):
+        elapsed = stats["elapsed"] + (now - stats["started"] if stats["running"] else 0)
+        rows.append({
+            "concurrency": level,
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "lifecycles_per_min": stats["completed"] / elapsed * 60 if elapsed > 0 else 0,
+            "avg_creation_time": stats["creation_total"] / stats["created"] if stats["created"] else 0
+        })
+    return rows
+
+def phase_summaries(vm):
+    """Duration percentiles per VM creation phase, most time-consuming (by p90) first"""
+    rows = []
+    for phase, histogram in vm["phases"].items():
+        summary = histogram.summary()
+        summary["phase"] = phase
+        rows.append(summary)
+    rows.sort(key=lambda row: row["p90"], reverse=True)
+    return rows
+
+# SLO name -> stage summary field it limits; a stage passes when every configured value is at or below its limit
+SLO_FIELDS = {
+    "p95_latency_ms": "p95_latency",
+    "p99_latency_ms": "p99_latency",
+    "error_rate": "error_rate",
+    "throttle_rate": "throttle_rate",
+    "vm_creation_p95_s": "vm_creation_p95"
+}
+
+def stage_summaries(state, now):
+    """p95 latency, error rate, VM creation time and SLO verdict per load profile stage"""
+    rows = []
+    for stage in state["stages"]:
+        calls = stage["successes"] + stage["failures"]
+        created = stage["creation_time"].count
+        elapsed = stage["elapsed"] if stage["elapsed"] is not None else now - stage["started"]
+        row = {
+            "name": stage["name"],
+            "type": stage["type"],
+            "load": stage["load"],
+            "running": stage["elapsed"] is None,
+            "elapsed": elapsed,
+            "calls": calls,
+            "p95_latency": stage["latency"].percentile(95),
+            "p99_latency": stage["latency"].percentile(99),
+            "error_rate": stage["failures"] / calls if calls else 0,
+            "throttle_rate": stage["throttled"] / stage["http_requests"] if stage["http_requests"] else 0,
+            "lifecycles_per_min": stage["completed"] / elapsed * 60 if elapsed > 0 else 0,
+            "vms_created": created,
+            "vm_creation_mean": stage["creation_time"].mean() if created else None,
+            "vm_creation_p95": stage["creation_time"].percentile(95) if created else None
         }
-        
-        # API Success/Failure Pie Chart
-        api_pie_fig = {
-            'data': [go.Pie(
-                labels=['Success', 'Failure'],
-                values=[api_metrics["success_count"], api_metrics["failure_count"]],
-                textinfo='label+percent',
-                hoverinfo='label+value'
-            )],
-            'layout': go.Layout(
-                title='API Call Success vs Failure Rate'
+        # A check without a measured value (e.g. no VMs created) neither passes nor fails
+        row["checks"] = [
+            {"slo": slo, "limit": limit, "value": row[SLO_FIELDS[slo]],
+             "passed": None if row[SLO_FIELDS[slo]] is None else row[SLO_FIELDS[slo]] <= limit}
+            for slo, limit in stage["slo"].items()
+        ]
+        row["violations"] = [f"{check['slo']} {check['value']:.3g} > {check['limit']:g}"
+                             for check in row["checks"] if check["passed"] is False]
+        if not stage["slo"]:
+            row["verdict"] = "n/a"
+        else:
+            row["verdict"] = "fail" if row["violations"] else "pass"
+        rows.append(row)
+    return rows
+
+def stage_table(rows):
+    """Render per-stage results and SLO verdicts as an HTML table"""
+    columns = ["Stage", "Type", "Load", "Duration (s)", "Calls", "p95 (ms)", "Error Rate %",
+               "429/503 %", "Lifecycles/min", "VMs", "VM p95 (s)", "Verdict"]
+    colors = {"pass": 'green', "fail": 'red'}
+    return html.Table([
+        html.Thead(html.Tr([html.Th(column) for column in columns])),
+        html.Tbody([
+            html.Tr([
+                html.Td(row["name"]),
+                html.Td(row["type"]),
+                html.Td(row["load"]),
+                html.Td(f"{row['elapsed']:.0f}"),
+                html.Td(row["calls"]),
+                html.Td(f"{row['p95_latency']:.2f}"),
+                html.Td(f"{row['error_rate'] * 100:.2f}"),
+                html.Td(f"{row['throttle_rate'] * 100:.2f}"),
+                html.Td(f"{row['lifecycles_per_min']:.2f}"),
+                html.Td(row["vms_created"]),
+                html.Td(f"{row['vm_creation_p95']:.2f}" if row["vm_creation_p95"] is not None else "N/A"),
+                html.Td("running" if row["running"] else row["verdict"],
+                        title="; ".join(row["violations"]),
+                        style={'color': colors.get(row["verdict"], 'black')})
+            ]) for row in rows
+        ])
+    ], style={'width': '100%', 'textAlign': 'right'})
+
+def build_metrics_snapshot(state, now):
+    """Immutable view of the current metrics for readers outside the collector
+
+    Closed-window summaries and the VM lists are append-only and shared by
+    length rather than copied, so the cost stays flat as the run grows.
+    """
+    api = state["api"]
+    vm = state["vm"]
+    vm_count = len(vm["creation_times"])
+    elapsed = now - api["first_window"] if api["first_window"] is not None else 0
+    return {
+        "taken_at": now,
+        "closed_windows": state["closed_windows"],
+        "closed_count": len(state["closed_windows"]),
+        "open_windows": [summarize_window(start, stats, now) for start, stats in sorted(api["windows"].items())],
+        "late_samples": api["late_samples"],
+        "overall_latency": api["overall_latency"].summary(),
+        "corrected_latency": api["overall_corrected_latency"].summary(),
+        "throughput": api["success_count"] / elapsed if elapsed > 0 else 0,
+        "success_count": api["success_count"],
+        "failure_count": api["failure_count"],
+        "operations": operation_summaries(api),
+        "wire": wire_summaries(api),
+        "open_loop": dict(api["open_loop"]),
+        "vm_count": vm_count,
+        "avg_creation_time": vm["creation_total"] / vm_count if vm_count else None,
+        "levels": level_summaries(vm, now),
+        "stages": stage_summaries(state, now),
+        "current_concurrency": vm["current_concurrency"],
+        "vm_creation_times": vm["creation_times"],
+        "vm_timestamps": vm["timestamps"],
+        "vm_timelines": list(vm["recent_timelines"]),
+        "phase_summary": phase_summaries(vm),
+        "lifecycle_latency": vm["lifecycle_latency"].summary(),
+        "lifecycle_corrected_latency": vm["lifecycle_corrected_latency"].summary(),
+        "lifecycle_failures": vm["lifecycle_failures"],
+        "cleanups": list(state["cleanups"]),
+        "searches": list(state["searches"]),
+        "auth": dict(state["auth"], latency=state["auth"]["latency"].summary())
+    }
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep"""
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    keep = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # Average of the next bucket is the third triangle corner
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        next_span = max(next_end - next_start, 1)
+        avg_x = sum(xs[next_start:next_end]) / next_span if next_end > next_start else xs[-1]
+        avg_y = sum(ys[next_start:next_end]) / next_span if next_end > next_start else ys[-1]
+        best, best_area = start, -1
+        for index in range(start, end):
+            area = abs(
+                (xs[previous] - avg_x) * (ys[index] - ys[previous])
+                - (xs[previous] - xs[index]) * (avg_y - ys[previous])
             )
-        }
-        
-        # VM Creation Bar Graph
-        vm_bar_fig = {
+            if area > best_area:
+                best, best_area = index, area
+        keep.append(best)
+        previous = best
+    keep.append(count - 1)
+    return keep
+
+PERCENTILE_KEYS = ("p50", "p90", "p99", "max")
+TIME_AXIS = {'title': 'Time', 'tickangle': -45}
+
+# Charts fed from closed metrics windows: {graph id: layout}
+WINDOW_GRAPHS = {
+    "latency-graph": dict(title='API Latency Percentiles Per Window', xaxis=TIME_AXIS,
+                          yaxis={'title': 'Latency (ms)'}, hovermode='closest'),
+    "response-time-graph": dict(title='API Response Time Percentiles Per Window', xaxis=TIME_AXIS,
+                                yaxis={'title': 'Response Time (ms)'}, hovermode='closest'),
+    "throughput-graph": dict(title='API Throughput Per Window', xaxis=TIME_AXIS,
+                             yaxis={'title': 'Throughput (requests/sec)'}, hovermode='closest'),
+    "bandwidth-graph": dict(title='Wire Bandwidth Per Service', xaxis=TIME_AXIS,
+                            yaxis={'title': 'Bandwidth (bytes/sec)'}, hovermode='closest'),
+    "operation-latency-graph": dict(title='p90 Latency Per Operation', xaxis=TIME_AXIS,
+                                    yaxis={'title': 'Latency (ms)'}, hovermode='closest')
+}
+VM_BAR_LAYOUT = dict(
+    title='VM Creation Times Over Test Duration',
+    xaxis={'title': 'Creation Time (HH:MM:SS)', 'tickangle': -45},
+    yaxis={'title': 'Creation Time (seconds)'},
+    bargap=0.2
+)
+
+def window_series(snapshot):
+    """Traces of every per-window chart as (name, value function) pairs"""
+    latency = [(key, lambda window, key=key: window["latency"][key]) for key in PERCENTILE_KEYS]
+    if snapshot["corrected_latency"]["count"]:
+        latency.append(("p99 (corrected)", lambda window: window["corrected_latency"]["p99"]))
+    operations = sorted(row["operation"] for row in snapshot["operations"])
+    return {
+        "latency-graph": latency,
+        "response-time-graph": [(key, lambda window, key=key: window["response_time"][key]) for key in PERCENTILE_KEYS],
+        "throughput-graph": [("Throughput", lambda window: window["throughput"])],
+        "bandwidth-graph": [
+            (row["service"], lambda window, service=row["service"]: window["bandwidth"].get(service, 0))
+            for row in snapshot["wire"]
+        ],
+        "operation-latency-graph": [
+            (operation, lambda window, operation=operation: window["operations"].get(operation, {}).get("p90"))
+            for operation in operations
+        ]
+    }
+
+def downsampled_trace(name, labels, xs, ys, **trace):
+    """Scatter trace of at most MAX_CHART_POINTS points, skipping gaps"""
+    points = [(label, x, y) for label, x, y in zip(labels, xs, ys) if y is not None]
+    keep = lttb([x for _, x, _ in points], [y for _, _, y in points], MAX_CHART_POINTS)
+    return go.Scatter(x=[points[i][0] for i in keep], y=[points[i][2] for i in keep],
+                      mode='lines+markers', name=name, **trace)
+
+def incremental_update(graph_id, run_id, names, count, cursor, full_figure, new_points):
+    """Decide between a full (downsampled) figure and an extendData patch
+
+    The browser keeps what it was sent; only points added since its cursor
+    travel on each tick. A full redraw happens when the run or the set of
+    traces changes, or once MAX_CHART_POINTS raw points have been appended
+    since the last redraw, so payload and browser memory stay bounded.
+    """
+    sent = cursor.get(graph_id)
+    if (sent is None or sent["run"] != run_id or sent["names"] != names
+            or count < sent["sent"] or count - sent["base"] > MAX_CHART_POINTS):
+        return full_figure(), no_update, {"run": run_id, "names": names, "sent": count, "base": count}
+    if count == sent["sent"]:
+        return no_update, no_update, sent
+    return no_update, new_points(sent["sent"], count), dict(sent, sent=count)
+
+def dashboard_snapshot(run_id):
+    """Snapshot for the selected run: the live collector's or a replayed recording"""
+    if run_id and run_id != "live":
+        try:
+            snapshot = replay_run(run_id)
+        except ValueError:
+            # The selected recording was removed from the database
+            raise PreventUpdate
+    else:
+        snapshot = metrics_snapshot
+    if not snapshot:
+        # Collector has not published yet
+        raise PreventUpdate
+    return snapshot
+
+def update_run_selector(n):
+    options = [{"label": "Live run", "value": "live"}]
+    for run in list_recorded_runs():
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started"]))
+        options.append({"label": f"{run['run_id']} ({started}, {run['status']})", "value": run["run_id"]})
+    return options
+
+def update_series_graphs(n, run_id="live", cursor=None):
+    """Send only new closed-window and VM points to the browser"""
+    snapshot = dashboard_snapshot(run_id)
+    cursor = cursor or {}
+    windows = snapshot["closed_windows"]
+    count = snapshot["closed_count"]
+    figures, extensions, new_cursor = [], [], {}
+
+    for graph_id, series in window_series(snapshot).items():
+        names = [name for name, _ in series]
+
+        def full_figure(series=series, graph_id=graph_id):
+            closed = windows[:count]
+            labels = [window["label"] for window in closed]
+            xs = [window["start"] for window in closed]
+            return {
+                'data': [downsampled_trace(name, labels, xs, [value(window) for window in closed])
+                         for name, value in series],
+                'layout': go.Layout(**WINDOW_GRAPHS[graph_id])
+            }
+
+        def new_points(start, end, series=series):
+            added = windows[start:end]
+            labels = [window["label"] for window in added]
+            return [
+                {'x': [labels] * len(series), 'y': [[value(window) for window in added] for _, value in series]},
+                list(range(len(series)))
+            ]
+
+        figure, extension, new_cursor[graph_id] = incremental_update(
+            graph_id, run_id, names, count, cursor, full_figure, new_points)
+        figures.append(figure)
+        extensions.append(extension)
+
+    # VM Creation Bar Graph
+    vm_count = snapshot["vm_count"]
+    creation_times = snapshot["vm_creation_times"]
+    timestamps = snapshot["vm_timestamps"]
+
+    def vm_full_figure():
+        keep = lttb(list(range(vm_count)), creation_times[:vm_count], MAX_CHART_POINTS)
+        return {
             'data': [go.Bar(
-                x=vm_metrics["timestamps"],
-                y=vm_metrics["creation_times"],
+                x=[timestamps[i] for i in keep],
+                y=[creation_times[i] for i in keep],
                 name='VM Creation Time',
-                text=[f"VM {i+1}" for i in range(len(vm_metrics["creation_times"]))],
+                text=[f"VM {i+1}" for i in keep],
                 hoverinfo='text+y'
             )],
-            'layout': go.Layout(
-                title='VM Creation Times Over Test Duration',
-                xaxis={'title': 'Creation Time (HH:MM:SS)', 'tickangle': -45},
-                yaxis={'title': 'Creation Time (seconds)'},
-                bargap=0.2
-            )
+            'layout': go.Layout(**VM_BAR_LAYOUT)
         }
-        
-        return (
-            test_summary,
-            vm_summary,
-            error_summary,
-            latency_fig,
-            response_fig,
-            throughput_fig,
-            bandwidth_fig,
-            api_pie_fig,
-            vm_bar_fig
+
+    def vm_new_points(start, end):
+        return [
+            {'x': [timestamps[start:end]], 'y': [creation_times[start:end]],
+             'text': [[f"VM {i+1}" for i in range(start, end)]]},
+            [0]
+        ]
+
+    figure, extension, new_cursor["vm-creation-bar"] = incremental_update(
+        "vm-creation-bar", run_id, ["VM Creation Time"], vm_count, cursor, vm_full_figure, vm_new_points)
+    figures.append(figure)
+    extensions.append(extension)
+    return (*figures, *extensions, new_cursor)
+
+def update_dashboard(n, run_id="live"):
+    """Refresh summaries and the fixed-size charts; their cost does not grow with run length"""
+    snapshot = dashboard_snapshot(run_id)
+    overall_latency = snapshot["overall_latency"]
+    corrected_latency = snapshot["corrected_latency"]
+    
+    # Summary metrics
+    total_calls = snapshot["success_count"] + snapshot["failure_count"]
+    success_rate = (snapshot["success_count"] / total_calls * 100) if total_calls > 0 else 0
+    failure_rate = (snapshot["failure_count"] / total_calls * 100) if total_calls > 0 else 0
+    
+    test_summary = html.Div([
+        html.P(f"Viewing recorded run {run_id}" if run_id and run_id != "live" else "Viewing live run"),
+        html.P(f"Test Duration: {time.strftime('%H:%M:%S', time.gmtime(n*5))}"),
+        html.P(f"API Latency: p50 {overall_latency['p50']:.2f} ms | p90 {overall_latency['p90']:.2f} ms | "
+               f"p99 {overall_latency['p99']:.2f} ms | max {overall_latency['max']:.2f} ms"),
+        html.P(f"Average Throughput: {snapshot['throughput']:.2f} req/sec"),
+        html.P(f"Open-Loop Corrected Latency: p50 {corrected_latency['p50']:.2f} ms | p99 {corrected_latency['p99']:.2f} ms | "
+               f"in flight {snapshot['open_loop']['in_flight']} (max {snapshot['open_loop']['max_in_flight']})")
+        if corrected_latency["count"] else html.P("Mode: closed-loop worker pool"),
+        html.P(f"Keystone: {snapshot['auth']['reauths']} re-authentications "
+               f"(p50 {snapshot['auth']['latency']['p50']:.2f} ms), {snapshot['auth']['cache_hits']} cached tokens reused | "
+               f"Connection pool wait: {sum(row['pool_wait_total'] for row in snapshot['wire']):.0f} ms total")
+    ])
+    
+    vm_summary = html.Div([
+        html.P(f"VMs Created: {snapshot['vm_count']}"),
+        html.P(f"Concurrent Workers: {snapshot['current_concurrency']}"),
+        html.P(f"Image/Flavor Cache: {resolution_cache.hits} hits, {resolution_cache.misses} misses"),
+        html.P(f"Status Polling: {status_tracker.list_requests} list calls, ~{status_tracker.saved_requests()} per-server polls saved"
+               if status_tracker is not None else "Status Polling: per-server wait_for_server"),
+        html.P(f"Average Creation Time: {snapshot['avg_creation_time']:.2f}s" if snapshot["vm_count"] else "N/A"),
+        html.P("Slowest Creation Phases (p50 / p90): " + " | ".join(
+            f"{row['phase']} {row['p50']:.2f}s / {row['p90']:.2f}s" for row in snapshot["phase_summary"][:TOP_N_OPERATIONS]
+        )) if snapshot["phase_summary"] else None,
+        html.P(f"Open-Loop Lifecycles: p50 {snapshot['lifecycle_latency']['p50']:.2f} ms | "
+               f"p99 {snapshot['lifecycle_latency']['p99']:.2f} ms | "
+               f"p99 corrected {snapshot['lifecycle_corrected_latency']['p99']:.2f} ms | "
+               f"{snapshot['lifecycle_failures']} failed")
+        if snapshot["lifecycle_corrected_latency"]["count"] else None
+    ])
+    
+    error_summary = html.Div([
+        html.P(f"API Errors: {snapshot['failure_count']}",
+               style={'color': 'red' if snapshot['failure_count'] else 'green'}),
+        html.P(f"Late samples (arrived after their window closed): {snapshot['late_samples']}")
+        if snapshot["late_samples"] else None,
+        *[html.P(f"{cleanup['phase'].capitalize()}-run cleanup: {sum(cleanup['deleted'].values())} resources "
+                 f"in {cleanup['duration']:.2f}s, {cleanup['failed']} failed")
+          for cleanup in snapshot["cleanups"]]
+    ])
+    
+    # API Success/Failure Pie Chart
+    api_pie_fig = {
+        'data': [go.Pie(
+            labels=['Success', 'Failure'],
+            values=[snapshot["success_count"], snapshot["failure_count"]],
+            textinfo='label+percent',
+            hoverinfo='label+value'
+        )],
+        'layout': go.Layout(
+            title='API Call Success vs Failure Rate'
+        )
+    }
+    
+    # Concurrency scaling graph (lifecycle throughput and creation time per worker pool size)
+    levels = [row["concurrency"] for row in snapshot["levels"]]
+    lifecycles_per_min = [row["lifecycles_per_min"] for row in snapshot["levels"]]
+    avg_creation_by_level = [row["avg_creation_time"] for row in snapshot["levels"]]
+    scaling_fig = {
+        'data': [
+            go.Scatter(x=levels, y=lifecycles_per_min, mode='lines+markers', name='Lifecycles/min'),
+            go.Scatter(x=levels, y=avg_creation_by_level, mode='lines+markers', name='Avg Creation Time', yaxis='y2')
+        ],
+        'layout': go.Layout(
+            title='VM Lifecycle Throughput vs Concurrency',
+            xaxis={'title': 'Concurrent Workers (N)'},
+            yaxis={'title': 'Lifecycles per minute'},
+            yaxis2={'title': 'Creation Time (seconds)', 'overlaying': 'y', 'side': 'right'},
+            hovermode='closest'
         )
+    }
+    
+    # Per-operation breakdown
+    operation_rows = snapshot["operations"]
+    slowest = operation_rows[:TOP_N_OPERATIONS]
+    slowest_fig = {
+        'data': [
+            go.Bar(x=[row["operation"] for row in slowest], y=[row[key] for row in slowest], name=key)
+            for key in ("p50", "p90", "p99")
+        ],
+        'layout': go.Layout(
+            title=f'Top {TOP_N_OPERATIONS} Slowest Operations (by p99)',
+            xaxis={'title': 'Operation', 'tickangle': -45},
+            yaxis={'title': 'Latency (ms)'},
+            barmode='group'
+        )
+    }
+    
+    # VM creation phase Gantt: one row per VM and source, one trace per phase
+    gantt = {}
+    for timeline in snapshot["vm_timelines"]:
+        for phase in timeline["phases"]:
+            bars = gantt.setdefault(phase["phase"], {"y": [], "x": [], "base": []})
+            bars["y"].append(f"{timeline['vm']} ({phase['source']})")
+            bars["x"].append(phase["end"] - phase["start"])
+            bars["base"].append(phase["start"])
+    gantt_fig = {
+        'data': [
+            go.Bar(y=bars["y"], x=bars["x"], base=bars["base"], orientation='h', name=phase,
+                   hovertemplate='%{y}<br>' + phase + ': %{x:.2f}s from %{base:.2f}s<extra></extra>')
+            for phase, bars in gantt.items()
+        ],
+        'layout': go.Layout(
+            title=f'VM Creation Phases (last {VM_TIMELINE_VMS} VMs)',
+            xaxis={'title': 'Seconds since create request'},
+            yaxis={'autorange': 'reversed'},
+            barmode='overlay',
+            height=max(400, 18 * len({row for bars in gantt.values() for row in bars["y"]}) + 150)
+        )
+    }
+    
+    # Latest capacity search: the latency/throughput curve its probes traced and the knee point
+    search = snapshot["searches"][-1] if snapshot["searches"] else None
+    curve = search["curve"] if search else []
+    capacity_fig = {
+        'data': [
+            go.Scatter(x=[point["concurrency"] for point in curve], y=[point["p95_latency"] for point in curve],
+                       mode='lines+markers', name='p95 Latency',
+                       marker={'color': ['green' if point["within_slo"] else 'red' for point in curve]}),
+            go.Scatter(x=[point["concurrency"] for point in curve], y=[point["lifecycles_per_min"] for point in curve],
+                       mode='lines+markers', name='Lifecycles/min', yaxis='y2')
+        ] + ([go.Scatter(x=[search["knee"]["concurrency"]], y=[search["knee"]["p95_latency"]], mode='markers',
+                         name='Knee', marker={'size': 16, 'symbol': 'star'})] if search and search["knee"] else []),
+        'layout': go.Layout(
+            title=f'Capacity Search {search["name"]} ({search["strategy"]})' if search else 'Capacity Search (none run)',
+            xaxis={'title': 'Concurrent Workers (N)'},
+            yaxis={'title': 'p95 Latency (ms)'},
+            yaxis2={'title': 'Lifecycles per minute', 'overlaying': 'y', 'side': 'right'},
+            hovermode='closest'
+        )
+    }
+    
+    return (
+        test_summary,
+        vm_summary,
+        error_summary,
+        api_pie_fig,
+        scaling_fig,
+        operation_table(operation_rows),
+        slowest_fig,
+        wire_table(snapshot["wire"]),
+        stage_table(snapshot["stages"]),
+        gantt_fig,
+        capacity_fig
+    )
+
+def load_dashboard_modules():
+    """Import Dash and Plotly on first use so headless runs and workers never load them"""
+    global dash, dcc, html, Input, Output, State, no_update, PreventUpdate, go
+    import dash
+    from dash import dcc, html, Input, Output, State, no_update
+    from dash.exceptions import PreventUpdate
+    import plotly.graph_objs as go
+
+def create_dashboard():
+    """Dash application with its layout and callbacks"""
+    load_dashboard_modules()
+    app = dash.Dash(__name__)
+    
+    app.layout = html.Div([
+        html.H1("OpenStack Performance Test Dashboard", style={'textAlign': 'center'}),
+        dcc.Interval(id="update-interval", interval=5000, n_intervals=0),
+        # Per-browser record of which chart points have already been sent
+        dcc.Store(id="series-cursor"),
+    
+        html.Div([
+            html.Label("Run: "),
+            dcc.Dropdown(id="run-selector", value="live", clearable=False,
+                         options=[{"label": "Live run", "value": "live"}])
+        ], style={'margin': '20px', 'width': '480px'}),
+    
+        html.Div([
+            html.H3("Test Summary", style={'textAlign': 'center'}),
+            html.Div(id="test-summary", style={'padding': '10px'}),
+            html.Div(id="vm-summary", style={'padding': '10px'}),
+            html.Div(id="error-summary", style={'padding': '10px'})
+        ], style={'margin': '20px'}),
+    
+        html.Div([
+            html.H3("Load Stages", style={'textAlign': 'center'}),
+            html.Div(id="stage-table", style={'padding': '10px'})
+        ], style={'margin': '20px'}),
+    
+        html.Div([
+            html.H3("Per-Operation Latency", style={'textAlign': 'center'}),
+            html.Div(id="operation-table", style={'padding': '10px'})
+        ], style={'margin': '20px'}),
+    
+        html.Div([
+            html.H3("Wire Traffic Per Service", style={'textAlign': 'center'}),
+            html.Div(id="wire-table", style={'padding': '10px'})
+        ], style={'margin': '20px'}),
+    
+        html.Div([
+            dcc.Graph(id="latency-graph"),
+            dcc.Graph(id="response-time-graph"),
+            dcc.Graph(id="throughput-graph"),
+            dcc.Graph(id="bandwidth-graph"),
+            dcc.Graph(id="api-success-failure-pie"),
+            dcc.Graph(id="vm-creation-bar"),
+            dcc.Graph(id="vm-phase-gantt"),
+            dcc.Graph(id="concurrency-scaling-graph"),
+            dcc.Graph(id="capacity-curve-graph"),
+            dcc.Graph(id="operation-latency-graph"),
+            dcc.Graph(id="slowest-operations-bar")
+        ], style={'display': 'flex', 'flexWrap': 'wrap', 'justifyContent': 'space-around'})
+    ])
+    
+    app.callback(Output("run-selector", "options"), [Input("update-interval", "n_intervals")])(update_run_selector)
+    app.callback(
+        [Output(graph_id, "figure") for graph_id in [*WINDOW_GRAPHS, "vm-creation-bar"]]
+        + [Output(graph_id, "extendData") for graph_id in [*WINDOW_GRAPHS, "vm-creation-bar"]]
+        + [Output("series-cursor", "data")],
+        [Input("update-interval", "n_intervals"), Input("run-selector", "value")],
+        [State("series-cursor", "data")]
+    )(update_series_graphs)
+    app.callback(
+        [
+            Output("test-summary", "children"),
+            Output("vm-summary", "children"),
+            Output("error-summary", "children"),
+            Output("api-success-failure-pie", "figure"),
+            Output("concurrency-scaling-graph", "figure"),
+            Output("operation-table", "children"),
+            Output("slowest-operations-bar", "figure"),
+            Output("wire-table", "children"),
+            Output("stage-table", "children"),
+            Output("vm-phase-gantt", "figure"),
+            Output("capacity-curve-graph", "figure")
+        ],
+        [Input("update-interval", "n_intervals"), Input("run-selector", "value")]
+    )(update_dashboard)
+    return app
+
+def parse_rate(spec, duration):
+    """Turn "5" (fixed) or "1:20" (linear ramp over duration) into rate(elapsed)"""
+    if ":" in spec:
+        start_rate, end_rate = (float(part) for part in spec.split(":", 1))
+        return lambda elapsed: start_rate + (end_rate - start_rate) * min(elapsed / duration, 1)
+    rate = float(spec)
+    return lambda elapsed: rate
+
+def parse_operation_mix(spec):
+    """Turn "name:weight,name:weight" into {name: weight}"""
+    mix = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition(":")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def open_loop_operations(conn, network, sec_group):
+    """Operations the open-loop engine can schedule, keyed by name"""
+    return {
+        "list_servers": lambda: list(conn.compute.servers()),
+        "list_flavors": lambda: list(conn.compute.flavors()),
+        "list_images": lambda: list(conn.image.images()),
+        "list_networks": lambda: list(conn.network.networks()),
+        "list_ports": lambda: list(conn.network.ports()),
+        "vm_lifecycle": lambda: manage_vm_lifecycle(conn, network, sec_group, vm_names.next_name())
+    }
+
+# Open-loop operations made of many API calls; each call is already sampled on its own
+COMPOSITE_OPERATIONS = {"vm_lifecycle"}
+
+def measure_composite_operation(func, intended_start):
+    """Time a multi-call open-loop operation end to end as a lifecycle, not as one API call"""
+    start_time = time.time()
+    success = False
+    try:
+        func()
+        success = True
+    finally:
+        end_time = time.time()
+        metrics_queue.put({
+            "kind": "lifecycle_timing",
+            "latency": (end_time - start_time) * 1000,
+            "corrected_latency": (end_time - intended_start) * 1000,
+            "success": success
+        })
+
+def run_scheduled_operation(name, func, intended_start):
+    """Executor body for one open-loop arrival"""
+    metrics_queue.put({"kind": "open_loop", "delta": 1})
+    try:
+        if name in COMPOSITE_OPERATIONS:
+            measure_composite_operation(func, intended_start)
+        else:
+            measure_api_performance(func, operation=name, intended_start=intended_start)
+    except Exception:
+        # Already recorded as a failed sample
+        pass
+    finally:
+        metrics_queue.put({"kind": "open_loop", "delta": -1})
+
+async def open_loop_engine(operations, mix, rate, duration, max_in_flight=OPEN_LOOP_MAX_IN_FLIGHT):
+    """Schedule operations at a target arrival rate, independent of completions
+
+    Arrivals keep their intended start time even when every executor thread
+    is busy, so queueing behind a slow API shows up in corrected latency
+    instead of silently lowering the offered load.
+    """
+    loop = asyncio.get_running_loop()
+    names = [name for name in mix if name in operations]
+    if not names:
+        raise ValueError(f"No known operations in mix {mix}; choose from {sorted(operations)}")
+    weights = [mix[name] for name in names]
+    pending = set()
+    scheduled = 0
+    start_time = time.time()
+    intended_start = start_time
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="open-loop") as executor:
+        while intended_start - start_time < duration:
+            delay = intended_start - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name = random.choices(names, weights)[0]
+            task = loop.run_in_executor(executor, run_scheduled_operation, name, operations[name], intended_start)
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            scheduled += 1
+            intended_start += 1 / max(rate(intended_start - start_time), 0.01)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    logger.info(f"Open-loop run scheduled {scheduled} operations in {time.time() - start_time:.1f}s")
+
+def expand_stage(spec, index, default_slo):
+    """Turn one profile entry into concrete stages
+
+    "rate" (ops/sec, or [start, end] for a linear ramp) makes an open-loop
+    stage driven by "mix"; "concurrency" makes a closed-loop worker pool
+    stage, and a list of pool sizes becomes one stage per step. A "search"
+    stage probes pool sizes within [min, max] for "duration" each.
+    """
+    kind = spec.get("type", "step")
+    name = spec.get("name", f"{kind}-{index + 1}")
+    slo = {**default_slo, **spec.get("slo", {})}
+    if kind == "search":
+        # Backing off on throttling is the point of a search, so it always watches for it
+        slo.setdefault("throttle_rate", SEARCH_THROTTLE_RATE)
+    unknown = set(slo) - set(SLO_FIELDS)
+    if unknown:
+        raise ValueError(f"Stage {name}: unknown SLOs {sorted(unknown)}; choose from {sorted(SLO_FIELDS)}")
+    stage = {"name": name, "type": kind, "duration": float(spec["duration"]), "slo": slo}
+    if kind == "search":
+        low, high = spec["concurrency"]
+        strategy = spec.get("strategy", "binary")
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Stage {name}: unknown search strategy {strategy}; choose from {sorted(SEARCH_STRATEGIES)}")
+        stage["search"] = {
+            "strategy": strategy,
+            "min": int(low),
+            "max": int(high),
+            "max_probes": int(spec.get("max_probes", 10)),
+            "increase": int(spec.get("increase", max(int(low), 1))),
+            "decrease": float(spec.get("decrease", 0.5))
+        }
+        return [stage]
+    if "rate" in spec:
+        rate = spec["rate"]
+        mix = spec.get("mix", OPEN_LOOP_MIX)
+        stage["rate"] = f"{rate[0]}:{rate[1]}" if isinstance(rate, list) else str(rate)
+        stage["mix"] = parse_operation_mix(mix) if isinstance(mix, str) else mix
+        return [stage]
+    if "concurrency" not in spec:
+        raise ValueError(f"Stage {name} needs either a rate or a concurrency")
+    levels = spec["concurrency"] if isinstance(spec["concurrency"], list) else [spec["concurrency"]]
+    if len(levels) == 1:
+        return [dict(stage, concurrency=int(levels[0]))]
+    return [dict(stage, name=f"{name}@{level}", concurrency=int(level)) for level in levels]
+
+def load_profile(path):
+    """Read a JSON load profile into an ordered list of stages"""
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+        stages = []
+        for index, spec in enumerate(profile["stages"]):
+            stages.extend(expand_stage(spec, index, profile.get("slo", {})))
+        return stages
+    except Exception as e:
+        logger.error(f"Invalid load profile {path}: {str(e)}")
+        raise
+
+def default_profile():
+    """Stages equivalent to the TEST_CONCURRENCY / TEST_OPEN_LOOP_RATE settings"""
+    if OPEN_LOOP_RATE:
+        return [{
+            "name": "open-loop",
+            "type": "ramp" if ":" in OPEN_LOOP_RATE else "soak",
+            "duration": TEST_DURATION,
+            "slo": {},
+            "rate": OPEN_LOOP_RATE,
+            "mix": parse_operation_mix(OPEN_LOOP_MIX)
+        }]
+    level_duration = TEST_DURATION / len(CONCURRENCY_LEVELS)
+    return [
+        {"name": f"concurrency-{level}", "type": "step", "duration": level_duration, "slo": {}, "concurrency": level}
+        for level in CONCURRENCY_LEVELS
+    ]
+
+def execute_stage(conn, network, sec_group, stage):
+    """Generate one stage's load from this process"""
+    if "rate" in stage:
+        asyncio.run(open_loop_engine(
+            open_loop_operations(conn, network, sec_group),
+            stage["mix"],
+            parse_rate(stage["rate"], stage["duration"]),
+            stage["duration"]
+        ))
+    elif stage["concurrency"] > 0:
+        # A distributed worker's share of a small pool can be empty
+        run_worker_pool(conn, network, sec_group, stage["concurrency"], stage["duration"], stage.get("level"))
+
+def run_stage(stage, execute):
+    """Run one load profile stage, bracketed by stage events for its own stats"""
+    load = f"{stage['rate']} ops/sec" if "rate" in stage else f"{stage['concurrency']} workers"
+    logger.info(f"Starting stage {stage['name']} ({stage['type']}, {load}, {stage['duration']:.0f}s)")
+    started = time.time()
+    metrics_queue.put({
+        "kind": "stage_started",
+        "name": stage["name"],
+        "type": stage["type"],
+        "load": load,
+        "slo": stage["slo"],
+        "started": started
+    })
+    try:
+        execute(stage)
+    finally:
+        metrics_queue.put({"kind": "stage_finished", "elapsed": time.time() - started})
+
+def finished_stage_row(name):
+    """Summary row of a stage that has just finished, once the collector has ingested all of it"""
+    metrics_queue.join()
+    # A finished stage is no longer written to, so reading it outside the collector is safe
+    return next(row for row in stage_summaries(live_metrics, time.time()) if row["name"] == name)
+
+def binary_search_probes(search, probe):
+    """Double the pool until it breaches an SLO, then bisect between the last pass and first failure"""
+    passed, failed = None, None
+    concurrency = search["min"]
+    for _ in range(search["max_probes"]):
+        if probe(concurrency):
+            passed = concurrency
+        else:
+            failed = concurrency
+        if passed is None or (failed is None and concurrency >= search["max"]):
+            # Even the smallest pool breaches, or the largest one holds
+            return
+        if failed is None:
+            concurrency = min(concurrency * 2, search["max"])
+        elif failed - passed <= 1:
+            return
+        else:
+            concurrency = (passed + failed) // 2
+
+def aimd_probes(search, probe):
+    """Additive increase while within SLO, multiplicative decrease when a limit is hit"""
+    concurrency = search["min"]
+    for _ in range(search["max_probes"]):
+        if probe(concurrency):
+            if concurrency >= search["max"]:
+                return
+            concurrency = min(concurrency + search["increase"], search["max"])
+        else:
+            concurrency = max(search["min"], int(concurrency * search["decrease"]))
+
+SEARCH_STRATEGIES = {"binary": binary_search_probes, "aimd": aimd_probes}
+
+def capacity_search(stage, execute):
+    """Find the worker pool size with the highest lifecycle throughput that stays within SLO
+
+    Every probe runs as a stage of its own, so its p95 latency, error rate
+    and 429/503 rate are measured exactly like any other stage. The knee is
+    the passing probe with the most lifecycles per minute; the probes
+    around it are reported as the latency curve that supports it.
+    """
+    search = stage["search"]
+    curve = []
+
+    def probe(concurrency):
+        probe_stage = dict(stage, name=f"{stage['name']}#{len(curve) + 1}@{concurrency}", type="probe",
+                           concurrency=concurrency)
+        del probe_stage["search"]
+        run_stage(probe_stage, execute)
+        row = finished_stage_row(probe_stage["name"])
+        # A probe that completed nothing says nothing about capacity
+        within = row["verdict"] != "fail" and row["calls"] > 0
+        curve.append({
+            "concurrency": concurrency,
+            "p95_latency": row["p95_latency"],
+            "error_rate": row["error_rate"],
+            "throttle_rate": row["throttle_rate"],
+            "lifecycles_per_min": row["lifecycles_per_min"],
+            "within_slo": within,
+            "violations": row["violations"]
+        })
+        logger.info(f"Probe {len(curve)} at {concurrency} workers: {row['lifecycles_per_min']:.2f} lifecycles/min, "
+                    f"p95 {row['p95_latency']:.2f} ms, {'within SLO' if within else 'backing off'}")
+        return within
+
+    logger.info(f"Starting {search['strategy']} capacity search {stage['name']} "
+                f"({search['min']}-{search['max']} workers, {stage['duration']:.0f}s probes)")
+    SEARCH_STRATEGIES[search["strategy"]](search, probe)
+    passing = [point for point in curve if point["within_slo"]]
+    knee = max(passing, key=lambda point: (point["lifecycles_per_min"], -point["concurrency"])) if passing else None
+    metrics_queue.put({
+        "kind": "search",
+        "name": stage["name"],
+        "strategy": search["strategy"],
+        "slo": stage["slo"],
+        "knee": knee,
+        "curve": sorted(curve, key=lambda point: point["concurrency"])
+    })
+    if knee:
+        logger.info(f"Capacity search {stage['name']}: knee at {knee['concurrency']} workers, "
+                    f"{knee['lifecycles_per_min']:.2f} lifecycles/min at p95 {knee['p95_latency']:.2f} ms")
+    else:
+        logger.error(f"Capacity search {stage['name']}: even {search['min']} workers breach the SLOs")
+
+def scale_rate(spec, factor):
+    """Scale a "5" or "1:20" rate spec by `factor`"""
+    return ":".join(f"{float(part) * factor:g}" for part in spec.split(":"))
+
+def stage_share(stage, index, workers):
+    """The part of `stage` worker `index` of `workers` generates"""
+    if "rate" in stage:
+        return dict(stage, rate=scale_rate(stage["rate"], 1 / workers))
+    total = stage["concurrency"]
+    return dict(stage, concurrency=total // workers + (1 if index < total % workers else 0), level=total)
+
+# Metric kinds the coordinator emits itself; workers only ship the rest
+COORDINATOR_KINDS = {"level_started", "level_finished", "stage_started", "stage_finished"}
+# Per-operation metric kinds workers fold into their summaries instead of forwarding
+SUMMARY_KINDS = {"api", "wire", "open_loop"}
+
+
+class SummaryForwarder:
+    """Worker-side replacement for collect_metrics
+
+    API and wire samples, and the open-loop in-flight gauge, are folded
+    into one mergeable summary shipped to the coordinator every
+    SUMMARY_INTERVAL, so traffic to the coordinator does not grow with the
+    request rate. The few per-VM events are forwarded as they are.
+    """
+
+    def __init__(self, channel, interval=SUMMARY_INTERVAL):
+        self.channel = channel
+        self.interval = interval
+        self._delta = new_metrics_state()
+        self._events = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._run, name="summary-forwarder", daemon=True).start()
+        return self
+
+    def send(self, message):
+        with self._lock:
+            self.channel.send(message)
+
+    def flush(self):
+        with self._lock:
+            api = self._delta["api"]
+            measured = api["success_count"] or api["failure_count"] or api["wire"] or any(api["open_loop"].values())
+            if measured or self._events:
+                self.channel.send({"type": "metrics", "summary": export_summary(self._delta), "events": self._events})
+                self._delta = new_metrics_state()
+                self._events = []
+
+    def _run(self):
+        last_sent = time.time()
+        connected = True
+        while True:
+            try:
+                metric = metrics_queue.get(timeout=self.interval)
+            except queue.Empty:
+                metric = None
+            if metric is not None:
+                # task_done for every item, or run_worker's metrics_queue.join() never returns
+                try:
+                    kind = metric.get("kind", "api")
+                    with self._lock:
+                        if kind in SUMMARY_KINDS:
+                            METRIC_HANDLERS[kind](self._delta, metric)
+                        elif kind not in COORDINATOR_KINDS:
+                            self._events.append(metric)
+                except Exception as e:
+                    logger.error(f"Dropping malformed metric: {str(e)}")
+                finally:
+                    metrics_queue.task_done()
+            if connected and time.time() - last_sent >= self.interval:
+                try:
+                    self.flush()
+                except OSError as e:
+                    logger.error(f"Lost connection to coordinator: {str(e)}")
+                    # Keep draining the queue so the worker can still finish its stage and exit
+                    connected = False
+                except Exception as e:
+                    logger.error(f"Dropping metrics summary that could not be sent: {str(e)}")
+                    with self._lock:
+                        self._delta = new_metrics_state()
+                        self._events = []
+                last_sent = time.time()
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+def run_worker(address=COORDINATOR_ADDRESS):
+    """Worker role: generate the coordinator's share of each stage with this process's own connection"""
+    global vm_names, status_tracker, port_pool, RUN_ID
+    channel = Client(parse_address(address), authkey=CLUSTER_KEY)
+    forwarder = SummaryForwarder(channel)
+    try:
+        setup = channel.recv()
+        # Resources this worker creates are tagged, and later cleaned up, as part of the coordinator's run
+        RUN_ID = setup["run_id"]
+        token_cache.seed(setup["token"])
+        # Distinct VM names per worker keep each status tracker to its own servers
+        vm_names = VMNameCounter(f"test_vm_w{setup['index']}")
+        logger.info(f"Worker {setup['index']} connected to coordinator {address}")
+        conn = get_openstack_connection()
+        forwarder.start()
+        network = measure_api_performance(conn.network.get_network, setup["network_id"])
+        sec_group = measure_api_performance(conn.network.get_security_group, setup["sec_group_id"])
+        if BATCHED_POLLING:
+            status_tracker = ServerStatusTracker(conn, name_filter=f"^{vm_names.prefix}_").start()
+            status_tracker.watch_ports(network.id)
+        if PORT_POOL_SIZE:
+            pool_networks = [measure_api_performance(conn.network.get_network, network_id)
+                             for network_id in setup["pool_network_ids"]]
+            port_pool = PortPool(conn, [network, *pool_networks], sec_group).start()
+        while True:
+            message = channel.recv()
+            if message["type"] == "stop":
+                break
+            error = None
+            try:
+                execute_stage(conn, network, sec_group, message["stage"])
+            except Exception as e:
+                logger.error(f"Stage {message['stage']['name']} failed on this worker: {str(e)}")
+                error = str(e)
+            # Everything measured during the stage reaches the coordinator before it hears we are done
+            metrics_queue.join()
+            forwarder.flush()
+            forwarder.send({"type": "stage_done", "error": error})
+    except EOFError:
+        logger.error("Coordinator closed the connection")
+    except Exception as e:
+        logger.error(f"Worker failed: {str(e)}")
+        raise
+    finally:
+        if port_pool is not None:
+            port_pool.stop()
+        if status_tracker is not None:
+            status_tracker.stop()
+        channel.close()
+
+
+class Coordinator:
+    """Accepts distributed workers and drives them through the profile stage by stage
+
+    Each worker reports over its own connection; summaries are put on the
+    local metrics queue, so the collector, recorder and dashboard treat
+    them like locally measured samples.
+    """
+
+    def __init__(self, address, network, sec_group, pool_networks=()):
+        self.listener = Listener(parse_address(address), authkey=CLUSTER_KEY)
+        self.setup = {
+            "network_id": network.id,
+            "sec_group_id": sec_group.id,
+            "run_id": RUN_ID,
+            # Workers start with the coordinator's token rather than each authenticating
+            "token": token_cache.export(),
+            "pool_network_ids": [pool_network.id for pool_network, _ in pool_networks]
+        }
+        self.workers = {}  # {index: connection}
+        self.processes = []
+        self._lock = threading.Lock()
+        self._joined = threading.Condition(self._lock)
+        self._done = queue.Queue()
+        self._indexes = itertools.count()
+        self._closing = False
+        threading.Thread(target=self._accept, name="coordinator-accept", daemon=True).start()
+        logger.info(f"Coordinator listening on {address}")
+
+    def spawn_local_workers(self, count):
+        """Start `count` worker processes of this script on this machine"""
+        for _ in range(count):
+            env = dict(os.environ, TEST_ROLE="worker", TEST_COORDINATOR=COORDINATOR_ADDRESS)
+            self.processes.append(subprocess.Popen([sys.executable, os.path.abspath(__file__)], env=env))
+
+    def wait_for_workers(self, expected, timeout=WORKER_WAIT):
+        deadline = time.time() + timeout
+        with self._joined:
+            while len(self.workers) < expected and time.time() < deadline:
+                self._joined.wait(deadline - time.time())
+            if not self.workers:
+                raise RuntimeError(f"No workers connected within {timeout:.0f}s")
+            if len(self.workers) < expected:
+                logger.error(f"Only {len(self.workers)} of {expected} workers connected; continuing with them")
+
+    def _accept(self):
+        while True:
+            try:
+                channel = self.listener.accept()
+            except OSError:
+                # Listener closed
+                return
+            except Exception as e:
+                logger.error(f"Rejected worker connection: {str(e)}")
+                continue
+            index = next(self._indexes)
+            channel.send(dict(self.setup, index=index))
+            with self._joined:
+                self.workers[index] = channel
+                self._joined.notify_all()
+            threading.Thread(target=self._read, args=(index, channel), name=f"coordinator-{index}", daemon=True).start()
+
+    def _read(self, index, channel):
+        while True:
+            try:
+                message = channel.recv()
+            except (EOFError, OSError):
+                with self._lock:
+                    lost = self.workers.pop(index, None) is not None
+                if lost and not self._closing:
+                    logger.error(f"Worker {index} disconnected")
+                    self._done.put((index, "disconnected"))
+                return
+            if message["type"] == "metrics":
+                metrics_queue.put({"kind": "summary", "worker": index, "summary": message["summary"]})
+                for event in message["events"]:
+                    metrics_queue.put(event)
+            elif message["type"] == "stage_done":
+                self._done.put((index, message["error"]))
+
+    def run_stage(self, stage):
+        """Split a stage across the connected workers and wait for all of them"""
+        with self._lock:
+            workers = dict(self.workers)
+        if not workers:
+            raise RuntimeError("No workers left")
+        started = time.time()
+        if "concurrency" in stage:
+            metrics_queue.put({"kind": "level_started", "concurrency": stage["concurrency"], "started": started})
+        for position, (index, channel) in enumerate(sorted(workers.items())):
+            channel.send({"type": "stage", "stage": stage_share(stage, position, len(workers))})
+        pending = set(workers)
+        while pending:
+            index, error = self._done.get()
+            pending.discard(index)
+            if error:
+                logger.error(f"Worker {index} reported stage {stage['name']} failure: {error}")
+        if "concurrency" in stage:
+            metrics_queue.put({"kind": "level_finished", "concurrency": stage["concurrency"],
+                               "elapsed": time.time() - started})
+
+    def close(self):
+        with self._lock:
+            self._closing = True
+            workers = list(self.workers.values())
+        for channel in workers:
+            try:
+                channel.send({"type": "stop"})
+            except OSError:
+                pass
+        for process in self.processes:
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+        self.listener.close()
+
+def log_stage_verdicts(rows):
+    for row in rows:
+        message = (f"Stage {row['name']} ({row['load']}): p95 {row['p95_latency']:.2f} ms, "
+                   f"errors {row['error_rate'] * 100:.2f}%, {row['vms_created']} VMs, verdict {row['verdict']}")
+        # A capacity search probe breaching its SLOs is how the search finds the limit, not a failure
+        if row["violations"] and row["type"] != "probe":
+            logger.error(f"{message} ({'; '.join(row['violations'])})")
+        else:
+            logger.info(message)
+
+def run_metadata(stages):
+    """Configuration stored alongside a recorded run"""
+    return {
+        "auth_url": os.getenv("OS_AUTH_URL"),
+        "region": os.getenv("OS_REGION_NAME", "region1"),
+        "project": os.getenv("OS_PROJECT_NAME"),
+        "profile": LOAD_PROFILE,
+        "role": ROLE,
+        "stages": stages,
+        "metrics_window": METRICS_WINDOW
+    }
+
+def run_summary(snapshot, status):
+    """JSON-safe summary of a finished run: percentiles, throughput, errors and VM timings
+
+    A run that failed before the collector published has an empty snapshot;
+    its summary reports zero calls rather than failing to be written.
+    """
+    successes = snapshot.get("success_count", 0)
+    failures = snapshot.get("failure_count", 0)
+    calls = successes + failures
+    vm_count = snapshot.get("vm_count", 0)
+    creation = LatencyHistogram()
+    for seconds in snapshot.get("vm_creation_times", [])[:vm_count]:
+        creation.record(seconds)
+    return {
+        "run_id": RUN_ID,
+        "status": status,
+        "profile": LOAD_PROFILE,
+        "role": ROLE,
+        "api": {
+            "calls": calls,
+            "successes": successes,
+            "failures": failures,
+            "error_rate": failures / calls if calls else 0,
+            "throughput": snapshot.get("throughput", 0),
+            "latency_ms": snapshot.get("overall_latency", LatencyHistogram().summary()),
+            "corrected_latency_ms": snapshot.get("corrected_latency", LatencyHistogram().summary()),
+            "late_samples": snapshot.get("late_samples", 0)
+        },
+        "operations": snapshot.get("operations", {}),
+        "wire": snapshot.get("wire", {}),
+        "vms": {
+            "created": vm_count,
+            "creation_time_s": creation.summary(),
+            "phases_s": snapshot.get("phase_summary", {}),
+            "open_loop_lifecycle_ms": snapshot.get("lifecycle_latency", LatencyHistogram().summary()),
+            "open_loop_lifecycle_corrected_ms": snapshot.get("lifecycle_corrected_latency", LatencyHistogram().summary())
+        },
+        "levels": snapshot.get("levels", []),
+        "stages": snapshot.get("stages", []),
+        "cleanups": snapshot.get("cleanups", []),
+        "capacity": snapshot.get("searches", []),
+        "auth": snapshot.get("auth", {}),
+        "windows": snapshot.get("closed_windows", [])
+    }
+
+def junit_report(snapshot, status):
+    """JUnit XML with one test case per stage SLO, plus one for the run itself"""
+    suite = ElementTree.Element("testsuite", name="openstack-performance")
+    counts = {"tests": 1, "failures": 0, "errors": 0, "skipped": 0}
+    run_case = ElementTree.SubElement(suite, "testcase", classname="run", name="test_sequence")
+    if status != "completed":
+        ElementTree.SubElement(run_case, "error", message=f"Test sequence {status}")
+        counts["errors"] += 1
+    for search in snapshot.get("searches", []):
+        case = ElementTree.SubElement(suite, "testcase", classname=f"search.{search['name']}", name="knee")
+        counts["tests"] += 1
+        if search["knee"] is None:
+            ElementTree.SubElement(case, "failure", message=f"No pool size within SLO {search['slo']}")
+            counts["failures"] += 1
+        else:
+            properties = ElementTree.SubElement(case, "properties")
+            for key in ("concurrency", "lifecycles_per_min", "p95_latency"):
+                ElementTree.SubElement(properties, "property", name=key, value=f"{search['knee'][key]:g}")
+    for row in snapshot.get("stages", []):
+        if row["type"] == "probe":
+            continue
+        classname = f"stage.{row['name']}"
+        elapsed = f"{row['elapsed']:.3f}"
+        if not row["checks"]:
+            case = ElementTree.SubElement(suite, "testcase", classname=classname, name="slo", time=elapsed)
+            ElementTree.SubElement(case, "skipped", message="No SLOs defined for this stage")
+            counts["tests"] += 1
+            counts["skipped"] += 1
+        for check in row["checks"]:
+            case = ElementTree.SubElement(suite, "testcase", classname=classname, name=check["slo"], time=elapsed)
+            counts["tests"] += 1
+            if check["passed"] is None:
+                ElementTree.SubElement(case, "skipped", message="No samples to check")
+                counts["skipped"] += 1
+            elif not check["passed"]:
+                failure = ElementTree.SubElement(case, "failure", message=f"{check['value']:.3g} > {check['limit']:g}")
+                failure.text = f"{check['slo']} measured {check['value']} against a limit of {check['limit']}"
+                counts["failures"] += 1
+    for key, value in counts.items():
+        suite.set(key, str(value))
+    return ElementTree.ElementTree(suite)
+
+def finish_run(status, summary_path=None, junit_path=None):
+    """Write the requested reports from the final snapshot and return the exit code"""
+    snapshot = metrics_snapshot
+    if not snapshot:
+        # The collector never published, so nothing was measured whatever the sequence reported
+        status = "failed"
+    if summary_path:
+        with open(summary_path, "w") as f:
+            json.dump(run_summary(snapshot, status), f, indent=2)
+        logger.info(f"Wrote run summary to {summary_path}")
+    if junit_path:
+        report = junit_report(snapshot, status)
+        ElementTree.indent(report)
+        report.write(junit_path, encoding="utf-8", xml_declaration=True)
+        logger.info(f"Wrote SLO report to {junit_path}")
+    if status != "completed":
+        return 2
+    breached = any(row["verdict"] == "fail" for row in snapshot.get("stages", []) if row["type"] != "probe")
+    return 1 if breached or any(search["knee"] is None for search in snapshot.get("searches", [])) else 0
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="OpenStack API performance test")
+    parser.add_argument("--headless", action="store_true", default=HEADLESS,
+                        help="run without the dashboard and exit with the SLO verdict")
+    parser.add_argument("--summary", default=SUMMARY_FILE, metavar="PATH",
+                        help="write a JSON summary of the run to PATH")
+    parser.add_argument("--junit", default=JUNIT_FILE, metavar="PATH",
+                        help="write a JUnit XML SLO report to PATH")
+    return parser.parse_args()
 
 def run_test_sequence():
-    """Main test sequence"""
+    """Main test sequence; returns the run status"""
+    global status_tracker, run_recorder, port_pool
     conn = None
     network = None
     subnet = None
     sec_group = None
+    pool_networks = []
+    metrics_thread = None
+    coordinator = None
+    status = "failed"
     
     try:
+        stages = load_profile(LOAD_PROFILE) if LOAD_PROFILE else default_profile()
+        if RUNS_DB:
+            run_recorder = RunRecorder(RUNS_DB, run_metadata(stages))
         conn = get_openstack_connection()
         metrics_thread = threading.Thread(target=collect_metrics, daemon=True)
         metrics_thread.start()
+        if BATCHED_POLLING and ROLE != "coordinator":
+            status_tracker = ServerStatusTracker(conn, name_filter=f"^{vm_names.prefix}_").start()
         
         pre_cleanup(conn)
         network, subnet = create_network_resources(conn)
         sec_group = create_security_group(conn)
+        if status_tracker is not None:
+            status_tracker.watch_ports(network.id)
+        if PORT_POOL_SIZE:
+            pool_networks = create_pool_networks(conn, PORT_POOL_NETWORKS - 1)
+            if ROLE != "coordinator":
+                port_pool = PortPool(conn, [network, *(pool_network for pool_network, _ in pool_networks)],
+                                     sec_group).start()
         
-        logger.info("Starting test sequence (10 minutes)")
-        start_time = time.time()
-        while time.time() - start_time < 600:  # 10 minutes
-            manage_vm_lifecycle(conn, network, sec_group)
-            time.sleep(5)
+        if ROLE == "coordinator":
+            coordinator = Coordinator(COORDINATOR_ADDRESS, network, sec_group, pool_networks)
+            coordinator.spawn_local_workers(LOCAL_WORKERS)
+            coordinator.wait_for_workers(LOCAL_WORKERS + REMOTE_WORKERS)
+            execute = coordinator.run_stage
+        else:
+            execute = lambda stage: execute_stage(conn, network, sec_group, stage)
+        logger.info(f"Starting test sequence ({len(stages)} stages, "
+                    f"{sum(stage['duration'] for stage in stages if 'search' not in stage):.0f}s"
+                    f"{' plus capacity searches' if any('search' in stage for stage in stages) else ''})")
+        for stage in stages:
+            if stage["type"] == "search":
+                capacity_search(stage, execute)
+            else:
+                run_stage(stage, execute)
             
         logger.info("Test sequence completed successfully")
+        status = "completed"
         
     except Exception as e:
         logger.error(f"Test sequence failed: {str(e)}")
     finally:
-        if conn:
-            cleanup_resources(conn, network, subnet, sec_group)
+        if coordinator is not None:
+            coordinator.close()
+        if port_pool is not None:
+            port_pool.stop()
+        if status_tracker is not None:
+            status_tracker.stop()
+            logger.info(f"Status tracker used {status_tracker.list_requests} list calls, "
+                        f"saving ~{status_tracker.saved_requests()} per-server polls")
+        try:
+            if conn:
+                cleanup_resources(conn)
+        except Exception:
+            # Already logged by cleanup_resources; leftovers mean the run did not end cleanly,
+            # and the reports and exit code below must still be produced
+            status = "failed"
+        finally:
+            if metrics_thread is not None:
+                # Let the collector ingest (and hand to the recorder) every queued event,
+                # then publish the final snapshot the verdicts and reports are read from
+                metrics_queue.join()
+                collector_stop.set()
+                metrics_thread.join()
+                log_stage_verdicts(metrics_snapshot["stages"])
+            if run_recorder is not None:
+                run_recorder.close(status)
+    return status
 
 if __name__ == "__main__":
-    test_thread = threading.Thread(target=run_test_sequence, daemon=True)
-    test_thread.start()
-    app.run(host="0.0.0.0", port=8050, debug=False)
+    args = parse_args()
+    if ROLE == "worker":
+        run_worker()
+    elif args.headless:
+        sys.exit(finish_run(run_test_sequence(), args.summary, args.junit))
+    else:
+        app = create_dashboard()
+        test_thread = threading.Thread(
+            target=lambda: finish_run(run_test_sequence(), args.summary, args.junit), daemon=True)
+        test_thread.start()
+        app.run(host="0.0.0.0", port=8050, debug=False)
@@ -0,0 +1,316 @@
+"""Indexed inventory store for the OpenStack metadata collected by new.py
+
+Loads the inventory snapshot new.py keeps (.inventory_snapshot.json, see
+INVENTORY_SNAPSHOT) into dicts keyed by id, with secondary indexes on the
+fields cross-resource questions join on: network, subnet, project, flavor,
+image, device, security group, host and status. "Which ports are on this
+network" or "which servers use this flavor" become set lookups instead of
+scans over nested response lists. Servers come from new.py's
+/servers/detail crawl, which is what carries their flavor, image, host
+and status.
+
+The same inventory can be saved to SQLite (one row per record plus an
+indexed reference table) and queried there without loading it into memory:
+
+    python inventory_store.py ports --where network_id=<network id>
+    python inventory_store.py servers --where flavor=<flavor id> --count
+    python inventory_store.py --references <server id>
+    python inventory_store.py --save inventory.sqlite
+    python inventory_store.py --db inventory.sqlite ports --where device_id=<server id>
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import argparse
+from collections import defaultdict
+from contextlib import closing
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+INVENTORY_SNAPSHOT = os.getenv("INVENTORY_SNAPSHOT", ".inventory_snapshot.json")
+
+
+def reference_id(value):
+    """Id behind an embedded reference: Nova embeds {"id": ...} (or only original_name from 2.47)"""
+    if isinstance(value, dict):
+        return value.get("id") or value.get("original_name")
+    return value or None
+
+
+def security_group_names(record):
+    groups = record.get("security_groups") or []
+    return [group.get("name") if isinstance(group, dict) else group for group in groups]
+
+
+# Indexed fields and how to read them from any kind of record; each returns the values a record references
+INDEXES = {
+    "network_id": lambda r: [r.get("network_id")],
+    "subnet_id": lambda r: [r.get("subnet_id")] + [ip.get("subnet_id") for ip in r.get("fixed_ips") or []],
+    "project_id": lambda r: [r.get("project_id") or r.get("tenant_id") or r.get("owner")],
+    "flavor": lambda r: [reference_id(r.get("flavor"))],
+    "image": lambda r: [reference_id(r.get("image")), (r.get("volume_image_metadata") or {}).get("image_id")],
+    "device_id": lambda r: [r.get("device_id")],
+    "security_group": lambda r: security_group_names(r),
+    "host": lambda r: [r.get("OS-EXT-SRV-ATTR:host") or r.get("binding:host_id") or r.get("os-vol-host-attr:host")],
+    "status": lambda r: [r.get("status")],
+}
+
+
+def collection_records(data):
+    """(collection key, records) of a list response, as new.py's page_records; (None, []) otherwise"""
+    for key, value in data.items():
+        if isinstance(value, list) and not (key in ("next", "first", "links") or key.endswith("_links")):
+            return key, value
+    return None, []
+
+
+def record_id(record, position):
+    return str(record.get("id") or record.get("name") or position)
+
+
+class InventoryStore:
+    """Records by kind and id, with per-kind secondary indexes on INDEXES
+
+    kind is the collection key of the response a record came from
+    ("servers", "ports", "volumes", ...).
+    """
+
+    def __init__(self):
+        self.records = defaultdict(dict)  # {kind: {id: record}}
+        # {kind: {field: {value: {id}}}}
+        self.indexes = defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
+
+    @classmethod
+    def from_snapshot(cls, path=INVENTORY_SNAPSHOT):
+        with open(path) as f:
+            snapshot = json.load(f)
+        store = cls()
+        for entry in snapshot.get("services", {}).values():
+            store.add_response(entry["data"])
+        return store
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Build from new.py inventory entries ({service: {"data": response, ...}})"""
+        store = cls()
+        for entry in entries.values():
+            if "error" not in entry["data"]:
+                store.add_response(entry["data"])
+        return store
+
+    def add_response(self, data):
+        kind, records = collection_records(data)
+        for position, record in enumerate(records):
+            if isinstance(record, dict) and set(record) == {"keypair"}:
+                record = record["keypair"]  # Nova wraps each keypair as {"keypair": {...}}
+            if isinstance(record, dict):
+                self.add(kind, record_id(record, position), record)
+
+    def add(self, kind, record_id, record):
+        if record_id in self.records[kind]:
+            self.remove(kind, record_id)
+        self.records[kind][record_id] = record
+        indexes = self.indexes[kind]
+        for field, values in INDEXES.items():
+            for value in values(record):
+                if value:
+                    indexes[field][value].add(record_id)
+
+    def remove(self, kind, record_id):
+        record = self.records[kind].pop(record_id)
+        indexes = self.indexes[kind]
+        for field, values in INDEXES.items():
+            for value in values(record):
+                if value:
+                    indexes[field][value].discard(record_id)
+                    if not indexes[field][value]:
+                        del indexes[field][value]
+
+    def kinds(self):
+        return {kind: len(records) for kind, records in self.records.items() if records}
+
+    def get(self, kind, record_id):
+        return self.records[kind].get(record_id)
+
+    def ids(self, kind, **filters):
+        """Ids of `kind` matching every filter; indexed fields use the indexes, others compare top-level values"""
+        indexed = {field: value for field, value in filters.items() if field in INDEXES}
+        ids = None
+        # Intersect the smallest index sets first
+        for field, value in sorted(indexed.items(), key=lambda item: len(self.indexes[kind][item[0]].get(item[1], ()))):
+            matches = self.indexes[kind][field].get(value, set())
+            ids = set(matches) if ids is None else ids & matches
+            if not ids:
+                return set()
+        if ids is None:
+            ids = set(self.records[kind])
+        for field, value in filters.items():
+            if field not in INDEXES:
+                ids = {i for i in ids if str(self.records[kind][i].get(field)) == str(value)}
+        return ids
+
+    def find(self, kind, **filters):
+        return [self.records[kind][i] for i in sorted(self.ids(kind, **filters))]
+
+    def count(self, kind, **filters):
+        return len(self.ids(kind, **filters))
+
+    def references(self, value):
+        """Every record that points at `value` through an indexed field, as {kind: {field: [ids]}}"""
+        found = {}
+        for kind, indexes in self.indexes.items():
+            for field, index in indexes.items():
+                if value in index:
+                    found.setdefault(kind, {})[field] = sorted(index[value])
+        return found
+
+    def save(self, path):
+        """Write the store to SQLite, replacing what was there"""
+        with closing(open_inventory_db(path)) as db:
+            db.execute("DELETE FROM records")
+            db.execute("DELETE FROM refs")
+            db.executemany(
+                "INSERT INTO records (kind, id, body) VALUES (?, ?, ?)",
+                ((kind, i, json.dumps(record)) for kind, records in self.records.items() for i, record in records.items())
+            )
+            db.executemany(
+                "INSERT INTO refs (kind, field, value, id) VALUES (?, ?, ?, ?)",
+                ((kind, field, str(value), i)
+                 for kind, indexes in self.indexes.items()
+                 for field, index in indexes.items()
+                 for value, ids in index.items()
+                 for i in ids)
+            )
+            db.commit()
+        logger.info(f"Saved {sum(self.kinds().values())} records to {path}")
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with closing(open_inventory_db(path)) as db:
+            for kind, i, body in db.execute("SELECT kind, id, body FROM records"):
+                store.add(kind, i, json.loads(body))
+        return store
+
+
+def open_inventory_db(path):
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS records (
+            kind TEXT NOT NULL,
+            id TEXT NOT NULL,
+            body TEXT NOT NULL,
+            PRIMARY KEY (kind, id)
+        )""")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS refs (
+            kind TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL,
+            id TEXT NOT NULL
+        )""")
+    db.execute("CREATE INDEX IF NOT EXISTS refs_lookup ON refs (kind, field, value)")
+    db.execute("CREATE INDEX IF NOT EXISTS refs_value ON refs (value)")
+    return db
+
+
+class SqliteInventoryStore:
+    """The InventoryStore query API answered straight from a saved SQLite store"""
+
+    def __init__(self, path):
+        self.db = open_inventory_db(path)
+
+    def close(self):
+        self.db.close()
+
+    def kinds(self):
+        return dict(self.db.execute("SELECT kind, COUNT(*) FROM records GROUP BY kind"))
+
+    def get(self, kind, record_id):
+        row = self.db.execute("SELECT body FROM records WHERE kind = ? AND id = ?", (kind, record_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _query(self, select, kind, filters):
+        sql = [f"SELECT {select} FROM records r WHERE r.kind = ?"]
+        params = [kind]
+        for field, value in filters.items():
+            if field in INDEXES:
+                sql.append("AND r.id IN (SELECT id FROM refs WHERE kind = ? AND field = ? AND value = ?)")
+                params += [kind, field, str(value)]
+            else:
+                sql.append("AND CAST(json_extract(r.body, ?) AS TEXT) = ?")
+                params += [f'$."{field}"', str(value)]
+        return self.db.execute(" ".join(sql), params)
+
+    def find(self, kind, **filters):
+        return [json.loads(body) for body, in self._query("body", kind, filters)]
+
+    def count(self, kind, **filters):
+        return self._query("COUNT(*)", kind, filters).fetchone()[0]
+
+    def references(self, value):
+        found = {}
+        for kind, field, i in self.db.execute("SELECT kind, field, id FROM refs WHERE value = ? ORDER BY id", (value,)):
+            found.setdefault(kind, {}).setdefault(field, []).append(i)
+        return found
+
+
+def parse_filters(pairs):
+    filters = {}
+    for pair in pairs or []:
+        field, _, value = pair.partition("=")
+        filters[field] = value
+    return filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the inventory collected by new.py")
+    parser.add_argument("kind", nargs="?", help="Collection to query, e.g. servers, ports, volumes")
+    parser.add_argument("--snapshot", default=INVENTORY_SNAPSHOT, help="new.py inventory snapshot to load")
+    parser.add_argument("--db", help="Query a SQLite store written with --save instead of the snapshot")
+    parser.add_argument("--save", help="Write the loaded inventory to this SQLite file")
+    parser.add_argument("--where", action="append", metavar="FIELD=VALUE",
+                        help=f"Filter; indexed fields: {', '.join(INDEXES)}")
+    parser.add_argument("--id", help="Show one record")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matches")
+    parser.add_argument("--fields", help="Comma separated fields to print instead of whole records")
+    parser.add_argument("--references", metavar="VALUE", help="Records of any kind that point at VALUE")
+    args = parser.parse_args()
+    if args.db and args.save:
+        parser.error("--save needs an inventory loaded from --snapshot")
+
+    started = time.perf_counter()
+    store = SqliteInventoryStore(args.db) if args.db else InventoryStore.from_snapshot(args.snapshot)
+    logger.info(f"Loaded {sum(store.kinds().values())} records in {(time.perf_counter() - started) * 1000:.1f} ms")
+    if args.save:
+        store.save(args.save)
+
+    started = time.perf_counter()
+    if args.references:
+        result = store.references(args.references)
+    elif not args.kind:
+        result = store.kinds()
+    elif args.id:
+        result = store.get(args.kind, args.id)
+    elif args.count:
+        result = store.count(args.kind, **parse_filters(args.where))
+    else:
+        result = store.find(args.kind, **parse_filters(args.where))
+        if args.fields:
+            fields = args.fields.split(",")
+            result = [{field: record.get(field) for field in fields} for record in result]
+    elapsed = time.perf_counter() - started
+    print(json.dumps(result, indent=2, sort_keys=True))
+    logger.info(f"Query answered in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+import time
+import threading
+import argparse
 import dash
-from dash import dcc, html
+from dash import dcc, html, dash_table, Input, Output, State, ALL, MATCH, ctx, no_update
 import os
 import json
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from inventory_store import InventoryStore
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +23,20 @@ OS_PASSWORD = os.getenv("OS_PASSWORD")
 OS_PROJECT_NAME = os.getenv("OS_PROJECT_NAME")
 OS_PROJECT_DOMAIN_NAME = os.getenv("OS_PROJECT_DOMAIN_NAME")
 OS_USER_DOMAIN_NAME = os.getenv("OS_USER_DOMAIN_NAME")
+# Token cache shared with Python-API-test.py, so repeated runs skip Keystone while the token is fresh
+TOKEN_CACHE_FILE = os.getenv("OS_TOKEN_CACHE", ".os_token_cache.json")
+TOKEN_REFRESH_MARGIN = float(os.getenv("OS_TOKEN_REFRESH_MARGIN", "300"))  # seconds before expiry to re-authenticate
+METADATA_WORKERS = int(os.getenv("METADATA_WORKERS", "16"))  # endpoints fetched in parallel
+METADATA_TIMEOUT = float(os.getenv("METADATA_TIMEOUT", "10"))  # seconds per request
+METADATA_PAGE_SIZE = int(os.getenv("METADATA_PAGE_SIZE", "1000"))  # records per page, 0 to request unpaged lists
+# Inventory from the previous run, refreshed incrementally; empty to fetch everything every time
+INVENTORY_SNAPSHOT = os.getenv("INVENTORY_SNAPSHOT", ".inventory_snapshot.json")
+INVENTORY_FULL_RESYNC = float(os.getenv("INVENTORY_FULL_RESYNC", "3600"))  # seconds between full re-syncs per service
+CLOCK_SKEW = timedelta(seconds=5)  # Overlap between changes-since windows
+METADATA_REFRESH_INTERVAL = float(os.getenv("METADATA_REFRESH_INTERVAL", "300"))  # seconds between background refreshes, 0 for on demand only
+DASHBOARD_POLL_INTERVAL = float(os.getenv("DASHBOARD_POLL_INTERVAL", "2"))  # seconds between section status updates in the browser
+TABLE_PAGE_SIZE = int(os.getenv("TABLE_PAGE_SIZE", "25"))  # rows sent to the browser per table page
+DEFAULT_COLUMNS = ["id", "name", "status", "project_id", "network_id", "created_at"]  # shown first when present
 
 # Hardcoded known working endpoints
 KNOWN_ENDPOINTS = {
@@ -37,8 +60,62 @@ KNOWN_ENDPOINTS = {
     "cluster_blueprint": "https://sa-demo-region2.app.qa-pcd.platform9.com/cluster/v1/blueprints",
 }
 
-# Authenticate and get a token
+# Point the hardcoded endpoints at another host, e.g. the local simulator in openstack_simulator.py
+KNOWN_ENDPOINTS_HOST = os.getenv("KNOWN_ENDPOINTS_HOST")
+if KNOWN_ENDPOINTS_HOST:
+    KNOWN_ENDPOINTS = {
+        name: f"{KNOWN_ENDPOINTS_HOST.rstrip('/')}/{url.split('/', 3)[3]}" for name, url in KNOWN_ENDPOINTS.items()
+    }
+
+# Same key as token_cache_key() in Python-API-test.py
+def token_cache_key():
+    parts = [OS_AUTH_URL, OS_USERNAME, OS_USER_DOMAIN_NAME, OS_PROJECT_NAME, OS_PROJECT_DOMAIN_NAME]
+    return hashlib.sha256("|".join(part or "" for part in parts).encode()).hexdigest()
+
+def read_token_cache():
+    if not TOKEN_CACHE_FILE:
+        return {}
+    try:
+        with open(TOKEN_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def token_expiring(token_response):
+    expires_at = datetime.fromisoformat(token_response["token"]["expires_at"].replace("Z", "+00:00"))
+    return expires_at - datetime.now(timezone.utc) < timedelta(seconds=TOKEN_REFRESH_MARGIN)
+
+# Return a cached (token, token response) that is not about to expire, or None
+def get_cached_token():
+    entry = read_token_cache().get(token_cache_key())
+    if not entry or token_expiring(entry["body"]):
+        return None
+    return entry["auth_token"], entry["body"]
+
+# Write through a temporary file readable only by this user, so readers never see a partial file
+def write_private_json(path, data):
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+def store_token(token, token_response):
+    if not TOKEN_CACHE_FILE:
+        return
+    entries = read_token_cache()
+    entries[token_cache_key()] = {"auth_token": token, "body": token_response}
+    try:
+        write_private_json(TOKEN_CACHE_FILE, entries)
+    except OSError as e:
+        print(f"⚠️ Could not write token cache {TOKEN_CACHE_FILE}: {str(e)}")
+
+# Authenticate and get a token, reusing a cached one while it is still fresh
 def get_token():
+    cached = get_cached_token()
+    if cached:
+        print("✅ Reusing cached token")
+        return cached
+
     auth_data = {
         "auth": {
             "identity": {
@@ -62,7 +139,9 @@ def get_token():
     response = requests.post(f"{OS_AUTH_URL}/auth/tokens", json=auth_data)
     if response.status_code == 201:
         print("✅ Authentication successful")
-        return response.headers["X-Subject-Token"], response.json()  # Return full token response
+        token, token_response = response.headers["X-Subject-Token"], response.json()  # Full token response
+        store_token(token, token_response)
+        return token, token_response
     else:
         print(f"❌ Authentication failed: {response.status_code}, Response: {response.text}")
         raise Exception("Failed to authenticate with OpenStack")
@@ -89,153 +168,707 @@ def get_service_endpoints(service_catalog):
                 break  # Stop after finding the first public endpoint
     return endpoints
 
-# Function to fetch metadata
-def fetch_metadata(endpoint, token):
-    headers = {"X-Auth-Token": token}
-    try:
-        print(f"Fetching data from {endpoint}")
-        response = requests.get(endpoint, headers=headers, timeout=10)
-        print(f"Status Code: {response.status_code}")
-
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Response Data: {json.dumps(data, indent=2)}")  # Debugging: Print response data
-            return data
-        elif response.status_code == 300:  # Handle Multiple Choices
-            print(f"⚠️ Received 300 Multiple Choices for {endpoint}")
-            choices = response.json().get("versions", [])
-            if choices:
-                # Find the preferred choice (usually "CURRENT" or highest version)
-                for choice in choices:
-                    if "status" in choice and choice["status"].lower() == "current":
-                        new_endpoint = choice.get("links", [{}])[0].get("href", "")
-                        if new_endpoint:
-                            print(f"🔄 Retrying with: {new_endpoint}")
-                            return fetch_metadata(new_endpoint, token)
-            return {"error": "Multiple choices returned, but no valid option found", "response": response.text}
-        elif response.status_code == 404:
-            print(f"⚠️ Resource not found at {endpoint} (404). Skipping.")
-            return {"error": "Resource not found"}
+# One keep-alive session shared by every fetch, with a connection pool per host large enough for all workers
+def create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=METADATA_WORKERS, pool_maxsize=METADATA_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+session = create_session()
+
+# A failed request; result is the error entry stored in metadata for that service
+class FetchError(Exception):
+    def __init__(self, result, status_code=None):
+        super().__init__(result["error"])
+        self.result = result
+        self.status_code = status_code
+
+def with_query(url, **params):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+# Paging links are dropped from the merged result once every page has been read
+def is_pagination_key(key):
+    return key in ("next", "first", "links") or key.endswith("_links")
+
+# Next page link in Glance ("next"), Keystone ("links") or Nova/Neutron/Cinder ("<collection>_links") style
+def next_link(page):
+    if isinstance(page.get("next"), str):
+        return page["next"]
+    links = page.get("links")
+    if isinstance(links, dict) and links.get("next"):
+        return links["next"]
+    for key, value in page.items():
+        if key.endswith("_links") and isinstance(value, list):
+            for link in value:
+                if link.get("rel") == "next":
+                    return link.get("href")
+    return None
+
+# Glance returns next links relative to its service root, which may sit under a path prefix
+def resolve_next(url, href):
+    link = urlsplit(href)
+    if link.scheme:
+        return href
+    parts = urlsplit(url)
+    prefix = parts.path.find(link.path)
+    root = parts.path[:prefix] if prefix > 0 else ""
+    return urlunsplit((parts.scheme, parts.netloc, root + link.path, link.query, ""))
+
+# Return (collection key, records) of a list response, or (None, None) for any other body
+def page_records(page):
+    for key, value in page.items():
+        if isinstance(value, list) and not is_pagination_key(key):
+            return key, value
+    return None, None
+
+# GET one page; returns the URL that answered (after a 300 redirect), its body (None on 304) and headers
+def get_page(url, token, extra_headers=None):
+    headers = {"X-Auth-Token": token, **(extra_headers or {})}
+    response = session.get(url, headers=headers, timeout=METADATA_TIMEOUT)
+    print(f"Status Code: {response.status_code} from {url}")
+
+    if response.status_code == 200:
+        return url, response.json(), response.headers
+    elif response.status_code == 304:  # Conditional request and nothing changed
+        return url, None, response.headers
+    elif response.status_code == 300:  # Handle Multiple Choices
+        print(f"⚠️ Received 300 Multiple Choices for {url}")
+        choices = response.json().get("versions", [])
+        # Find the preferred choice (usually "CURRENT" or highest version)
+        for choice in choices:
+            if "status" in choice and choice["status"].lower() == "current":
+                new_endpoint = choice.get("links", [{}])[0].get("href", "")
+                if new_endpoint:
+                    print(f"🔄 Retrying with: {new_endpoint}")
+                    return get_page(new_endpoint, token, extra_headers)
+        raise FetchError({"error": "Multiple choices returned, but no valid option found", "response": response.text}, 300)
+    elif response.status_code == 404:
+        print(f"⚠️ Resource not found at {url} (404). Skipping.")
+        raise FetchError({"error": "Resource not found"}, 404)
+    else:
+        print(f"⚠️ Failed with status {response.status_code}, Response: {response.text}")
+        raise FetchError({"error": f"Failed with status {response.status_code}", "response": response.text},
+                         response.status_code)
+
+# Yield response pages one at a time, following next links, or marker/limit for services that page without them.
+# extra_headers go on every request; validators (If-None-Match/If-Modified-Since) only on the first one.
+# `meta`, when given, receives the page count, the first page's ETag/Last-Modified and not_modified on a 304.
+def iter_pages(endpoint, token, page_size=METADATA_PAGE_SIZE, extra_headers=None, validators=None, meta=None):
+    meta = {} if meta is None else meta
+    meta["pages"] = 0
+    url = with_query(endpoint, limit=page_size) if page_size else endpoint
+    previous_first = None
+    while url:
+        print(f"Fetching data from {url}")
+        first_request = meta["pages"] == 0
+        url, page, headers = get_page(url, token, {**(extra_headers or {}), **((first_request and validators) or {})})
+        if first_request:
+            meta["etag"], meta["last_modified"] = headers.get("ETag"), headers.get("Last-Modified")
+        if page is None:
+            meta["not_modified"] = True
+            return
+        meta["pages"] += 1
+        key, records = page_records(page)
+        first = records[0].get("id") if records and isinstance(records[0], dict) else None
+        if first is not None and first == previous_first:
+            return  # The service ignored the marker and sent the same page again
+        previous_first = first
+        yield page
+
+        href = next_link(page)
+        if href:
+            url = resolve_next(url, href)
+        elif page_size and records and len(records) == page_size and "id" in records[-1]:
+            url = with_query(url, marker=records[-1]["id"])
         else:
-            print(f"⚠️ Failed with status {response.status_code}, Response: {response.text}")
-            return {"error": f"Failed with status {response.status_code}", "response": response.text}
+            url = None
+
+# Merge every page into one response shaped like the first; raises FetchError
+def fetch_collection(endpoint, token, extra_headers=None, validators=None, meta=None):
+    result = None
+    for page in iter_pages(endpoint, token, extra_headers=extra_headers, validators=validators, meta=meta):
+        key, records = page_records(page)
+        if key is None:
+            return page
+        if result is None:
+            result = {name: value for name, value in page.items() if not is_pagination_key(name)}
+            result[key] = list(records)
+        else:
+            result[key].extend(records)
+    return result if result is not None else {}
+
+# Function to fetch metadata; failures come back as {"error": ...} entries
+def fetch_metadata(endpoint, token, meta=None):
+    try:
+        return fetch_collection(endpoint, token, meta=meta)
+    except FetchError as e:
+        return e.result
     except Exception as e:
-        print(f"⚠️ Exception occurred: {str(e)}")
+        print(f"⚠️ Exception occurred for {endpoint}: {str(e)}")
         return {"error": str(e)}
 
-# Get authentication token and service catalog
-token, token_response = get_token()
-project_id = get_project_id(token_response)  # Extract project ID
-service_catalog = token_response["token"]["catalog"]
-
-# Debugging output to inspect the service catalog
-service_endpoints = get_service_endpoints(service_catalog)
-
-# Merge known endpoints with dynamically retrieved ones
-all_endpoints = {**KNOWN_ENDPOINTS, **service_endpoints}
-print("Image URL:", all_endpoints.get('image', ''))
-print("Network URL:", all_endpoints.get('network', ''))
-
-# Define metadata collection points
-metadata_endpoints = {
-    "compute_servers": f"{all_endpoints.get('compute', '')}/servers",
-    "images": f"{all_endpoints.get('image', '')}/v2/images?owner={project_id}",  # Scope to project
-    "networks": f"{all_endpoints.get('network', '')}/v2.0/networks?tenant_id={project_id}",  # Scope to project
-    "subnets": f"{all_endpoints.get('network', '')}/v2.0/subnets?tenant_id={project_id}",  # Scope to project
-    "security_groups": f"{all_endpoints.get('network', '')}/v2.0/security-groups?tenant_id={project_id}",  # Scope to project
-    "flavors": f"{all_endpoints.get('compute', '')}/flavors",  # Flavors are global, no project scope
-    "volume_types": f"{all_endpoints.get('volumev3', '')}/types",  # Volume types are global
-    "users": f"{all_endpoints.get('identity', '')}/users",  # Users are global
-    "keypairs": f"{all_endpoints.get('compute', '')}/os-keypairs",  # Keypairs are global
-    "ports": f"{all_endpoints.get('network', '')}/v2.0/ports",  # Ports are global
-    "hosts": f"{all_endpoints.get('compute', '')}/os-hosts",  # Hosts are global
-    "volume_image_metadata": f"{all_endpoints.get('volumev3', '')}/volumes",  # Volume image metadata
-    "server_groups": f"{all_endpoints.get('compute', '')}/os-server-groups",  # Server groups are global
-    "hypervisors": f"{all_endpoints.get('compute', '')}/os-hypervisors",  # Hypervisors are global
-    "backends": f"{all_endpoints.get('volumev3', '')}/backends",  # Backends are global
-    "projects": f"{all_endpoints.get('identity', '')}/projects",  # Projects are global
-    "host_configs": f"{all_endpoints.get('compute', '')}/os-host-configs",  # Host configs are global
-    "cluster_blueprints": f"{all_endpoints.get('cluster', '')}/v1/blueprints",  # Cluster blueprints are global
+# One line per service instead of the whole body
+def summarize(data):
+    if not isinstance(data, dict):
+        return data
+    if "error" in data:
+        return f"error: {data['error']}"
+    key, records = page_records(data)
+    return f"{len(records)} {key}" if key else f"{len(data)} fields"
+
+# Services that can list only what changed since a timestamp. Nova's changes-since also reports deleted
+# servers, with status DELETED on the detailed listing that compute_servers crawls; Glance and Cinder
+# (API 3.60+) filter on updated_at, so their deletions wait for the next full re-sync.
+CHANGE_FILTERS = {
+    "compute_servers": {"param": "changes-since", "value": "{since}", "deletions": True},
+    "images": {"param": "updated_at", "value": "gt:{since}"},
+    "volume_image_metadata": {"param": "updated_at", "value": "gt:{since}",
+                              "headers": {"OpenStack-API-Version": "volume 3.60"}},
 }
 
-# Fetch metadata from all services
-metadata = {}
-
-# Use hardcoded endpoints for specific resources if dynamic endpoints fail
-images_endpoint = KNOWN_ENDPOINTS.get("image", "") + f"?owner={project_id}"
-networks_endpoint = KNOWN_ENDPOINTS.get("network", "") + f"?tenant_id={project_id}"
-subnets_endpoint = KNOWN_ENDPOINTS.get("subnet", "") + f"?tenant_id={project_id}"
-security_groups_endpoint = KNOWN_ENDPOINTS.get("security_group", "") + f"?tenant_id={project_id}"
-flavors_endpoint = KNOWN_ENDPOINTS.get("flavor", "")
-volume_types_endpoint = KNOWN_ENDPOINTS.get("volume_type", "")
-users_endpoint = KNOWN_ENDPOINTS.get("user", "")
-keypairs_endpoint = KNOWN_ENDPOINTS.get("keypair", "")
-ports_endpoint = KNOWN_ENDPOINTS.get("port", "")
-hosts_endpoint = KNOWN_ENDPOINTS.get("host", "")
-volume_image_metadata_endpoint = KNOWN_ENDPOINTS.get("volume_image_metadata", "")
-server_groups_endpoint = KNOWN_ENDPOINTS.get("server_group", "")
-hypervisors_endpoint = KNOWN_ENDPOINTS.get("hypervisor", "")
-backends_endpoint = KNOWN_ENDPOINTS.get("backend", "")
-projects_endpoint = KNOWN_ENDPOINTS.get("project", "")
-host_configs_endpoint = KNOWN_ENDPOINTS.get("host_config", "")
-cluster_blueprints_endpoint = KNOWN_ENDPOINTS.get("cluster_blueprint", "")
-
-metadata["images"] = fetch_metadata(images_endpoint, token)
-metadata["networks"] = fetch_metadata(networks_endpoint, token)
-metadata["subnets"] = fetch_metadata(subnets_endpoint, token)
-metadata["security_groups"] = fetch_metadata(security_groups_endpoint, token)
-metadata["flavors"] = fetch_metadata(flavors_endpoint, token)
-metadata["volume_types"] = fetch_metadata(volume_types_endpoint, token)
-metadata["users"] = fetch_metadata(users_endpoint, token)
-metadata["keypairs"] = fetch_metadata(keypairs_endpoint, token)
-metadata["ports"] = fetch_metadata(ports_endpoint, token)
-metadata["hosts"] = fetch_metadata(hosts_endpoint, token)
-metadata["volume_image_metadata"] = fetch_metadata(volume_image_metadata_endpoint, token)
-metadata["server_groups"] = fetch_metadata(server_groups_endpoint, token)
-metadata["hypervisors"] = fetch_metadata(hypervisors_endpoint, token)
-metadata["backends"] = fetch_metadata(backends_endpoint, token)
-metadata["projects"] = fetch_metadata(projects_endpoint, token)
-metadata["host_configs"] = fetch_metadata(host_configs_endpoint, token)
-metadata["cluster_blueprints"] = fetch_metadata(cluster_blueprints_endpoint, token)
-
-# Fetch metadata for other services
-for service, url in metadata_endpoints.items():
-    if service not in ["images", "networks", "subnets", "security_groups", "flavors", "volume_types", "users", "keypairs", "ports", "hosts", "volume_image_metadata", "server_groups", "hypervisors", "backends", "projects", "host_configs", "cluster_blueprints"] and url:
-        metadata[service] = fetch_metadata(url, token)
-
-print("Fetched Metadata:")
-print("Images Metadata:", metadata.get("images", {}))
-print("Networks Metadata:", metadata.get("networks", {}))
-print("Subnets Metadata:", metadata.get("subnets", {}))
-print("Security Groups Metadata:", metadata.get("security_groups", {}))
-print("Flavors Metadata:", metadata.get("flavors", {}))
-print("Volume Types Metadata:", metadata.get("volume_types", {}))
-print("Users Metadata:", metadata.get("users", {}))
-print("Keypairs Metadata:", metadata.get("keypairs", {}))
-print("Ports Metadata:", metadata.get("ports", {}))
-print("Hosts Metadata:", metadata.get("hosts", {}))
-print("Volume Image Metadata:", metadata.get("volume_image_metadata", {}))
-print("Server Groups Metadata:", metadata.get("server_groups", {}))
-print("Hypervisors Metadata:", metadata.get("hypervisors", {}))
-print("Backends Metadata:", metadata.get("backends", {}))
-print("Projects Metadata:", metadata.get("projects", {}))
-print("Host Configs Metadata:", metadata.get("host_configs", {}))
-print("Cluster Blueprints Metadata:", metadata.get("cluster_blueprints", {}))
+def read_snapshot():
+    if not INVENTORY_SNAPSHOT:
+        return {}
+    try:
+        with open(INVENTORY_SNAPSHOT) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # A snapshot of another cloud, user or project is no use here
+    return snapshot if snapshot.get("key") == token_cache_key() else {}
+
+# Save the refreshed services; failed ones keep their previous entry so the next run can still go incremental
+def save_snapshot(previous, entries):
+    if not INVENTORY_SNAPSHOT:
+        return
+    services = dict(previous.get("services", {}))
+    for service, entry in entries.items():
+        if entry["mode"] != "error":
+            services[service] = entry
+    try:
+        write_private_json(INVENTORY_SNAPSHOT, {"key": token_cache_key(), "services": services})
+    except OSError as e:
+        print(f"⚠️ Could not write inventory snapshot {INVENTORY_SNAPSHOT}: {str(e)}")
+
+def snapshot_expired(previous, now):
+    synced_at = datetime.fromisoformat(previous["synced_at"])
+    return (now - synced_at).total_seconds() > INVENTORY_FULL_RESYNC
+
+def full_entry(url, data, meta, started, since):
+    return {
+        "url": url, "data": data, "mode": "error" if "error" in data else "full",
+        "synced_at": started.isoformat(), "changed_at": since,
+        "etag": meta.get("etag"), "last_modified": meta.get("last_modified"), "pages": meta.get("pages")
+    }
+
+# Apply a changes-since listing to the previous records, dropping servers Nova reports as deleted
+def merge_changes(previous_data, changes, deletions=False):
+    key, records = page_records(previous_data)
+    merged = {record["id"]: record for record in records}
+    for record in page_records(changes)[1] or []:
+        if deletions and record.get("status") in ("DELETED", "SOFT_DELETED"):
+            merged.pop(record["id"], None)
+        else:
+            merged[record["id"]] = record
+    return {**previous_data, key: list(merged.values())}
+
+# Refresh one service from its snapshot entry: changes-since where the service supports it, a conditional
+# GET for single-page responses that carried a validator, and a full re-sync otherwise
+def refresh_service(service, url, token, previous):
+    started = datetime.now(timezone.utc)
+    since = (started - CLOCK_SKEW).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if previous and previous.get("url") == url and not snapshot_expired(previous, started):
+        change_filter = CHANGE_FILTERS.get(service)
+        key, records = page_records(previous["data"])
+        try:
+            if change_filter and key and all("id" in record for record in records):
+                changes_url = with_query(url, **{
+                    change_filter["param"]: change_filter["value"].format(since=previous["changed_at"])
+                })
+                changes = fetch_collection(changes_url, token, change_filter.get("headers"))
+                data = merge_changes(previous["data"], changes, change_filter.get("deletions", False))
+                return {**previous, "data": data, "changed_at": since, "mode": "changes-since"}
+            if previous.get("pages") == 1 and (previous.get("etag") or previous.get("last_modified")):
+                validators = {}
+                if previous.get("etag"):
+                    validators["If-None-Match"] = previous["etag"]
+                if previous.get("last_modified"):
+                    validators["If-Modified-Since"] = previous["last_modified"]
+                meta = {}
+                data = fetch_collection(url, token, validators=validators, meta=meta)
+                if meta.get("not_modified"):
+                    return {**previous, "changed_at": since, "mode": "not-modified"}
+                return full_entry(url, data, meta, started, since)
+        except FetchError as e:
+            if e.status_code != 400:
+                return {"url": url, "data": e.result, "mode": "error"}
+            print(f"⚠️ Incremental refresh not supported for {service}, falling back to a full re-sync")
+        except Exception as e:
+            print(f"⚠️ Exception occurred for {url}: {str(e)}")
+            return {"url": url, "data": {"error": str(e)}, "mode": "error"}
+    meta = {}
+    return full_entry(url, fetch_metadata(url, token, meta), meta, started, since)
+
+def timed_refresh(service, url, token, previous):
+    start = time.perf_counter()
+    entry = refresh_service(service, url, token, previous)
+    return entry, time.perf_counter() - start
+
+# Refresh every endpoint concurrently from the snapshot; returns {service: snapshot entry} and the seconds each took
+def collect_metadata(endpoints, token, snapshot=None):
+    previous = (snapshot or {}).get("services", {})
+    entries, timings = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(METADATA_WORKERS, len(endpoints)))) as executor:
+        futures = {
+            executor.submit(timed_refresh, service, url, token, previous.get(service)): service
+            for service, url in endpoints.items()
+        }
+        for future in as_completed(futures):
+            service = futures[future]
+            entries[service], timings[service] = future.result()
+    # Keep the order the endpoints were defined in
+    return {service: entries[service] for service in endpoints}, timings
+
+def print_timings(timings, wall_time, entries):
+    print(f"Collected {len(timings)} endpoints in {wall_time:.2f}s "
+          f"(sum of requests {sum(timings.values()):.2f}s)")
+    for service, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {service:<24} {elapsed * 1000:8.1f} ms  {entries[service]['mode']}")
+
+# Added, changed and removed record ids between two responses of one service
+def diff_records(old, new):
+    old_key, old_records = page_records(old)
+    new_key, new_records = page_records(new)
+    if old_key and old_key == new_key and all("id" in r for r in old_records + new_records):
+        before = {record["id"]: record for record in old_records}
+        after = {record["id"]: record for record in new_records}
+        return {
+            "added": [i for i in after if i not in before],
+            "changed": [i for i in after if i in before and after[i] != before[i]],
+            "removed": [i for i in before if i not in after],
+        }
+    # Responses that are not lists of records only tell us whether anything changed
+    return {"added": [], "changed": [] if old == new else ["*"], "removed": []}
+
+# Diff of every service refreshed without error that was already in the snapshot
+def inventory_diff(snapshot, entries):
+    previous = snapshot.get("services", {})
+    diff = {}
+    for service, entry in entries.items():
+        if entry["mode"] == "error" or service not in previous:
+            continue
+        changes = diff_records(previous[service]["data"], entry["data"])
+        if any(changes.values()):
+            diff[service] = changes
+    return diff
+
+def print_diff(diff, snapshot):
+    if not snapshot:
+        print("No previous inventory snapshot, fetched everything")
+        return
+    if not diff:
+        print("Inventory unchanged since the previous snapshot")
+        return
+    print("Inventory changes since the previous snapshot:")
+    for service, changes in diff.items():
+        sample = ", ".join((changes["added"] + changes["changed"] + changes["removed"])[:3])
+        print(f"  {service:<24} +{len(changes['added'])} ~{len(changes['changed'])} "
+              f"-{len(changes['removed'])}  {sample}")
+
+# Metadata collection points; pure, so the section list can be built before authenticating
+def build_endpoints(service_endpoints, project_id):
+    # Merge known endpoints with dynamically retrieved ones
+    all_endpoints = {**KNOWN_ENDPOINTS, **service_endpoints}
+
+    # Define metadata collection points
+    metadata_endpoints = {
+        "compute_servers": f"{all_endpoints.get('compute', '')}/servers/detail",  # Detailed, so status, flavor and image are present
+        "images": f"{all_endpoints.get('image', '')}/v2/images?owner={project_id}",  # Scope to project
+        "networks": f"{all_endpoints.get('network', '')}/v2.0/networks?tenant_id={project_id}",  # Scope to project
+        "subnets": f"{all_endpoints.get('network', '')}/v2.0/subnets?tenant_id={project_id}",  # Scope to project
+        "security_groups": f"{all_endpoints.get('network', '')}/v2.0/security-groups?tenant_id={project_id}",  # Scope to project
+        "flavors": f"{all_endpoints.get('compute', '')}/flavors",  # Flavors are global, no project scope
+        "volume_types": f"{all_endpoints.get('volumev3', '')}/types",  # Volume types are global
+        "users": f"{all_endpoints.get('identity', '')}/users",  # Users are global
+        "keypairs": f"{all_endpoints.get('compute', '')}/os-keypairs",  # Keypairs are global
+        "ports": f"{all_endpoints.get('network', '')}/v2.0/ports",  # Ports are global
+        "hosts": f"{all_endpoints.get('compute', '')}/os-hosts",  # Hosts are global
+        "volume_image_metadata": f"{all_endpoints.get('volumev3', '')}/volumes",  # Volume image metadata
+        "server_groups": f"{all_endpoints.get('compute', '')}/os-server-groups",  # Server groups are global
+        "hypervisors": f"{all_endpoints.get('compute', '')}/os-hypervisors",  # Hypervisors are global
+        "backends": f"{all_endpoints.get('volumev3', '')}/backends",  # Backends are global
+        "projects": f"{all_endpoints.get('identity', '')}/projects",  # Projects are global
+        "host_configs": f"{all_endpoints.get('compute', '')}/os-host-configs",  # Host configs are global
+        "cluster_blueprints": f"{all_endpoints.get('cluster', '')}/v1/blueprints",  # Cluster blueprints are global
+    }
+
+    # Use hardcoded endpoints for specific resources if dynamic endpoints fail
+    collection_endpoints = {
+        "images": KNOWN_ENDPOINTS.get("image", "") + f"?owner={project_id}",
+        "networks": KNOWN_ENDPOINTS.get("network", "") + f"?tenant_id={project_id}",
+        "subnets": KNOWN_ENDPOINTS.get("subnet", "") + f"?tenant_id={project_id}",
+        "security_groups": KNOWN_ENDPOINTS.get("security_group", "") + f"?tenant_id={project_id}",
+        "flavors": KNOWN_ENDPOINTS.get("flavor", ""),
+        "volume_types": KNOWN_ENDPOINTS.get("volume_type", ""),
+        "users": KNOWN_ENDPOINTS.get("user", ""),
+        "keypairs": KNOWN_ENDPOINTS.get("keypair", ""),
+        "ports": KNOWN_ENDPOINTS.get("port", ""),
+        "hosts": KNOWN_ENDPOINTS.get("host", ""),
+        "volume_image_metadata": KNOWN_ENDPOINTS.get("volume_image_metadata", ""),
+        "server_groups": KNOWN_ENDPOINTS.get("server_group", ""),
+        "hypervisors": KNOWN_ENDPOINTS.get("hypervisor", ""),
+        "backends": KNOWN_ENDPOINTS.get("backend", ""),
+        "projects": KNOWN_ENDPOINTS.get("project", ""),
+        "host_configs": KNOWN_ENDPOINTS.get("host_config", ""),
+        "cluster_blueprints": KNOWN_ENDPOINTS.get("cluster_blueprint", ""),
+    }
+
+    # Fetch metadata for other services
+    for service, url in metadata_endpoints.items():
+        if service not in collection_endpoints and url:
+            collection_endpoints[service] = url
+    return collection_endpoints
+
+# Get authentication token and the collection endpoints for its project
+def connect():
+    token, token_response = get_token()
+    project_id = get_project_id(token_response)  # Extract project ID
+    service_endpoints = get_service_endpoints(token_response["token"]["catalog"])
+    all_endpoints = {**KNOWN_ENDPOINTS, **service_endpoints}
+    print("Image URL:", all_endpoints.get('image', ''))
+    print("Network URL:", all_endpoints.get('network', ''))
+    return token, token_response, build_endpoints(service_endpoints, project_id)
+
+def section_title(service):
+    return service.replace('_', ' ').title()
+
+# One-shot crawl: refresh the snapshot, print the timings and the diff, then exit;
+# store_path also writes the indexed SQLite store queried by inventory_store.py
+def collect_once(store_path=None):
+    token, _, endpoints = connect()
+    previous_snapshot = read_snapshot()
+    collection_start = time.perf_counter()
+    inventory, fetch_timings = collect_metadata(endpoints, token, previous_snapshot)
+    print_timings(fetch_timings, time.perf_counter() - collection_start, inventory)
+    print_diff(inventory_diff(previous_snapshot, inventory), previous_snapshot)
+    save_snapshot(previous_snapshot, inventory)
+
+    print("Fetched Metadata:")
+    for service, entry in inventory.items():
+        print(f"{section_title(service)} Metadata:", summarize(entry["data"]))
+    if store_path:
+        InventoryStore.from_entries(inventory).save(store_path)
+
+class InventoryCache:
+    """Inventory behind the dashboard, refreshed per section in the background
+
+    Sections start from the on-disk snapshot and keep serving their last good
+    response while a refresh runs or after one fails, so a slow or broken
+    service never blocks the page. Authentication and endpoint discovery
+    happen on the first refresh, not at startup.
+    """
+
+    def __init__(self, services, interval=METADATA_REFRESH_INTERVAL):
+        self.services = services
+        self.interval = interval
+        self.entries = dict(read_snapshot().get("services", {}))
+        self.status = {
+            service: {"refreshed_at": None, "latency": None, "mode": None, "error": None,
+                      "refreshing": False, "version": 0}
+            for service in services
+        }
+        self.endpoints = None
+        self._token_response = None
+        self._token = None
+        self._auth_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=METADATA_WORKERS, thread_name_prefix="inventory-refresh")
+        self._thread = None
+
+    def start(self):
+        """Start the background refresh schedule; safe to call repeatedly"""
+        with self._lock:
+            if self._thread is None and self.interval > 0:
+                self._thread = threading.Thread(target=self._run, name="inventory-scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.refresh_all()
+            time.sleep(self.interval)
+
+    def _current_token(self):
+        # One authentication shared by every section until the token nears expiry
+        with self._auth_lock:
+            if self._token_response is None or token_expiring(self._token_response):
+                if self.endpoints is None:
+                    self._token, self._token_response, self.endpoints = connect()
+                else:
+                    self._token, self._token_response = get_token()
+            return self._token
+
+    def refresh(self, service, save=True):
+        """Queue a refresh of one section; returns None if one is already running"""
+        with self._lock:
+            if self.status[service]["refreshing"]:
+                return None
+            self.status[service]["refreshing"] = True
+        return self._executor.submit(self._refresh, service, save)
+
+    def refresh_all(self):
+        wait([future for future in (self.refresh(service, save=False) for service in self.services) if future])
+        self.save()
+
+    def _refresh(self, service, save):
+        try:
+            token = self._current_token()
+            entry, latency = timed_refresh(service, self.endpoints[service], token, self.entries.get(service))
+        except Exception as e:
+            print(f"⚠️ Refresh of {service} failed: {str(e)}")
+            entry, latency = {"url": None, "data": {"error": str(e)}, "mode": "error"}, None
+        with self._lock:
+            status = self.status[service]
+            status.update(refreshing=False, refreshed_at=datetime.now(), latency=latency, mode=entry["mode"])
+            if entry["mode"] == "error":
+                status["error"] = entry["data"]["error"]
+                if service in self.entries:
+                    return  # Keep serving the last good response
+            else:
+                status["error"] = None
+            self.entries[service] = entry
+            status["version"] += 1
+        if save:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            entries = dict(self.entries)
+        with self._save_lock:
+            save_snapshot({}, entries)
+
+    def entry(self, service):
+        with self._lock:
+            return self.entries.get(service)
+
+    def version(self, service):
+        with self._lock:
+            return self.status[service]["version"]
+
+    def describe(self, service):
+        """One line for the section header: when it was refreshed, how long that took, and what is running"""
+        with self._lock:
+            status, entry = dict(self.status[service]), self.entries.get(service)
+        if status["refreshed_at"] is not None:
+            parts = [f"refreshed {status['refreshed_at']:%H:%M:%S}"]
+            if status["latency"] is not None:
+                parts.append(f"{status['latency'] * 1000:.0f} ms, {status['mode']}")
+        elif entry is not None:
+            parts = [f"cached from {datetime.fromisoformat(entry['synced_at']).astimezone():%Y-%m-%d %H:%M:%S}"]
+        else:
+            parts = ["not loaded"]
+        if status["error"]:
+            parts.append(f"last refresh failed: {status['error']}")
+        if status["refreshing"]:
+            parts.append("refreshing…")
+        return " · ".join(parts)
 
 # Format metadata for better readability
 def format_json(data):
     return json.dumps(data, indent=4, sort_keys=True)
 
-# Dash App for Displaying Metadata
+# Records of a section as table rows; a response that is not a list becomes a single row
+def section_records(data):
+    key, records = page_records(data)
+    if key is None:
+        return [data]
+    return [record if isinstance(record, dict) else {"value": record} for record in records]
+
+# Table cell for a value; nested objects are summarised and expanded on click
+def cell_value(value):
+    if isinstance(value, dict):
+        return f"{{{len(value)} keys}}"
+    if isinstance(value, list):
+        return f"[{len(value)} items]"
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    return value
+
+def sort_key(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    if value is None:
+        return (2, 0, "")
+    return (1, 0, str(value))
+
+# Columns offered for a section, sampled from the first records so huge collections stay cheap
+def available_columns(records, sample=200):
+    columns = {}
+    for record in records[:sample]:
+        columns.update(dict.fromkeys(record))
+    preferred = [column for column in DEFAULT_COLUMNS if column in columns]
+    return preferred + sorted(column for column in columns if column not in preferred)
+
+# Last filtered and sorted row order per section, reused while only the page changes
+query_cache = {}
+
+def query_rows(service, version, records, columns, text, sort_by):
+    key = (version, tuple(columns), text, json.dumps(sort_by, sort_keys=True))
+    cached = query_cache.get(service)
+    if cached and cached[0] == key:
+        return cached[1]
+    indexes = range(len(records))
+    if text:
+        needle = text.lower()
+        indexes = [i for i in indexes if any(needle in str(records[i].get(column, "")).lower() for column in columns)]
+    for sort in reversed(sort_by or []):
+        indexes = sorted(indexes, key=lambda i: sort_key(records[i].get(sort["column_id"])),
+                         reverse=sort["direction"] == "desc")
+    indexes = list(indexes)
+    query_cache[service] = (key, indexes)
+    return indexes
+
+SERVICES = list(build_endpoints({}, None))
+inventory = InventoryCache(SERVICES)
+
+def section_id(kind, service):
+    return {"type": kind, "service": service}
+
+# Dash App for Displaying Metadata; tables are paged, sorted and filtered on the server, and only while open
 app = dash.Dash(__name__)
 
 app.layout = html.Div([
     html.H1("OpenStack Services Metadata"),
-    *[html.Div([
-        html.H2(service.replace('_', ' ').title()),
-        html.Pre(format_json(data))  # Pretty-print JSON data
-    ]) for service, data in metadata.items() if data]  # Only display services with data
+    dcc.Interval(id="status-interval", interval=DASHBOARD_POLL_INTERVAL * 1000),
+    *[html.Details([
+        html.Summary([
+            html.H2(section_title(service), style={"display": "inline"}),
+            " ",
+            html.Span(id=section_id("section-status", service))
+        ]),
+        html.Button("Refresh", id=section_id("section-refresh", service)),
+        dcc.Store(id=section_id("section-version", service)),
+        html.Div([
+            dcc.Input(id=section_id("section-filter", service), type="search", debounce=True,
+                      placeholder="Filter rows"),
+            dcc.Dropdown(id=section_id("section-columns", service), multi=True, placeholder="Columns")
+        ]),
+        html.P(id=section_id("section-message", service)),
+        dash_table.DataTable(
+            id=section_id("section-table", service),
+            columns=[], data=[],
+            page_action="custom", page_current=0, page_size=TABLE_PAGE_SIZE,
+            sort_action="custom", sort_mode="single", sort_by=[],
+            style_table={"overflowX": "auto"},
+            style_cell={"textAlign": "left", "maxWidth": "320px", "overflow": "hidden", "textOverflow": "ellipsis"}
+        ),
+        html.Pre(id=section_id("section-detail", service))
+    ], id=section_id("section", service)) for service in SERVICES]
 ])
 
+@app.callback(
+    Output({"type": "section-status", "service": ALL}, "children"),
+    Output({"type": "section-version", "service": ALL}, "data"),
+    Input("status-interval", "n_intervals"),
+    Input({"type": "section-refresh", "service": ALL}, "n_clicks"),
+    State({"type": "section-version", "service": ALL}, "data")
+)
+def update_status(n_intervals, clicks, versions):
+    inventory.start()
+    if isinstance(ctx.triggered_id, dict):  # A section's Refresh button
+        inventory.refresh(ctx.triggered_id["service"])
+    current = [inventory.version(service) for service in SERVICES]
+    # Only sections whose data changed re-render their table
+    return (
+        [inventory.describe(service) for service in SERVICES],
+        [version if version != seen else no_update for version, seen in zip(current, versions)]
+    )
+
+@app.callback(
+    Output({"type": "section-table", "service": MATCH}, "data"),
+    Output({"type": "section-table", "service": MATCH}, "columns"),
+    Output({"type": "section-table", "service": MATCH}, "page_count"),
+    Output({"type": "section-columns", "service": MATCH}, "options"),
+    Output({"type": "section-columns", "service": MATCH}, "value"),
+    Output({"type": "section-message", "service": MATCH}, "children"),
+    Input({"type": "section", "service": MATCH}, "open"),
+    Input({"type": "section-version", "service": MATCH}, "data"),
+    Input({"type": "section-table", "service": MATCH}, "page_current"),
+    Input({"type": "section-table", "service": MATCH}, "page_size"),
+    Input({"type": "section-table", "service": MATCH}, "sort_by"),
+    Input({"type": "section-filter", "service": MATCH}, "value"),
+    Input({"type": "section-columns", "service": MATCH}, "value"),
+    State({"type": "section", "service": MATCH}, "id")
+)
+def render_table(is_open, version, page_current, page_size, sort_by, text, columns, table_id):
+    if not is_open:
+        return [], [], 0, no_update, no_update, None
+    service = table_id["service"]
+    entry = inventory.entry(service)
+    if entry is None:
+        inventory.refresh(service)  # Load on demand the first time the section is opened
+        return [], [], 0, [], no_update, "Loading…"
+    if "error" in entry["data"]:
+        return [], [], 0, [], no_update, f"⚠️ {entry['data']['error']}"
+
+    records = section_records(entry["data"])
+    options = available_columns(records)
+    if not columns:
+        columns = options[:8]
+    indexes = query_rows(service, version, records, columns, text, sort_by)
+    page_size = page_size or TABLE_PAGE_SIZE
+    page_current = min(page_current or 0, max((len(indexes) - 1) // page_size, 0))
+    # Only the visible page goes to the browser; _index points back at the full record for the detail view
+    rows = [
+        {"_index": i, **{column: cell_value(records[i].get(column)) for column in columns}}
+        for i in indexes[page_current * page_size:(page_current + 1) * page_size]
+    ]
+    message = f"{len(indexes)} of {len(records)} rows" + (" match the filter" if text else "")
+    return (
+        rows,
+        [{"name": column, "id": column} for column in columns],
+        max(-(-len(indexes) // page_size), 1),
+        options,
+        columns,
+        message
+    )
+
+@app.callback(
+    Output({"type": "section-detail", "service": MATCH}, "children"),
+    Input({"type": "section-table", "service": MATCH}, "active_cell"),
+    State({"type": "section-table", "service": MATCH}, "data"),
+    State({"type": "section", "service": MATCH}, "id")
+)
+def show_detail(active_cell, rows, table_id):
+    if not active_cell or not rows or active_cell["row"] >= len(rows):
+        return None
+    entry = inventory.entry(table_id["service"])
+    records = section_records(entry["data"]) if entry else []
+    index = rows[active_cell["row"]]["_index"]
+    if index >= len(records):
+        return None
+    record = records[index]
+    value = record.get(active_cell["column_id"])
+    # A nested cell expands to its own JSON; any other cell shows the whole record
+    return format_json(value if isinstance(value, (dict, list)) else record)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="OpenStack services metadata dashboard")
+    parser.add_argument("--once", action="store_true",
+                        help="Refresh the inventory snapshot once, print the changes and exit")
+    parser.add_argument("--store", metavar="PATH",
+                        help="With --once, also save the inventory as an indexed SQLite store (see inventory_store.py)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    args = parse_args()
+    if args.once:
+        collect_once(args.store)
+    else:
+        app.run(debug=True)
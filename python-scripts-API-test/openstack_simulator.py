@@ -0,0 +1,987 @@
+"""Local OpenStack API simulator for offline benchmarking
+
+Serves the Keystone, Nova, Neutron, Glance and Cinder calls made by
+Python-API-test.py, new.py and openstack-resource-creation.py, under the
+same path prefixes as a Platform9 region (/keystone/v3, /nova/v2.1,
+/neutron/v2.0, /glance/v2, /cinder/v3), so every script can target it
+unchanged apart from its environment:
+
+    python openstack_simulator.py --port 5000 --config sim.json
+
+    OS_AUTH_URL=http://127.0.0.1:5000/keystone/v3 OS_USERNAME=admin OS_PASSWORD=secret
+    OS_PROJECT_NAME=service OS_USER_DOMAIN_NAME=Default OS_PROJECT_DOMAIN_NAME=Default
+    KNOWN_ENDPOINTS_HOST=http://127.0.0.1:5000   # new.py's hardcoded endpoints
+
+Each service gets a latency distribution, an error rate and a token-bucket
+rate limit (429 with Retry-After); servers walk through BUILD task states,
+bind a Neutron port and record instance actions. Successful GETs carry an
+ETag and honour If-None-Match with a 304. GET /_sim/stats reports
+what was served, so a run's client-side numbers can be compared against it.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import uuid
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Latencies are in milliseconds, server transitions in seconds; see sample()
+DEFAULT_CONFIG = {
+    "services": {
+        "identity": {"latency": {"dist": "lognormal", "median": 30, "sigma": 0.4}},
+        "compute": {"latency": {"dist": "lognormal", "median": 80, "sigma": 0.5}},
+        "network": {"latency": {"dist": "lognormal", "median": 50, "sigma": 0.5}},
+        "image": {"latency": {"dist": "lognormal", "median": 40, "sigma": 0.4}},
+        "block-storage": {"latency": {"dist": "lognormal", "median": 40, "sigma": 0.4}},
+        "load-balancer": {"latency": {"dist": "fixed", "value": 20}},
+        "cluster": {"latency": {"dist": "fixed", "value": 20}}
+    },
+    # Per route overrides, e.g. {"create_server": {"latency": {...}, "error_rate": 0.05}}
+    "operations": {},
+    "error_rate": 0.0,  # Fraction of requests answered with 503
+    "rate_limit": 0,  # Requests/sec per service, 0 disables
+    "burst": 20,  # Token bucket depth
+    "token_ttl": 3600,  # seconds
+    "server": {
+        "scheduling": {"dist": "lognormal", "median": 1.0, "sigma": 0.3},
+        "networking": {"dist": "lognormal", "median": 2.0, "sigma": 0.3},
+        "spawning": {"dist": "lognormal", "median": 5.0, "sigma": 0.4},
+        "stop": {"dist": "lognormal", "median": 2.0, "sigma": 0.3},
+        "start": {"dist": "lognormal", "median": 3.0, "sigma": 0.3},
+        "delete": {"dist": "lognormal", "median": 2.0, "sigma": 0.3}
+    },
+    "deleted_retention": 600,  # seconds deleted servers stay visible to changes-since
+    "compute_microversion": "2.96",  # Highest Nova microversion advertised; boot requests take tags from 2.52
+    "ignore_tag_filters": False,  # Answer tags= queries unfiltered, as Nova before 2.26 or Neutron without standard-attr-tag
+    "images": ["cirros", "ubuntu-22.04"],
+    "flavors": [
+        {"name": "m1.tiny", "ram": 512, "vcpus": 1, "disk": 1},
+        {"name": "m1.small", "ram": 2048, "vcpus": 1, "disk": 20},
+        {"name": "m1.medium", "ram": 4096, "vcpus": 2, "disk": 40}
+    ]
+}
+
+
+def sample(spec):
+    """Draw one value from a {"dist": ...} spec
+
+    fixed: value; uniform: min, max; normal: mean, stddev;
+    lognormal: median, sigma; exponential: mean.
+    """
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        return spec.get("value", 0)
+    if dist == "uniform":
+        return random.uniform(spec["min"], spec["max"])
+    if dist == "normal":
+        return max(random.gauss(spec["mean"], spec["stddev"]), 0)
+    if dist == "lognormal":
+        return random.lognormvariate(0, spec["sigma"]) * spec["median"]
+    if dist == "exponential":
+        return random.expovariate(1 / spec["mean"])
+    raise ValueError(f"Unknown distribution {dist}")
+
+def merge_config(base, override):
+    """Recursively overlay a user config on the defaults"""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def iso(timestamp, zulu=True):
+    """Resource timestamps are whole seconds with a Z; instance action times carry microseconds"""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ") if zulu else moment.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+def parse_iso(value):
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate 0 never limits"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        if not self.rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class SimulatedCloud:
+    """In-memory state of one project's resources
+
+    Server state is a schedule of (at, status, task_state) steps fixed when
+    an action is requested and read lazily, so no background threads are
+    needed however many servers are building.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.project_id = uuid.uuid4().hex
+        self.user_id = uuid.uuid4().hex
+        self.tokens = {}  # {token: expires_at}
+        self.collections = {name: {} for name in (
+            "servers", "flavors", "images", "networks", "subnets", "security-groups",
+            "security-group-rules", "ports", "routers", "volumes", "types", "projects", "users"
+        )}
+        self.stats = {"requests": 0, "by_route": {}, "by_status": {}, "rate_limited": 0, "injected_errors": 0}
+        self._lock = threading.RLock()
+        now = time.time()
+        for name in config["images"]:
+            self.add("images", {"name": name, "status": "active", "visibility": "public", "disk_format": "qcow2",
+                                "container_format": "bare", "min_disk": 0, "min_ram": 0, "size": 16338944,
+                                "owner": self.project_id, "tags": [], "created_at": iso(now), "updated_at": iso(now)})
+        for flavor in config["flavors"]:
+            self.add("flavors", dict(flavor, **{"OS-FLV-EXT-DATA:ephemeral": 0, "swap": 0, "rxtx_factor": 1.0,
+                                                "os-flavor-access:is_public": True, "description": None}))
+        self.add("types", {"name": "__DEFAULT__", "description": "Default Volume Type", "is_public": True})
+        self.add("projects", {"id": self.project_id, "name": "service", "domain_id": "default", "enabled": True})
+        self.add("users", {"id": self.user_id, "name": "admin", "domain_id": "default", "enabled": True})
+        self.add("security-groups", {"name": "default", "description": "Default security group",
+                                     "security_group_rules": [], "project_id": self.project_id,
+                                     "tenant_id": self.project_id})
+
+    def add(self, collection, resource):
+        with self._lock:
+            resource.setdefault("id", str(uuid.uuid4()))
+            self.collections[collection][resource["id"]] = resource
+            return resource
+
+    def get(self, collection, resource_id):
+        resource = self.collections[collection].get(resource_id)
+        if resource is None or (collection == "servers" and self.server_view(resource)["status"] == "DELETED"):
+            raise ApiError(404, f"{collection} {resource_id} could not be found")
+        return resource
+
+    def delete(self, collection, resource_id):
+        with self._lock:
+            self.get(collection, resource_id)
+            del self.collections[collection][resource_id]
+
+    # Tokens
+
+    def issue_token(self, base_url):
+        token = uuid.uuid4().hex
+        expires = time.time() + self.config["token_ttl"]
+        with self._lock:
+            self.tokens[token] = expires
+        project = {"id": self.project_id, "name": "service", "domain": {"id": "default", "name": "Default"}}
+        return token, {"token": {
+            "methods": ["password"],
+            "expires_at": iso(expires),
+            "issued_at": iso(time.time()),
+            "user": {"id": self.user_id, "name": "admin", "domain": {"id": "default", "name": "Default"}},
+            "project": project,
+            "roles": [{"id": uuid.uuid4().hex, "name": "admin"}, {"id": uuid.uuid4().hex, "name": "member"}],
+            "catalog": self.catalog(base_url)
+        }}
+
+    def check_token(self, token):
+        expires = self.tokens.get(token)
+        if expires is None or expires < time.time():
+            raise ApiError(401, "The request you have made requires authentication.")
+
+    def catalog(self, base_url):
+        services = [
+            ("identity", "keystone", f"{base_url}/keystone/v3"),
+            ("compute", "nova", f"{base_url}/nova/v2.1"),
+            ("network", "neutron", f"{base_url}/neutron"),
+            ("image", "glance", f"{base_url}/glance"),
+            ("volumev3", "cinderv3", f"{base_url}/cinder/v3/{self.project_id}"),
+            ("block-storage", "cinder", f"{base_url}/cinder/v3/{self.project_id}"),
+            ("load-balancer", "octavia", f"{base_url}/octavia"),
+            ("cluster", "cluster", f"{base_url}/cluster")
+        ]
+        return [
+            {"type": service_type, "name": name, "id": uuid.uuid4().hex, "endpoints": [
+                {"id": uuid.uuid4().hex, "interface": interface, "region": "region1", "region_id": "region1", "url": url}
+                for interface in ("public", "internal", "admin")
+            ]} for service_type, name, url in services
+        ]
+
+    # Servers
+
+    def schedule(self, server, steps):
+        """Append (duration key, status, task_state) steps after the server's last scheduled step"""
+        at = max(server["schedule"][-1][0], time.time())
+        for duration, status, task_state in steps:
+            at += sample(self.config["server"][duration]) if duration else 0
+            server["schedule"].append((at, status, task_state))
+        return at
+
+    def server_view(self, server, now=None):
+        now = now or time.time()
+        current = server["schedule"][0]
+        for step in server["schedule"]:
+            if step[0] > now:
+                break
+            current = step
+        at, status, task_state = current
+        view = dict(server["fields"])
+        view.update({
+            "status": status,
+            "updated": iso(at),
+            "OS-EXT-STS:task_state": task_state,
+            "OS-EXT-STS:vm_state": status.lower() if status != "SHUTOFF" else "stopped",
+            "OS-EXT-STS:power_state": 1 if status == "ACTIVE" else 4 if status == "SHUTOFF" else 0
+        })
+        return view
+
+    def create_server(self, body):
+        request = body["server"]
+        now = time.time()
+        image = self.get("images", request.get("imageRef") or request.get("image_id"))
+        flavor = self.get("flavors", request.get("flavorRef") or request.get("flavor_id"))
+        server = {"id": str(uuid.uuid4()), "schedule": [(now, "BUILD", "scheduling")], "actions": []}
+        scheduled = self.schedule(server, [("scheduling", "BUILD", "networking")])
+        networked = self.schedule(server, [("networking", "BUILD", "spawning")])
+        active = self.schedule(server, [("spawning", "ACTIVE", None)])
+        server["fields"] = {
+            "id": server["id"],
+            "name": request["name"],
+            "image": {"id": image["id"]},
+            "flavor": {"id": flavor["id"], "original_name": flavor["name"]},
+            "tenant_id": self.project_id,
+            "user_id": self.user_id,
+            "created": iso(now),
+            "metadata": request.get("metadata", {}),
+            "tags": request.get("tags", []),
+            "addresses": {},
+            "security_groups": request.get("security_groups", [{"name": "default"}]),
+            "links": []
+        }
+        server["actions"].append(self.action("create", now, [
+            ("conductor_schedule_and_build_instances", now, scheduled),
+            ("compute__do_build_and_run_instance", scheduled, active)
+        ]))
+        with self._lock:
+            requested = [network for network in request.get("networks", []) if isinstance(network, dict)]
+            # Pre-created ports are bound as they are; Nova only deletes the ports it created itself
+            ports = [self.get("ports", network["port"]) for network in requested if "port" in network]
+            for port in ports:
+                if self.port_view(port, now)["device_id"]:
+                    raise ApiError(409, f"Port {port['id']} is still in use.")
+            self.collections["servers"][server["id"]] = server
+            for port in ports:
+                port.pop("released_at", None)
+                port.update(device_id=server["id"], device_owner="compute:nova", bound_at=networked)
+            for network in requested:
+                if "uuid" in network and "port" not in network:
+                    self.add("ports", dict(self.new_port(network["uuid"], device_id=server["id"],
+                                                         device_owner="compute:nova", bound_at=networked),
+                                           created_by_nova=True))
+        return server
+
+    def action(self, name, started, events):
+        return {
+            "action": name,
+            "request_id": f"req-{uuid.uuid4()}",
+            "start_time": started,
+            "events": [{"event": event, "start_time": start, "finish_time": finish} for event, start, finish in events]
+        }
+
+    def server_action(self, server, body):
+        now = time.time()
+        view = self.server_view(server, now)
+        if "os-stop" in body:
+            if view["status"] != "ACTIVE" or view["OS-EXT-STS:task_state"]:
+                raise ApiError(409, f"Cannot 'stop' instance {server['id']} while it is in vm_state {view['OS-EXT-STS:vm_state']}")
+            server["schedule"].append((now, "ACTIVE", "powering-off"))
+            done = self.schedule(server, [("stop", "SHUTOFF", None)])
+            server["actions"].append(self.action("stop", now, [("compute_stop_instance", now, done)]))
+        elif "os-start" in body:
+            if view["status"] != "SHUTOFF" or view["OS-EXT-STS:task_state"]:
+                raise ApiError(409, f"Cannot 'start' instance {server['id']} while it is in vm_state {view['OS-EXT-STS:vm_state']}")
+            server["schedule"].append((now, "SHUTOFF", "powering-on"))
+            done = self.schedule(server, [("start", "ACTIVE", None)])
+            server["actions"].append(self.action("start", now, [("compute_start_instance", now, done)]))
+        else:
+            raise ApiError(400, f"Unsupported server action {sorted(body)}")
+
+    def delete_server(self, server):
+        now = time.time()
+        status = self.server_view(server, now)["status"]
+        server["schedule"] = [step for step in server["schedule"] if step[0] <= now]
+        server["schedule"].append((now, status, "deleting"))
+        done = self.schedule(server, [("delete", "DELETED", None)])
+        server["actions"].append(self.action("delete", now, [("compute_terminate_instance", now, done)]))
+        with self._lock:
+            for port in list(self.collections["ports"].values()):
+                if port["device_id"] == server["id"]:
+                    port["deleted_at" if port.get("created_by_nova") else "released_at"] = done
+
+    def servers(self, query, now):
+        """Server views matching a list query; changes-since also returns recent deletions"""
+        changes_since = query.pop("changes-since", [None])[0] or query.pop("changes_since", [None])[0]
+        name = query.pop("name", [None])[0]
+        rows = []
+        retention = now - self.config["deleted_retention"]
+        with self._lock:
+            for server_id, server in list(self.collections["servers"].items()):
+                view = self.server_view(server, now)
+                if view["status"] == "DELETED":
+                    if parse_iso(view["updated"]) < retention:
+                        del self.collections["servers"][server_id]
+                        continue
+                    if changes_since is None:
+                        continue
+                if changes_since is not None and parse_iso(view["updated"]) < parse_iso(changes_since):
+                    continue
+                if name and not re.search(name, view["name"]):
+                    continue
+                rows.append(view)
+        return rows
+
+    # Neutron
+
+    def new_port(self, network_id, device_id="", device_owner="", bound_at=None):
+        now = time.time()
+        return {
+            "id": str(uuid.uuid4()),
+            "name": "",
+            "network_id": network_id,
+            "device_id": device_id,
+            "device_owner": device_owner,
+            "mac_address": "fa:16:3e:%02x:%02x:%02x" % tuple(random.randrange(256) for _ in range(3)),
+            "fixed_ips": [],
+            "admin_state_up": True,
+            "project_id": self.project_id,
+            "tenant_id": self.project_id,
+            "tags": [],
+            "created_at": iso(now),
+            "updated_at": iso(now),
+            "bound_at": bound_at if bound_at is not None else now
+        }
+
+    def port_view(self, port, now):
+        view = {key: value for key, value in port.items()
+                if key not in ("bound_at", "deleted_at", "released_at", "created_by_nova")}
+        view["status"] = "ACTIVE" if now >= port["bound_at"] else "DOWN"
+        if now >= port.get("released_at", now + 1):
+            view.update(device_id="", device_owner="", status="DOWN")
+        return view
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    """Routes one request: rate limit, injected error, latency, then the handler"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+    cloud = None  # Set by make_server
+    routes = []
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    @property
+    def base_url(self):
+        return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        for route_method, pattern, service, name, handler in self.routes:
+            match = pattern.fullmatch(path) if route_method == method or (method == "HEAD" and route_method == "GET") else None
+            if match:
+                break
+        else:
+            self.reply(404, {"error": {"message": f"No route for {method} {path}", "code": 404}})
+            return
+        cloud = self.cloud
+        operation = {**cloud.config["services"].get(service, {}), **cloud.config["operations"].get(name, {})}
+        with cloud._lock:
+            cloud.stats["requests"] += 1
+            cloud.stats["by_route"][name] = cloud.stats["by_route"].get(name, 0) + 1
+        try:
+            if not self.server.buckets[service].take():
+                cloud.stats["rate_limited"] += 1
+                raise ApiError(429, "Rate limit exceeded", {"Retry-After": "1"})
+            time.sleep(sample(operation.get("latency", {"dist": "fixed", "value": 0})) / 1000)
+            if random.random() < operation.get("error_rate", cloud.config["error_rate"]):
+                cloud.stats["injected_errors"] += 1
+                raise ApiError(503, "Service temporarily unavailable (injected)")
+            if name not in ("auth", "versions") and not name.endswith("_version") and service != "_sim":
+                cloud.check_token(self.headers.get("X-Auth-Token"))
+            body = json.loads(raw_body) if raw_body and "json" in self.headers.get("Content-Type", "json") else {}
+            query = parse_qs(url.query, keep_blank_values=True)
+            if cloud.config["ignore_tag_filters"]:
+                query = {key: values for key, values in query.items() if key not in TAG_FILTERS}
+            status, payload, headers = handler(self, body, query, *match.groups())
+        except ApiError as e:
+            status, headers = e.status, e.headers
+            payload = {"error": {"message": str(e), "code": e.status}} if service != "compute" else \
+                {"itemNotFound" if e.status == 404 else "computeFault": {"message": str(e), "code": e.status}}
+        except Exception as e:
+            logger.error(f"{method} {path} failed: {str(e)}")
+            status, payload, headers = 500, {"error": {"message": str(e), "code": 500}}, {}
+        if method in ("GET", "HEAD") and status == 200:
+            etag = f'"{hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()}"'
+            headers = {**headers, "ETag": etag}
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, None
+        with cloud._lock:
+            cloud.stats["by_status"][status] = cloud.stats["by_status"].get(status, 0) + 1
+        self.reply(status, payload, headers, head=method == "HEAD")
+
+    def reply(self, status, payload, headers=None, head=False):
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Openstack-Request-Id", f"req-{uuid.uuid4()}")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if data and not head:
+            self.wfile.write(data)
+
+
+def route(method, pattern, service, name):
+    def register(handler):
+        SimulatorHandler.routes.append((method, re.compile(pattern), service, name, handler))
+        return handler
+    return register
+
+def paginate(handler, rows, query, collection, style):
+    """Apply marker/limit paging; returns (rows, links payload)"""
+    marker = query.get("marker", [None])[0]
+    limit = int(query.get("limit", [0])[0] or 0)
+    if marker:
+        ids = [row["id"] for row in rows]
+        rows = rows[ids.index(marker) + 1:] if marker in ids else []
+    if not limit or len(rows) <= limit:
+        return rows, {}
+    rows = rows[:limit]
+    params = {key: values for key, values in query.items() if key != "marker"}
+    params["marker"] = [rows[-1]["id"]]
+    url = f"{urlsplit(handler.path).path}?{urlencode(params, doseq=True)}"
+    if style == "glance":
+        return rows, {"next": url}
+    return rows, {f"{collection}_links": [{"rel": "next", "href": f"{handler.base_url}{url}"}]}
+
+TAG_FILTERS = {
+    "tags": lambda tags, wanted: wanted <= tags,
+    "tags-any": lambda tags, wanted: bool(wanted & tags),
+    "not-tags": lambda tags, wanted: not wanted <= tags,
+    "not-tags-any": lambda tags, wanted: not wanted & tags
+}
+
+def filter_rows(rows, query, ignore=()):
+    """Exact-match filtering on any field; repeated parameters match any of their values
+
+    Tag filters take a comma separated list, as in Nova and Neutron.
+    """
+    reserved = {"limit", "marker", "sort_key", "sort_dir", "fields", "all_tenants", "owner", "tenant_id",
+                "project_id", "is_public", "visibility", *ignore}
+    for key, values in query.items():
+        if key in reserved:
+            continue
+        if key in TAG_FILTERS:
+            wanted = {tag for value in values for tag in value.split(",") if tag}
+            rows = [row for row in rows if TAG_FILTERS[key](set(row.get("tags", [])), wanted)]
+            continue
+        rows = [row for row in rows if str(row.get(key)) in values or
+                (isinstance(row.get(key), bool) and str(row.get(key)).lower() in values)]
+    return rows
+
+def sort_rows(rows, query):
+    key = query.get("sort_key", [None])[0]
+    if key:
+        rows = sorted(rows, key=lambda row: (row.get(key) is None, row.get(key)),
+                      reverse=query.get("sort_dir", ["asc"])[0] == "desc")
+    return rows
+
+def requested_microversion(handler, service):
+    """(major, minor) a request asked for; the minimum when it sent no version header"""
+    header = handler.headers.get("OpenStack-API-Version") or ""
+    name, _, version = header.partition(" ")
+    if name != service or not version:
+        version = handler.headers.get("X-OpenStack-Nova-API-Version", "2.1") if service == "compute" else "2.1"
+    if version == "latest":
+        version = handler.cloud.config["compute_microversion"]
+    major, _, minor = version.partition(".")
+    return int(major), int(minor or 0)
+
+def version_document(handler, service_prefix, versions, keystone=False, status=200):
+    values = [
+        {"id": version_id, "status": "CURRENT", "min_version": minimum, "version": maximum,
+         "updated": "2024-01-01T00:00:00Z",
+         "links": [{"rel": "self", "href": f"{handler.base_url}/{service_prefix}/{path}/"}],
+         "media-types": [{"base": "application/json", "type": "application/json"}]}
+        for version_id, path, minimum, maximum in versions
+    ]
+    if keystone:
+        values[0]["status"] = "stable"
+        return status, {"versions": {"values": values}}, {}
+    return status, {"versions": values}, {}
+
+# Version discovery
+
+@route("GET", r"/keystone", "identity", "versions")
+def keystone_versions(handler, body, query):
+    return version_document(handler, "keystone", [("v3.14", "v3", "", "")], keystone=True, status=300)
+
+@route("GET", r"/keystone/v3", "identity", "identity_version")
+def keystone_version(handler, body, query):
+    return 200, {"version": {"id": "v3.14", "status": "stable", "updated": "2024-01-01T00:00:00Z",
+                             "links": [{"rel": "self", "href": f"{handler.base_url}/keystone/v3/"}],
+                             "media-types": [{"base": "application/json", "type": "application/vnd.openstack.identity-v3+json"}]}}, {}
+
+@route("GET", r"/nova", "compute", "versions")
+def nova_versions(handler, body, query):
+    return version_document(handler, "nova", [("v2.1", "v2.1", "2.1", handler.cloud.config["compute_microversion"])])
+
+@route("GET", r"/nova/v2\.1", "compute", "compute_version")
+def nova_version(handler, body, query):
+    return 200, {"version": nova_versions(handler, body, query)[1]["versions"][0]}, {}
+
+@route("GET", r"/neutron", "network", "versions")
+def neutron_versions(handler, body, query):
+    return version_document(handler, "neutron", [("v2.0", "v2.0", "", "")])
+
+@route("GET", r"/neutron/v2\.0", "network", "network_version")
+def neutron_version(handler, body, query):
+    return 200, {"resources": [{"name": name, "collection": name, "links": []} for name in
+                               ("network", "subnet", "port", "router", "security-group")]}, {}
+
+@route("GET", r"/neutron/v2\.0/extensions", "network", "list_extensions")
+def neutron_extensions(handler, body, query):
+    return 200, {"extensions": [{"alias": alias, "name": alias, "description": "", "links": [], "updated": ""}
+                                for alias in ("router", "security-group", "standard-attr-tag", "external-net")]}, {}
+
+@route("GET", r"/glance", "image", "versions")
+def glance_versions(handler, body, query):
+    return version_document(handler, "glance", [("v2.16", "v2", "", "")], status=300)
+
+@route("GET", r"/cinder", "block-storage", "versions")
+def cinder_versions(handler, body, query):
+    return version_document(handler, "cinder", [("v3.0", "v3", "3.0", "3.70")], status=300)
+
+@route("GET", r"/cinder/v3(?:/[0-9a-f]{32})?", "block-storage", "block_storage_version")
+def cinder_version(handler, body, query):
+    return 200, {"version": version_document(handler, "cinder", [("v3.0", "v3", "3.0", "3.70")])[1]["versions"][0]}, {}
+
+@route("GET", r"/octavia", "load-balancer", "versions")
+def octavia_versions(handler, body, query):
+    return version_document(handler, "octavia", [("v2.0", "v2.0", "", "")])
+
+# Keystone
+
+@route("POST", r"/keystone/v3/auth/tokens", "identity", "auth")
+def create_token(handler, body, query):
+    password = body.get("auth", {}).get("identity", {}).get("password", {}).get("user", {})
+    if not password.get("name") or not password.get("password"):
+        raise ApiError(401, "The request you have made requires authentication.")
+    token, payload = handler.cloud.issue_token(handler.base_url)
+    return 201, payload, {"X-Subject-Token": token}
+
+@route("GET", r"/keystone/v3/auth/tokens", "identity", "validate_token")
+def validate_token(handler, body, query):
+    subject = handler.headers.get("X-Subject-Token")
+    handler.cloud.check_token(subject)
+    return 200, {"token": {"expires_at": iso(handler.cloud.tokens[subject])}}, {"X-Subject-Token": subject}
+
+@route("GET", r"/keystone/v3/(users|projects)", "identity", "list_identity")
+def list_identity(handler, body, query, collection):
+    rows = filter_rows(list(handler.cloud.collections[collection].values()), query)
+    return 200, {collection: rows, "links": {"self": None, "next": None, "previous": None}}, {}
+
+@route("POST", r"/keystone/v3/projects", "identity", "create_project")
+def create_project(handler, body, query):
+    project = handler.cloud.add("projects", dict(body["project"], enabled=True))
+    return 201, {"project": project}, {}
+
+# Nova
+
+@route("GET", r"/nova/v2\.1/servers(/detail)?", "compute", "list_servers")
+def list_servers(handler, body, query, detail):
+    now = time.time()
+    rows = filter_rows(handler.cloud.servers(query, now), query, ignore={"deleted"})
+    rows, links = paginate(handler, sort_rows(rows, query), query, "servers", "nova")
+    if not detail:
+        rows = [{"id": row["id"], "name": row["name"], "links": row["links"]} for row in rows]
+    return 200, {"servers": rows, **links}, {}
+
+@route("POST", r"/nova/v2\.1/servers", "compute", "create_server")
+def create_server(handler, body, query):
+    if "tags" in body["server"] and requested_microversion(handler, "compute") < (2, 52):
+        raise ApiError(400, "Invalid input for field/attribute server. "
+                            "Additional properties are not allowed ('tags' was unexpected)")
+    server = handler.cloud.create_server(body)
+    return 202, {"server": {"id": server["id"], "links": [], "adminPass": uuid.uuid4().hex[:12],
+                            "security_groups": server["fields"]["security_groups"]}}, {}
+
+@route("GET", r"/nova/v2\.1/servers/([^/]+)", "compute", "get_server")
+def get_server(handler, body, query, server_id):
+    return 200, {"server": handler.cloud.server_view(handler.cloud.get("servers", server_id))}, {}
+
+@route("PUT", r"/nova/v2\.1/servers/([^/]+)/tags", "compute", "set_server_tags")
+def set_server_tags(handler, body, query, server_id):
+    server = handler.cloud.get("servers", server_id)
+    server["fields"]["tags"] = list(body["tags"])
+    return 200, {"tags": server["fields"]["tags"]}, {}
+
+@route("DELETE", r"/nova/v2\.1/servers/([^/]+)", "compute", "delete_server")
+def delete_server(handler, body, query, server_id):
+    handler.cloud.delete_server(handler.cloud.get("servers", server_id))
+    return 204, None, {}
+
+@route("POST", r"/nova/v2\.1/servers/([^/]+)/action", "compute", "server_action")
+def server_action(handler, body, query, server_id):
+    handler.cloud.server_action(handler.cloud.get("servers", server_id), body)
+    return 202, None, {}
+
+@route("GET", r"/nova/v2\.1/servers/([^/]+)/os-instance-actions", "compute", "list_server_actions")
+def list_server_actions(handler, body, query, server_id):
+    server = handler.cloud.collections["servers"].get(server_id)
+    if server is None:
+        raise ApiError(404, f"Instance {server_id} could not be found")
+    return 200, {"instanceActions": [
+        {"action": action["action"], "request_id": action["request_id"], "instance_uuid": server_id,
+         "user_id": handler.cloud.user_id, "project_id": handler.cloud.project_id,
+         "start_time": iso(action["start_time"], zulu=False), "message": None}
+        for action in reversed(server["actions"])
+    ]}, {}
+
+@route("GET", r"/nova/v2\.1/servers/([^/]+)/os-instance-actions/([^/]+)", "compute", "get_server_action")
+def get_server_action(handler, body, query, server_id, request_id):
+    server = handler.cloud.collections["servers"].get(server_id)
+    action = next((action for action in (server or {}).get("actions", []) if action["request_id"] == request_id), None)
+    if action is None:
+        raise ApiError(404, f"Action {request_id} not found")
+    now = time.time()
+    return 200, {"instanceAction": {
+        "action": action["action"], "request_id": request_id, "instance_uuid": server_id,
+        "user_id": handler.cloud.user_id, "project_id": handler.cloud.project_id,
+        "start_time": iso(action["start_time"], zulu=False), "message": None,
+        "events": [
+            {"event": event["event"], "start_time": iso(event["start_time"], zulu=False),
+             "finish_time": iso(event["finish_time"], zulu=False) if event["finish_time"] <= now else None,
+             "result": "Success" if event["finish_time"] <= now else None}
+            for event in action["events"] if event["start_time"] <= now
+        ]
+    }}, {}
+
+@route("GET", r"/nova/v2\.1/flavors(/detail)?", "compute", "list_flavors")
+def list_flavors(handler, body, query, detail):
+    rows = sort_rows(filter_rows(list(handler.cloud.collections["flavors"].values()), query,
+                                 ignore={"minRam", "minDisk"}), query)
+    rows, links = paginate(handler, rows, query, "flavors", "nova")
+    return 200, {"flavors": rows, **links}, {}
+
+@route("GET", r"/nova/v2\.1/flavors/([^/]+)", "compute", "get_flavor")
+def get_flavor(handler, body, query, flavor_id):
+    return 200, {"flavor": handler.cloud.get("flavors", flavor_id)}, {}
+
+@route("POST", r"/nova/v2\.1/flavors", "compute", "create_flavor")
+def create_flavor(handler, body, query):
+    return 200, {"flavor": handler.cloud.add("flavors", dict(body["flavor"]))}, {}
+
+@route("GET", r"/nova/v2\.1/(os-keypairs|os-hosts|os-server-groups|os-hypervisors|os-host-configs)(?:/detail)?",
+       "compute", "list_compute_extras")
+def list_compute_extras(handler, body, query, collection):
+    key = {"os-keypairs": "keypairs", "os-hosts": "hosts", "os-server-groups": "server_groups",
+           "os-hypervisors": "hypervisors", "os-host-configs": "host_configs"}[collection]
+    if key == "hypervisors":
+        return 200, {key: [{"id": 1, "hypervisor_hostname": "sim-compute-1", "state": "up", "status": "enabled"}]}, {}
+    return 200, {key: []}, {}
+
+# Neutron
+
+NEUTRON_COLLECTIONS = {
+    "networks": "network", "subnets": "subnet", "security-groups": "security_group",
+    "security-group-rules": "security_group_rule", "ports": "port", "routers": "router"
+}
+
+def neutron_defaults(cloud, collection, resource):
+    now = iso(time.time())
+    common = {"project_id": cloud.project_id, "tenant_id": cloud.project_id, "tags": [], "description": "",
+              "created_at": now, "updated_at": now, "revision_number": 1}
+    if collection == "networks":
+        return {**common, "name": "", "status": "ACTIVE", "admin_state_up": True, "shared": False,
+                "subnets": [], "router:external": False, "mtu": 1450, **resource}
+    if collection == "subnets":
+        return {**common, "name": "", "ip_version": 4, "enable_dhcp": True, "gateway_ip": None,
+                "allocation_pools": [], "dns_nameservers": [], "host_routes": [], **resource}
+    if collection == "security-groups":
+        return {**common, "name": "", "security_group_rules": [], **resource}
+    if collection == "security-group-rules":
+        return {**common, "ethertype": "IPv4", "protocol": None, "port_range_min": None, "port_range_max": None,
+                "remote_ip_prefix": None, "remote_group_id": None, **resource}
+    if collection == "routers":
+        return {**common, "name": "", "status": "ACTIVE", "admin_state_up": True,
+                "external_gateway_info": None, **resource}
+    return {**cloud.new_port(resource["network_id"]), **resource}
+
+@route("GET", r"/neutron/v2\.0/(networks|subnets|security-groups|security-group-rules|ports|routers)",
+       "network", "list_network_resources")
+def list_network_resources(handler, body, query, collection):
+    cloud = handler.cloud
+    now = time.time()
+    with cloud._lock:
+        if collection == "ports":
+            # Ports of deleted servers go away once the delete completes
+            for port_id in [port_id for port_id, port in cloud.collections["ports"].items()
+                            if port.get("deleted_at", now + 1) <= now]:
+                del cloud.collections["ports"][port_id]
+        rows = list(cloud.collections[collection].values())
+    if collection == "ports":
+        rows = [cloud.port_view(port, now) for port in rows]
+    rows = sort_rows(filter_rows(rows, query), query)
+    rows, links = paginate(handler, rows, query, collection.replace("-", "_"), "neutron")
+    return 200, {collection.replace("-", "_"): rows, **links}, {}
+
+@route("POST", r"/neutron/v2\.0/(networks|subnets|security-groups|security-group-rules|ports|routers)",
+       "network", "create_network_resource")
+def create_network_resource(handler, body, query, collection):
+    cloud = handler.cloud
+    key = NEUTRON_COLLECTIONS[collection]
+    resource = cloud.add(collection, neutron_defaults(cloud, collection, dict(body[key])))
+    if collection == "subnets":
+        cloud.get("networks", resource["network_id"])["subnets"].append(resource["id"])
+    if collection == "security-group-rules":
+        cloud.get("security-groups", resource["security_group_id"])["security_group_rules"].append(resource)
+    if collection == "ports":
+        resource = cloud.port_view(resource, time.time())
+    return 201, {key: resource}, {}
+
+@route("GET", r"/neutron/v2\.0/(networks|subnets|security-groups|security-group-rules|ports|routers)/([^/]+)",
+       "network", "get_network_resource")
+def get_network_resource(handler, body, query, collection, resource_id):
+    resource = handler.cloud.get(collection, resource_id)
+    if collection == "ports":
+        resource = handler.cloud.port_view(resource, time.time())
+    return 200, {NEUTRON_COLLECTIONS[collection]: resource}, {}
+
+@route("PUT", r"/neutron/v2\.0/(networks|subnets|security-groups|ports|routers)/([^/]+)",
+       "network", "update_network_resource")
+def update_network_resource(handler, body, query, collection, resource_id):
+    resource = handler.cloud.get(collection, resource_id)
+    resource.update(body[NEUTRON_COLLECTIONS[collection]])
+    resource["revision_number"] = resource.get("revision_number", 1) + 1
+    return 200, {NEUTRON_COLLECTIONS[collection]: resource}, {}
+
+@route("PUT", r"/neutron/v2\.0/(networks|subnets|security-groups|ports|routers)/([^/]+)/tags",
+       "network", "set_network_resource_tags")
+def set_network_resource_tags(handler, body, query, collection, resource_id):
+    resource = handler.cloud.get(collection, resource_id)
+    resource["tags"] = list(body["tags"])
+    return 200, {"tags": resource["tags"]}, {}
+
+@route("DELETE", r"/neutron/v2\.0/(networks|subnets|security-groups|security-group-rules|ports|routers)/([^/]+)",
+       "network", "delete_network_resource")
+def delete_network_resource(handler, body, query, collection, resource_id):
+    cloud = handler.cloud
+    now = time.time()
+    with cloud._lock:
+        if collection == "networks":
+            in_use = [port for port in cloud.collections["ports"].values()
+                      if port["network_id"] == resource_id and port.get("deleted_at", now + 1) > now]
+            if in_use:
+                raise ApiError(409, f"Unable to complete operation on network {resource_id}. "
+                                    f"There are one or more ports still in use on the network.")
+            for subnet_id in cloud.get(collection, resource_id)["subnets"]:
+                cloud.collections["subnets"].pop(subnet_id, None)
+        cloud.delete(collection, resource_id)
+    return 204, None, {}
+
+@route("PUT", r"/neutron/v2\.0/routers/([^/]+)/(add|remove)_router_interface", "network", "router_interface")
+def router_interface(handler, body, query, router_id, change):
+    cloud = handler.cloud
+    router = cloud.get("routers", router_id)
+    subnet = cloud.get("subnets", body["subnet_id"])
+    if change == "add":
+        port = cloud.add("ports", cloud.new_port(subnet["network_id"], device_id=router_id,
+                                                 device_owner="network:router_interface"))
+        port["fixed_ips"] = [{"subnet_id": subnet["id"], "ip_address": subnet.get("gateway_ip")}]
+    else:
+        with cloud._lock:
+            for port_id, port in list(cloud.collections["ports"].items()):
+                if port["device_id"] == router_id and port["fixed_ips"] and port["fixed_ips"][0]["subnet_id"] == subnet["id"]:
+                    del cloud.collections["ports"][port_id]
+    return 200, {"id": router["id"], "subnet_id": subnet["id"], "tenant_id": cloud.project_id}, {}
+
+# Glance
+
+@route("GET", r"/glance/v2/images", "image", "list_images")
+def list_images(handler, body, query):
+    rows = sort_rows(filter_rows(list(handler.cloud.collections["images"].values()), query), query)
+    rows, links = paginate(handler, rows, query, "images", "glance")
+    return 200, {"images": rows, "first": "/v2/images", "schema": "/v2/schemas/images", **links}, {}
+
+@route("GET", r"/glance/v2/images/([^/]+)", "image", "get_image")
+def get_image(handler, body, query, image_id):
+    return 200, handler.cloud.get("images", image_id), {}
+
+@route("POST", r"/glance/v2/images", "image", "create_image")
+def create_image(handler, body, query):
+    now = iso(time.time())
+    image = handler.cloud.add("images", {"status": "queued", "visibility": "shared", "owner": handler.cloud.project_id,
+                                         "tags": [], "min_disk": 0, "min_ram": 0, "size": None,
+                                         "created_at": now, "updated_at": now, **body})
+    return 201, image, {}
+
+@route("PUT", r"/glance/v2/images/([^/]+)/file", "image", "upload_image")
+def upload_image(handler, body, query, image_id):
+    image = handler.cloud.get("images", image_id)
+    image["status"] = "active"
+    image["size"] = int(handler.headers.get("Content-Length") or 0)
+    return 204, None, {}
+
+@route("DELETE", r"/glance/v2/images/([^/]+)", "image", "delete_image")
+def delete_image(handler, body, query, image_id):
+    handler.cloud.delete("images", image_id)
+    return 204, None, {}
+
+# Cinder, Octavia and Platform9 cluster
+
+@route("GET", r"/cinder/v3(?:/[0-9a-f]{32})?/(types|volumes|backends)(?:/detail)?", "block-storage", "list_block_storage")
+def list_block_storage(handler, body, query, collection):
+    if collection == "backends":
+        return 200, {"backends": []}, {}
+    rows = filter_rows(list(handler.cloud.collections[collection].values()), query)
+    rows, links = paginate(handler, rows, query, collection, "nova")
+    key = "volume_types" if collection == "types" else collection
+    return 200, {key: rows, **links}, {}
+
+@route("GET", r"/octavia/v2(?:\.0)?/lbaas/loadbalancers", "load-balancer", "list_loadbalancers")
+def list_loadbalancers(handler, body, query):
+    return 200, {"loadbalancers": []}, {}
+
+@route("GET", r"/cluster/v1/blueprints", "cluster", "list_blueprints")
+def list_blueprints(handler, body, query):
+    return 200, {"blueprints": []}, {}
+
+# Simulator control
+
+@route("GET", r"/_sim/stats", "_sim", "stats")
+def simulator_stats(handler, body, query):
+    cloud = handler.cloud
+    with cloud._lock:
+        stats = json.loads(json.dumps(cloud.stats))
+        stats["resources"] = {name: len(rows) for name, rows in cloud.collections.items()}
+    return 200, stats, {}
+
+
+def make_server(host="127.0.0.1", port=5000, config=None):
+    """Build (but do not start) a simulator HTTP server"""
+    config = merge_config(DEFAULT_CONFIG, config or {})
+    cloud = SimulatedCloud(config)
+    handler = type("BoundSimulatorHandler", (SimulatorHandler,), {"cloud": cloud})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    services = {service for _, _, service, _, _ in SimulatorHandler.routes}
+    server.buckets = {
+        service: TokenBucket(config["services"].get(service, {}).get("rate_limit", config["rate_limit"]),
+                             config["services"].get(service, {}).get("burst", config["burst"]))
+        for service in services
+    }
+    server.cloud = cloud
+    return server
+
+def start_in_thread(host="127.0.0.1", port=0, config=None):
+    """Run a simulator in a daemon thread; returns the server (its URL is in server.url)"""
+    server = make_server(host, port, config)
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="openstack-simulator", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenStack API simulator")
+    parser.add_argument("--host", default=os.getenv("SIM_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SIM_PORT", "5000")))
+    parser.add_argument("--config", default=os.getenv("SIM_CONFIG"), help="JSON file overriding DEFAULT_CONFIG")
+    parser.add_argument("--latency-scale", type=float, default=None,
+                        help="Multiply every API latency (0 serves as fast as possible)")
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/sec per service")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    if args.error_rate is not None:
+        config["error_rate"] = args.error_rate
+    if args.rate_limit is not None:
+        config["rate_limit"] = args.rate_limit
+    if args.latency_scale is not None:
+        services = merge_config(DEFAULT_CONFIG["services"], config.get("services", {}))
+        for service in services.values():
+            latency = dict(service["latency"])
+            for key in ("value", "median", "mean", "min", "max", "stddev"):
+                if key in latency:
+                    latency[key] *= args.latency_scale
+            service["latency"] = latency
+        config["services"] = services
+    server = make_server(args.host, args.port, config)
+    logger.info(f"OpenStack simulator listening on http://{args.host}:{args.port} "
+                f"(OS_AUTH_URL=http://{args.host}:{args.port}/keystone/v3)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
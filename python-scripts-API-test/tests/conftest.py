@@ -0,0 +1,66 @@
+import os
+import sys
+import importlib.util
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import openstack_simulator  # noqa: E402
+
+# Servers reach each state almost at once, so tests do not wait on the simulated lifecycle
+FAST_SERVERS = {phase: {"dist": "fixed", "value": 0.05}
+                for phase in ("scheduling", "networking", "spawning", "stop", "start", "delete")}
+
+
+def load_script(filename, name):
+    """Import a script by path; several have names that are not valid module names"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def simulator():
+    server = openstack_simulator.start_in_thread(config={
+        "services": {service: {"latency": {"dist": "fixed", "value": 0}}
+                     for service in openstack_simulator.DEFAULT_CONFIG["services"]},
+        "server": FAST_SERVERS
+    })
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cloud_env(simulator, tmp_path, monkeypatch):
+    """Point the scripts' environment at the simulator, with caches under tmp_path"""
+    env = {
+        "OS_AUTH_URL": f"{simulator.url}/keystone/v3",
+        "OS_USERNAME": "admin",
+        "OS_PASSWORD": "secret",
+        "OS_PROJECT_NAME": "service",
+        "OS_USER_DOMAIN_NAME": "Default",
+        "OS_PROJECT_DOMAIN_NAME": "Default",
+        "KNOWN_ENDPOINTS_HOST": simulator.url,
+        "OS_TOKEN_CACHE": str(tmp_path / "token_cache.json"),
+        "INVENTORY_SNAPSHOT": str(tmp_path / "inventory_snapshot.json"),
+        "TEST_RUNS_DB": "",
+    }
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    return env
+
+
+@pytest.fixture
+def new_module(cloud_env):
+    return load_script("new.py", "metadata_dashboard")
+
+
+@pytest.fixture
+def harness(cloud_env, monkeypatch):
+    monkeypatch.setenv("TEST_RUN_ID", "test-run")
+    return load_script("Python-API-test.py", "api_harness")
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import openstack_simulator
+
+
+@pytest.fixture(autouse=True)
+def fast_lifecycles(monkeypatch):
+    # Read when the harness is imported, so set before it is loaded
+    monkeypatch.setenv("STATUS_POLL_INTERVAL", "0.1")
+    monkeypatch.setenv("TEST_LIFECYCLE_PAUSE", "0")
+    monkeypatch.setenv("TEST_VM_TIMELINE", "0")
+
+
+def throttle_boundary(harness, simulator, tmp_path, monkeypatch, rate_limit):
+    """Run a binary search against a compute API limited to rate_limit requests/sec"""
+    simulator.buckets["compute"] = openstack_simulator.TokenBucket(rate_limit, 5)
+    name = f"capacity-{rate_limit}"
+    profile = tmp_path / f"{name}.json"
+    profile.write_text(json.dumps({"stages": [
+        {"name": name, "type": "search", "strategy": "binary", "concurrency": [1, 32],
+         "duration": 1.5, "max_probes": 10}
+    ]}))
+    monkeypatch.setattr(harness, "LOAD_PROFILE", str(profile))
+    harness.collector_stop.clear()  # A finished sequence stops the collector it started
+    assert harness.run_test_sequence() == "completed"
+
+    search = next(search for search in harness.metrics_snapshot["searches"] if search["name"] == name)
+    passed = [point["concurrency"] for point in search["curve"] if point["within_slo"]]
+    failed = [point for point in search["curve"] if not point["within_slo"]]
+    assert search["knee"] is not None and failed
+    # Every backoff came from the simulator throttling, not from latency or errors
+    assert all(any(violation.startswith("throttle_rate") for violation in point["violations"]) for point in failed)
+    # The search closed in on the boundary instead of stopping at a coarse probe
+    assert min(point["concurrency"] for point in failed) == max(passed) + 1
+    return max(passed)
+
+
+def test_search_converges_on_the_compute_rate_limit(harness, simulator, tmp_path, monkeypatch):
+    tight = throttle_boundary(harness, simulator, tmp_path, monkeypatch, 20)
+    loose = throttle_boundary(harness, simulator, tmp_path, monkeypatch, 80)
+    assert loose > tight
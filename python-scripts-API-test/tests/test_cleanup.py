@@ -0,0 +1,111 @@
+import queue
+
+import pytest
+
+
+@pytest.fixture
+def conn(harness, monkeypatch):
+    monkeypatch.setattr(harness, "BATCHED_POLLING", False)
+    return harness.get_openstack_connection()
+
+
+def boot(conn, name, network, **kwargs):
+    image = next(conn.image.images(name="cirros"))
+    flavor = conn.compute.find_flavor("m1.tiny")
+    return conn.compute.create_server(name=name, image_id=image.id, flavor_id=flavor.id,
+                                      networks=[{"uuid": network.id}], **kwargs)
+
+
+def names(conn):
+    return {
+        "servers": sorted(server.name for server in conn.compute.servers()),
+        "networks": sorted(network.name for network in conn.network.networks()),
+        "subnets": sorted(subnet.name for subnet in conn.network.subnets())
+    }
+
+
+def leave_untagged_baseline_run(conn):
+    network = conn.network.create_network(name="test_network")
+    conn.network.create_subnet(name="test_subnet", network_id=network.id, ip_version=4, cidr="192.168.1.0/24")
+    conn.network.create_security_group(name="test_sec_group")
+    boot(conn, "test_vm_0", network)
+
+
+def test_pre_cleanup_removes_untagged_baseline_leftovers(harness, conn, monkeypatch):
+    monkeypatch.setattr(harness, "LEFTOVER_AGE", 0)
+    leave_untagged_baseline_run(conn)
+    other = conn.network.create_network(name="test_network_keep")
+    harness.pre_cleanup(conn)
+    assert "test_vm_0" not in names(conn)["servers"]
+    assert "test_network" not in names(conn)["networks"]
+    assert "test_subnet" not in names(conn)["subnets"]
+    assert not list(conn.network.security_groups(name="test_sec_group"))
+    assert conn.network.get_network(other.id).name == "test_network_keep"
+
+
+def test_leftover_age_zero_cleans_young_tagged_resources(harness, conn, monkeypatch):
+    network = conn.network.create_network(name="test_pool_network")
+    conn.network.set_tags(network, [harness.HARNESS_TAG, f"{harness.HARNESS_TAG}-run-other"])
+    harness.pre_cleanup(conn)
+    assert "test_pool_network" in names(conn)["networks"]  # Younger than LEFTOVER_AGE, maybe a concurrent run
+    monkeypatch.setattr(harness, "LEFTOVER_AGE", 0)
+    harness.pre_cleanup(conn)
+    assert "test_pool_network" not in names(conn)["networks"]
+
+
+def queued_operations(harness):
+    operations = []
+    while True:
+        try:
+            operations.append(harness.metrics_queue.get_nowait().get("operation"))
+        except queue.Empty:
+            return operations
+
+
+@pytest.fixture
+def old_compute(harness, simulator, monkeypatch):
+    simulator.cloud.config["compute_microversion"] = "2.51"
+    monkeypatch.setattr(harness, "boot_tags_supported", None)
+    monkeypatch.setattr(harness, "resolution_cache", harness.ResolutionCache(300))
+
+
+def test_servers_are_tagged_after_boot_below_microversion_2_52(harness, conn, old_compute):
+    network, _ = harness.create_network_resources(conn)
+    sec_group = harness.create_security_group(conn)
+    harness.manage_vm_lifecycle(conn, network, sec_group, "test_vm_0")
+    assert harness.boot_tags_supported is False
+    assert "tag_server" in queued_operations(harness)
+
+
+def test_body_bad_request_keeps_resolution_cache(harness, conn, old_compute, monkeypatch):
+    network, _ = harness.create_network_resources(conn)
+    sec_group = harness.create_security_group(conn)
+    monkeypatch.setattr(harness, "boot_tags_supported", True)  # Boot requests carry tags the cloud rejects
+    with pytest.raises(harness.BadRequestException):
+        harness.manage_vm_lifecycle(conn, network, sec_group, "test_vm_0")
+    with pytest.raises(harness.BadRequestException):
+        harness.manage_vm_lifecycle(conn, network, sec_group, "test_vm_1")
+    assert harness.resolution_cache.misses == 3  # Image, flavor and the flavor listing, resolved once
+
+
+def test_cleanup_checks_tags_when_the_cloud_ignores_the_filter(harness, conn, simulator):
+    simulator.cloud.config["ignore_tag_filters"] = True
+    network, subnet = harness.create_network_resources(conn)
+    server = boot(conn, "test_vm_0", network, tags=harness.run_tags())
+    bystander = conn.network.create_network(name="production")
+    conn.network.create_subnet(name="production-subnet", network_id=bystander.id, ip_version=4, cidr="10.0.0.0/24")
+    boot(conn, "production-vm", bystander)
+    harness.cleanup_resources(conn)
+    assert names(conn) == {"servers": ["production-vm"], "networks": ["production"],
+                           "subnets": ["production-subnet"]}
+    assert [found.id for found in conn.network.security_groups(name="default")]
+    assert server.id not in [found.id for found in conn.compute.servers()]
+
+
+def test_cleanup_detaches_and_deletes_tagged_routers(harness, conn):
+    network, subnet = harness.create_network_resources(conn)
+    router = harness.tag_resource(conn, conn.network.create_router(name="test_router"))
+    conn.network.add_interface_to_router(router, subnet_id=subnet.id)
+    harness.cleanup_resources(conn)
+    assert not list(conn.network.routers())
+    assert "test_network" not in names(conn)["networks"]
@@ -0,0 +1,51 @@
+import socket
+import threading
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_coordinator_merges_two_workers_summaries(harness, simulator, monkeypatch):
+    simulator.cloud.config["services"]["compute"]["latency"] = {"dist": "fixed", "value": 40}
+    address = f"127.0.0.1:{free_port()}"
+    monkeypatch.setenv("TEST_COORDINATOR", address)
+    monkeypatch.setenv("TEST_BATCHED_POLLING", "0")  # Only the open-loop stage lists servers
+    monkeypatch.setenv("TEST_SUMMARY_INTERVAL", "0.2")
+    monkeypatch.setattr(harness, "COORDINATOR_ADDRESS", address)
+    summaries, forwarded = [], []
+    record_summary = harness.METRIC_HANDLERS["summary"]
+    monkeypatch.setitem(harness.METRIC_HANDLERS, "summary",
+                        lambda state, metric: summaries.append(metric["worker"]) or record_summary(state, metric))
+    monkeypatch.setitem(harness.METRIC_HANDLERS, "open_loop", lambda state, metric: forwarded.append(metric))
+
+    conn = harness.get_openstack_connection()
+    network = conn.network.create_network(name="test_network")
+    sec_group = conn.network.create_security_group(name="test_sec_group")
+    collector = threading.Thread(target=harness.collect_metrics, daemon=True)
+    collector.start()
+    coordinator = harness.Coordinator(address, network, sec_group)
+    try:
+        coordinator.spawn_local_workers(2)
+        coordinator.wait_for_workers(2)
+        harness.run_stage({"name": "open-loop", "type": "soak", "duration": 2, "slo": {},
+                           "rate": "20", "mix": {"list_servers": 1}}, coordinator.run_stage)
+    finally:
+        coordinator.close()
+    harness.metrics_queue.join()
+    harness.collector_stop.set()
+    collector.join()
+
+    assert set(summaries) == {0, 1}
+    assert not forwarded  # In-flight changes arrive inside the summaries, not one message per operation
+    api = harness.live_metrics["api"]
+    latency = api["operations"]["list_servers"]["latency"]
+    assert latency.count == simulator.cloud.stats["by_route"]["list_servers"]
+    assert 30 <= latency.count <= 45
+    assert 40 <= latency.percentile(50) <= latency.percentile(95) < 1000
+    assert api["open_loop"]["in_flight"] == 0
+    assert api["open_loop"]["max_in_flight"] >= 1
+    # Workers' setup lookups land in the stage too
+    assert harness.stage_summaries(harness.live_metrics, 0)[0]["calls"] >= latency.count
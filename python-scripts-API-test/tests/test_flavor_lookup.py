@@ -0,0 +1,32 @@
+import pytest
+
+
+@pytest.fixture
+def lookups(harness, simulator, monkeypatch):
+    monkeypatch.setattr(harness, "resolution_cache", harness.ResolutionCache(ttl=300))
+    stats = simulator.cloud.stats["by_route"]
+    return harness.get_openstack_connection(), stats
+
+
+def test_flavor_resolves_by_id_without_listing(harness, simulator, lookups, monkeypatch):
+    conn, stats = lookups
+    medium = next(flavor for flavor in simulator.cloud.collections["flavors"].values() if flavor["name"] == "m1.medium")
+    monkeypatch.setattr(harness, "FLAVOR_NAME", medium["id"])
+    assert harness.find_flavor(conn).name == "m1.medium"
+    assert stats["get_flavor"] == 1
+    assert stats.get("list_flavors", 0) == 0
+
+
+def test_flavor_names_share_one_listing_per_ttl(harness, lookups, monkeypatch):
+    conn, stats = lookups
+    monkeypatch.setattr(harness, "FLAVOR_NAME", "m1.small")
+    for _ in range(3):
+        assert harness.find_flavor(conn).name == "m1.small"
+        harness.resolution_cache.invalidate("flavor")
+    assert stats["get_flavor"] == 3
+    assert stats["list_flavors"] == 1
+
+    monkeypatch.setattr(harness, "FLAVOR_NAME", "m1.missing")
+    harness.resolution_cache.invalidate("flavor")
+    assert harness.find_flavor(conn).name == "m1.tiny"  # Smallest by RAM
+    assert stats["list_flavors"] == 1
@@ -0,0 +1,53 @@
+import json
+import time
+
+
+def create_server(cloud, name):
+    image = next(iter(cloud.collections["images"].values()))
+    flavor = next(iter(cloud.collections["flavors"].values()))
+    return cloud.create_server({"server": {"name": name, "imageRef": image["id"], "flavorRef": flavor["id"]}})
+
+
+def snapshot_servers(env):
+    with open(env["INVENTORY_SNAPSHOT"]) as f:
+        entry = json.load(f)["services"]["compute_servers"]
+    return entry["mode"], {server["name"]: server for server in entry["data"]["servers"]}
+
+
+def test_incremental_refresh_drops_deleted_servers(simulator, cloud_env, new_module):
+    cloud = simulator.cloud
+    create_server(cloud, "keepme")
+    doomed = create_server(cloud, "deleteme")
+    time.sleep(0.3)
+
+    new_module.collect_once()
+    mode, servers = snapshot_servers(cloud_env)
+    assert mode == "full"
+    assert set(servers) == {"keepme", "deleteme"}
+    assert servers["keepme"]["status"] == "ACTIVE"
+
+    cloud.delete_server(cloud.collections["servers"][doomed["id"]])
+    time.sleep(0.3)
+
+    new_module.collect_once()
+    mode, servers = snapshot_servers(cloud_env)
+    assert mode == "changes-since"
+    assert set(servers) == {"keepme"}
+
+
+def test_merge_changes_replaces_adds_and_deletes(new_module):
+    previous = {"servers": [{"id": "a", "status": "ACTIVE"}, {"id": "b", "status": "ACTIVE"}], "extra": 1}
+    changes = {"servers": [{"id": "a", "status": "SHUTOFF"}, {"id": "b", "status": "DELETED"},
+                           {"id": "c", "status": "BUILD"}, {"id": "d", "status": "SOFT_DELETED"}]}
+
+    merged = new_module.merge_changes(previous, changes, deletions=True)
+
+    assert merged["extra"] == 1
+    assert {record["id"]: record["status"] for record in merged["servers"]} == {"a": "SHUTOFF", "c": "BUILD"}
+
+
+def test_inventory_diff_reports_added_changed_removed(new_module):
+    old = {"ports": [{"id": "1", "status": "DOWN"}, {"id": "2"}]}
+    new = {"ports": [{"id": "1", "status": "ACTIVE"}, {"id": "3"}]}
+
+    assert new_module.diff_records(old, new) == {"added": ["3"], "changed": ["1"], "removed": ["2"]}
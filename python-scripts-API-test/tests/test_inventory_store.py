@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from inventory_store import InventoryStore, SqliteInventoryStore
+
+
+@pytest.fixture
+def snapshot_store(simulator, cloud_env, new_module):
+    """InventoryStore over a snapshot new.py collected from the simulator"""
+    cloud = simulator.cloud
+    network = cloud.add("networks", {"name": "inventory-net", "status": "ACTIVE", "project_id": cloud.project_id})
+    image = next(iter(cloud.collections["images"].values()))
+    tiny, small = [flavor for flavor in cloud.collections["flavors"].values()][:2]
+    for index, flavor in enumerate([tiny, tiny, small]):
+        cloud.create_server({"server": {"name": f"inventory-vm-{index}", "imageRef": image["id"],
+                                        "flavorRef": flavor["id"], "networks": [{"uuid": network["id"]}]}})
+    time.sleep(0.3)
+    new_module.collect_once()
+    return InventoryStore.from_snapshot(cloud_env["INVENTORY_SNAPSHOT"]), network, tiny
+
+
+@pytest.fixture
+def sqlite_store(snapshot_store, tmp_path):
+    store = snapshot_store[0]
+    store.save(str(tmp_path / "inventory.sqlite"))
+    db = SqliteInventoryStore(str(tmp_path / "inventory.sqlite"))
+    yield db
+    db.close()
+
+
+def ids(records):
+    return sorted(record["id"] for record in records)
+
+
+def test_servers_are_indexed_by_flavor_and_status(snapshot_store):
+    store, network, tiny = snapshot_store
+    assert store.count("servers", flavor=tiny["id"]) == 2
+    assert store.count("servers", status="ACTIVE") == 3
+    assert store.count("ports", network_id=network["id"]) == 3
+
+
+def test_sqlite_store_answers_like_memory_store(snapshot_store, sqlite_store):
+    store, network, tiny = snapshot_store
+    server = store.find("servers", flavor=tiny["id"])[0]
+    queries = [
+        ("servers", {}),
+        ("servers", {"flavor": tiny["id"]}),
+        ("servers", {"flavor": tiny["id"], "status": "ACTIVE"}),
+        ("servers", {"name": "inventory-vm-2"}),
+        ("ports", {"network_id": network["id"]}),
+        ("ports", {"device_id": server["id"]}),
+        ("flavors", {"name": tiny["name"]}),
+        ("servers", {"flavor": "no-such-flavor"}),
+    ]
+    for kind, filters in queries:
+        assert ids(sqlite_store.find(kind, **filters)) == ids(store.find(kind, **filters)), (kind, filters)
+        assert sqlite_store.count(kind, **filters) == store.count(kind, **filters), (kind, filters)
+    assert sqlite_store.kinds() == store.kinds()
+    assert sqlite_store.get("servers", server["id"]) == store.get("servers", server["id"])
+    for value in (tiny["id"], network["id"], server["id"]):
+        assert sqlite_store.references(value) == store.references(value)
+
+def test_load_restores_saved_store(snapshot_store, sqlite_store, tmp_path):
+    store, _, tiny = snapshot_store
+    loaded = InventoryStore.load(str(tmp_path / "inventory.sqlite"))
+    assert loaded.kinds() == store.kinds()
+    assert ids(loaded.find("servers", flavor=tiny["id"])) == ids(store.find("servers", flavor=tiny["id"]))
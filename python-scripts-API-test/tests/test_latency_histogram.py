@@ -0,0 +1,41 @@
+import json
+import random
+
+import pytest
+
+
+def exact_percentile(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, -(-len(ordered) * q // 100) - 1)]
+
+
+def test_percentiles_within_precision(harness):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(4, 1) for _ in range(20000)]
+    histogram = harness.LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    for q in (50, 90, 95, 99):
+        exact = exact_percentile(values, q)
+        assert abs(histogram.percentile(q) - exact) <= exact * histogram.precision
+    assert histogram.percentile(100) == max(values)
+    assert histogram.summary()["count"] == len(values)
+
+
+def test_empty_histogram_summary(harness):
+    summary = harness.LatencyHistogram().summary()
+    assert summary == {"count": 0, "mean": 0, "p50": 0, "p90": 0, "p95": 0, "p99": 0, "max": 0}
+
+
+def test_merge_and_round_trip_match_single_histogram(harness):
+    rng = random.Random(11)
+    values = [rng.uniform(0.001, 5000) for _ in range(5000)]
+    whole, left, right = harness.LatencyHistogram(), harness.LatencyHistogram(), harness.LatencyHistogram()
+    for position, value in enumerate(values):
+        whole.record(value)
+        (left if position % 2 else right).record(value)
+    merged = left.merge(harness.LatencyHistogram.from_dict(json.loads(json.dumps(right.to_dict()))))
+    merged_summary, whole_summary = merged.summary(), whole.summary()
+    assert merged_summary.pop("mean") == pytest.approx(whole_summary.pop("mean"))
+    assert merged_summary == whole_summary
+    assert merged.min == min(values)
@@ -0,0 +1,26 @@
+import math
+
+
+def test_short_series_and_small_thresholds_keep_everything(harness):
+    xs = list(range(10))
+    assert harness.lttb(xs, xs, 10) == list(range(10))
+    assert harness.lttb(xs, xs, 50) == list(range(10))
+    assert harness.lttb(xs, xs, 2) == list(range(10))
+
+
+def test_keeps_endpoints_and_threshold_points_in_order(harness):
+    xs = list(range(1000))
+    ys = [math.sin(x / 25) for x in xs]
+    keep = harness.lttb(xs, ys, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert keep == sorted(set(keep))
+
+
+def test_keeps_spikes(harness):
+    xs = list(range(2000))
+    ys = [1.0] * 2000
+    for spike in (137, 1024, 1999 - 3):
+        ys[spike] = 500.0
+    keep = harness.lttb(xs, ys, 50)
+    assert {137, 1024, 1996} <= set(keep)
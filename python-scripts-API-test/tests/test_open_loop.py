@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fast_lifecycles(monkeypatch):
+    # Read when the harness is imported, so set before it is loaded
+    monkeypatch.setenv("STATUS_POLL_INTERVAL", "0.1")
+    monkeypatch.setenv("TEST_VM_TIMELINE", "0")
+
+
+def test_vm_lifecycles_are_kept_out_of_api_latency(harness, simulator, tmp_path, monkeypatch):
+    profile = tmp_path / "open-loop.json"
+    profile.write_text(json.dumps({"stages": [
+        {"name": "mixed", "type": "soak", "duration": 2, "rate": "6",
+         "mix": {"list_servers": 1, "vm_lifecycle": 1}}
+    ]}))
+    monkeypatch.setattr(harness, "LOAD_PROFILE", str(profile))
+    assert harness.run_test_sequence() == "completed"
+
+    snapshot = harness.metrics_snapshot
+    operations = {row["operation"]: row for row in snapshot["operations"]}
+    assert "vm_lifecycle" not in operations
+    list_servers = operations["list_servers"]
+    lifecycles = snapshot["lifecycle_latency"]
+    assert lifecycles["count"] >= 1
+    assert snapshot["lifecycle_corrected_latency"]["count"] == lifecycles["count"] + snapshot["lifecycle_failures"]
+    # Only single API calls carry a corrected latency; the lifecycles' calls are closed-loop
+    assert snapshot["corrected_latency"]["count"] == list_servers["count"] + list_servers["failures"]
+    # A lifecycle spans several polled phases, far beyond any single list call
+    assert lifecycles["p50"] > list_servers["p99"]
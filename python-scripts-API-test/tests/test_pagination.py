@@ -0,0 +1,15 @@
+from conftest import load_script
+
+
+def test_fetch_collection_follows_every_page(simulator, cloud_env, monkeypatch):
+    monkeypatch.setenv("METADATA_PAGE_SIZE", "7")
+    new_module = load_script("new.py", "metadata_dashboard")
+    cloud = simulator.cloud
+    for index in range(30):
+        cloud.add("networks", {"name": f"net-{index}", "status": "ACTIVE", "subnets": [], "tags": []})
+    token, _, endpoints = new_module.connect()
+    meta = {}
+    data = new_module.fetch_collection(endpoints["networks"], token, meta=meta)
+    assert sorted(network["name"] for network in data["networks"]) == sorted(f"net-{index}" for index in range(30))
+    assert meta["pages"] == 5
+    assert "networks_links" not in data
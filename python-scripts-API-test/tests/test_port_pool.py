@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def lifecycle(harness, monkeypatch):
+    """Run VM lifecycles against the simulator with a two-port pool"""
+    monkeypatch.setattr(harness, "VM_TIMELINE", False)
+    conn = harness.get_openstack_connection()
+    network, _ = harness.create_network_resources(conn)
+    sec_group = harness.create_security_group(conn)
+    tracker = harness.ServerStatusTracker(conn, name_filter="^test_vm_", interval=0.05).start()
+    pool = harness.PortPool(conn, [network], sec_group, watermark=2, interval=0.05).start()
+    monkeypatch.setattr(harness, "status_tracker", tracker)
+    monkeypatch.setattr(harness, "port_pool", pool)
+    yield conn, pool, lambda name: harness.manage_vm_lifecycle(conn, network, sec_group, name)
+    pool.stop()
+    tracker.stop()
+
+
+def settle():
+    """Let the refill thread catch up with the last release"""
+    time.sleep(0.3)
+
+
+def test_ports_are_recycled_not_leaked(lifecycle):
+    conn, pool, run = lifecycle
+    for index in range(3):
+        run(f"test_vm_{index}")
+    settle()
+    ports = {port.id for port in conn.network.ports(name="test_pool_port")}
+    for index in range(3, 8):
+        run(f"test_vm_{index}")
+    settle()
+    assert {port.id for port in conn.network.ports(name="test_pool_port")} == ports
+    assert len(ports) == pool.created <= pool.watermark + 1  # At most one port out with a single worker
+    assert pool.handed_out == pool.recycled == 8
+    assert pool.misses == 0
+    assert not [port for port in conn.network.ports() if port.device_owner == "compute:nova"]
+
+
+def test_ports_of_failed_lifecycles_are_deleted(lifecycle):
+    conn, pool, run = lifecycle
+    port = pool.acquire()
+    pool.release(port, reusable=False)
+    settle()
+    assert port.id not in {found.id for found in conn.network.ports(name="test_pool_port")}
+    assert len(list(conn.network.ports(name="test_pool_port"))) == pool.watermark
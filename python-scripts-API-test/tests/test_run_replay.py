@@ -0,0 +1,32 @@
+import json
+import sqlite3
+
+import pytest
+
+
+def test_recorded_run_replays_to_the_live_snapshot(harness, tmp_path, monkeypatch):
+    profile = tmp_path / "profile.json"
+    profile.write_text(json.dumps({"slo": {"p95_latency_ms": 5000}, "stages": [
+        {"name": "soak", "type": "soak", "duration": 1, "rate": 10, "mix": "list_servers:1,list_networks:1"}
+    ]}))
+    runs_db = str(tmp_path / "runs.sqlite")
+    monkeypatch.setattr(harness, "LOAD_PROFILE", str(profile))
+    monkeypatch.setattr(harness, "BATCHED_POLLING", False)
+    monkeypatch.setattr(harness, "RUNS_DB", runs_db)
+    monkeypatch.setattr(harness, "RECORD_BATCH_SIZE", 7)  # Several segments
+    assert harness.run_test_sequence() == "completed"
+    live = harness.metrics_snapshot
+    with sqlite3.connect(runs_db) as db:
+        assert db.execute("SELECT COUNT(*) FROM segments").fetchone()[0] > 1
+
+    replayed = harness.replay_run(harness.RUN_ID, runs_db)
+    for key in ("success_count", "failure_count", "overall_latency", "operations", "wire", "cleanups"):
+        assert replayed[key] == live[key], key
+    assert [(row["name"], row["verdict"], row["calls"]) for row in replayed["stages"]] == \
+        [(row["name"], row["verdict"], row["calls"]) for row in live["stages"]]
+    assert replayed["closed_count"] == len(replayed["closed_windows"]) >= 1
+
+
+def test_unknown_run_is_a_clear_error(harness, tmp_path):
+    with pytest.raises(ValueError, match="No such run"):
+        harness.replay_run("missing", str(tmp_path / "runs.sqlite"))
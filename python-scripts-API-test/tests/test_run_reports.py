@@ -0,0 +1,70 @@
+import json
+import xml.etree.ElementTree as ElementTree
+
+
+def write_reports(harness, tmp_path, status):
+    summary_path, junit_path = tmp_path / "summary.json", tmp_path / "junit.xml"
+    code = harness.finish_run(status, str(summary_path), str(junit_path))
+    with open(summary_path) as f:
+        summary = json.load(f)
+    return code, summary, ElementTree.parse(junit_path).getroot()
+
+
+def run_profile(harness, tmp_path, monkeypatch, slo):
+    """Run a one-second open-loop profile against the simulator and return its status"""
+    profile = tmp_path / "profile.json"
+    profile.write_text(json.dumps({"slo": slo, "stages": [
+        {"name": "soak", "type": "soak", "duration": 1, "rate": 10, "mix": "list_servers:1"}
+    ]}))
+    monkeypatch.setattr(harness, "LOAD_PROFILE", str(profile))
+    monkeypatch.setattr(harness, "BATCHED_POLLING", False)
+    return harness.run_test_sequence()
+
+
+def test_empty_snapshot_still_writes_reports_and_fails(harness, tmp_path, monkeypatch):
+    monkeypatch.setattr(harness, "metrics_snapshot", {})
+    code, summary, suite = write_reports(harness, tmp_path, "completed")
+    assert code == 2
+    assert summary["status"] == "failed"
+    assert summary["api"]["calls"] == 0
+    assert suite.get("errors") == "1"
+
+
+def test_profile_within_slo_exits_0(harness, tmp_path, monkeypatch):
+    status = run_profile(harness, tmp_path, monkeypatch, {"p95_latency_ms": 5000, "error_rate": 0.5})
+    code, summary, suite = write_reports(harness, tmp_path, status)
+    assert code == 0
+    assert [stage["verdict"] for stage in summary["stages"]] == ["pass"]
+    assert summary["api"]["calls"] > 0
+    assert suite.get("failures") == "0"
+    assert {case.get("name") for case in suite.iter("testcase")} >= {"p95_latency_ms", "error_rate"}
+
+
+def test_profile_breaching_slo_exits_1(harness, tmp_path, monkeypatch):
+    status = run_profile(harness, tmp_path, monkeypatch, {"p95_latency_ms": 0.001})
+    code, summary, suite = write_reports(harness, tmp_path, status)
+    assert code == 1
+    assert [stage["verdict"] for stage in summary["stages"]] == ["fail"]
+    failed = [case.get("name") for case in suite.iter("testcase") if case.find("failure") is not None]
+    assert failed == ["p95_latency_ms"]
+
+
+def test_failed_sequence_maps_to_exit_code_2(harness, tmp_path, monkeypatch):
+    monkeypatch.setattr(harness, "metrics_snapshot", {})
+    monkeypatch.setattr(harness, "LOAD_PROFILE", str(tmp_path / "nonexistent.json"))
+    code, summary, suite = write_reports(harness, tmp_path, harness.run_test_sequence())
+    assert code == 2
+    assert summary["status"] == "failed"
+
+
+def test_cleanup_error_after_failure_still_reaches_reports(harness, tmp_path, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("cloud unreachable")
+
+    monkeypatch.setattr(harness, "BATCHED_POLLING", False)
+    monkeypatch.setattr(harness, "get_openstack_connection", lambda: object())
+    monkeypatch.setattr(harness, "pre_cleanup", fail)
+    monkeypatch.setattr(harness, "cleanup_resources", fail)
+    code, summary, suite = write_reports(harness, tmp_path, harness.run_test_sequence())
+    assert code == 2
+    assert summary["status"] == "failed"
@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_one_list_call_per_tick_serves_every_waiter(harness, simulator):
+    conn = harness.get_openstack_connection()
+    image = next(conn.image.images(name="cirros"))
+    flavor = conn.compute.find_flavor("m1.tiny")
+    servers = [conn.compute.create_server(name=f"test_vm_{index}", image_id=image.id, flavor_id=flavor.id)
+               for index in range(12)]
+    stats = simulator.cloud.stats["by_route"]
+    gets_before = stats.get("get_server", 0)
+    tracker = harness.ServerStatusTracker(conn, name_filter="^test_vm_", interval=0.1).start()
+    try:
+        with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            active = list(pool.map(lambda server: tracker.wait_for_status(server, "ACTIVE", wait=30), servers))
+        assert sorted(server.id for server in active) == sorted(server.id for server in servers)
+        assert all(server.status == "ACTIVE" for server in active)
+
+        for server in servers:
+            conn.compute.delete_server(server)
+        with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            list(pool.map(lambda server: tracker.wait_for_delete(server, wait=30), servers))
+    finally:
+        tracker.stop()
+    # Every waiter was woken by the shared listings, never by polling its own server
+    assert stats.get("get_server", 0) == gets_before
+    assert stats["list_servers"] == tracker.list_requests
+    assert tracker.list_requests < len(servers)
+    assert tracker.saved_requests() > 0
@@ -0,0 +1,18 @@
+import time
+import threading
+
+
+class BrokenChannel:
+    def send(self, message):
+        raise OSError("connection reset")
+
+
+def test_forwarder_keeps_draining_after_lost_coordinator_and_bad_metrics(harness):
+    harness.SummaryForwarder(BrokenChannel(), interval=0.05).start()
+    harness.metrics_queue.put({"kind": "vm_created", "creation_time": 1.0})  # Forwarded, so the send fails
+    time.sleep(0.2)
+    harness.metrics_queue.put({"kind": "api"})  # Missing every field the handler reads
+    drained = threading.Thread(target=harness.metrics_queue.join, daemon=True)
+    drained.start()
+    drained.join(timeout=5)
+    assert not drained.is_alive()
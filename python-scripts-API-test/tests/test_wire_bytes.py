@@ -0,0 +1,72 @@
+import queue
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+
+def prepared(data, **headers):
+    request = requests.Request("POST", "http://cloud.example/nova/v2.1/servers", data=data, headers=headers).prepare()
+    request.headers.pop("Content-Length", None)
+    return request
+
+
+def test_request_body_counts_bytes_not_characters(harness):
+    assert harness.request_body_bytes(prepared('{"name": "vm-é"}')) == len('{"name": "vm-é"}'.encode("utf-8"))
+    assert harness.request_body_bytes(prepared(b"\xff\xfe")) == 2
+    assert harness.request_body_bytes(prepared(None)) == 0
+
+
+def test_request_body_prefers_content_length(harness):
+    request = prepared("é" * 3)
+    request.headers["Content-Length"] = "6"
+    assert harness.request_body_bytes(request) == 6
+
+
+class ChunkedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in (b'{"servers": ', b"[]}"):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def chunked_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChunkedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def wire_metrics(harness):
+    metrics = []
+    while True:
+        try:
+            metric = harness.metrics_queue.get_nowait()
+        except queue.Empty:
+            return metrics
+        if metric["kind"] == "wire":
+            metrics.append(metric)
+
+
+def test_chunked_responses_count_body_and_keep_alive_reuse(harness, chunked_server):
+    session = requests.Session()
+    conn = SimpleNamespace(endpoint_for=lambda service_type: None, session=SimpleNamespace(session=session))
+    harness.instrument_connection(conn)
+    responses = [session.get(f"{chunked_server}/servers") for _ in range(3)]
+    metrics = wire_metrics(harness)
+    assert [metric["reused"] for metric in metrics] == [False, True, True]
+    for response, metric in zip(responses, metrics):
+        assert metric["response_bytes"] == harness.header_bytes(response.headers) + len(b'{"servers": []}')